@@ -14,11 +14,10 @@ class HomePage(Page):
         if job_index:
             # 获取热门职位（限制10条）
             jobs = JobPage.objects.child_of(job_index).live().specific()[:10]
-            # 为每个职位添加收藏状态（如果用户已登录）
-            if request.user.is_authenticated:
-                for job in jobs:
-                    job.is_saved_by_user = job.is_saved_by_user(request.user)
             context['jobs'] = jobs
+            # 收藏状态：用户收藏过的职位ID集合（一次查询并按用户缓存）
+            from jobs.user_jobs import get_user_job_context
+            context.update(get_user_job_context(request.user))
         else:
             context['jobs'] = []
         
@@ -3,7 +3,7 @@ from django.contrib.admin.sites import NotRegistered
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 from django.utils.html import format_html
-from django.db.models import Count, Q
+from django.db.models import Q
 from django.urls import path
 from django.shortcuts import render
 from django.utils.safestring import mark_safe
@@ -385,40 +385,31 @@ class JobApplicationAdmin(admin.ModelAdmin):
 
 # 统计视图函数
 def statistics_view(request):
-    """显示用户统计信息页面"""
-    # 总用户数
-    total_users = User.objects.count()
-    active_users = User.objects.filter(is_active=True).count()
+    """显示用户统计信息页面（读取 rollup_job_stats 维护的汇总表，不在请求中扫描全表）"""
+    from .rollups import get_application_stats, get_most_active_users, get_user_stats
     
-    # 有学生档案的用户数
-    users_with_profile = User.objects.filter(student_profile__isnull=False).count()
+    # 用户数、有学生档案和有申请记录的用户数
+    user_stats = get_user_stats()
     
-    # 统计各状态申请数量
-    status_stats = JobApplication.objects.values('status').annotate(
-        count=Count('id')
-    ).order_by('-count')
-    
-    # 统计用户活动
-    active_users_count = User.objects.filter(
-        job_applications__isnull=False
-    ).distinct().count()
+    # 各状态申请数量
+    status_labels = dict(JobApplication.STATUS_CHOICES)
+    status_stats = get_application_stats()['status_totals']
+    for stat in status_stats:
+        stat['label'] = status_labels.get(stat['status'], stat['status'])
     
     # 最近注册的用户
     recent_users = User.objects.order_by('-date_joined')[:10]
     
-    # 最活跃的用户（按申请数量）
-    most_active_users = User.objects.annotate(
-        application_count=Count('job_applications')
-    ).filter(application_count__gt=0).order_by('-application_count')[:10]
-    
     context = {
-        'total_users': total_users,
-        'active_users': active_users,
-        'users_with_profile': users_with_profile,
+        'stats_date': user_stats.date if user_stats else None,
+        'total_users': user_stats.total_users if user_stats else 0,
+        'active_users': user_stats.active_users if user_stats else 0,
+        'users_with_profile': user_stats.profile_users if user_stats else 0,
         'status_stats': status_stats,
-        'active_users_count': active_users_count,
+        'active_users_count': user_stats.applicant_users if user_stats else 0,
         'recent_users': recent_users,
-        'most_active_users': most_active_users,
+        # 最活跃的用户（按申请数量），读取定时重写的排行表
+        'most_active_users': get_most_active_users(),
     }
     
     return render(request, 'admin/user_statistics.html', context)
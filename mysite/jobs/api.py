@@ -1,11 +1,36 @@
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST, condition
+from django.views.decorators.gzip import gzip_page
 from django.contrib.auth.decorators import login_required
 from django.utils.timezone import now as timezone_now
 from django.conf import settings
+from django.db.models.functions import Substr
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+import hashlib
 import json
-from .models import JobPage, JobApplication
+from .models import JobPage, JobApplication, RecommendationEvent, StudentProfile
+from . import autocomplete, event_log, tracking
+from .recommend import RECOMMENDATION_ALGORITHM
+from .resume_match import match_resume
+from .listing import (
+    get_counter_version, get_counters_modified_at, get_job_generation, get_job_listing, get_job_modified_at,
+    load_jobs, parse_job_filters,
+)
+
+# 职位列表API：每页数量上限与描述摘要长度
+JOB_LIST_API_MAX_LIMIT = 50
+JOB_LIST_API_DESCRIPTION_CHARS = 120
+# 只从数据库读取描述的前若干字符（含HTML标签），避免传输完整富文本
+JOB_LIST_API_DESCRIPTION_PREFIX = 600
+
+# 列表API返回的字段
+JOB_LIST_API_FIELDS = [
+    'id', 'url_path', 'job_title', 'company_name', 'location',
+    'province', 'city', 'district', 'salary', 'salary_min_yuan', 'salary_max_yuan',
+    'job_type', 'source_website', 'first_published_at', 'save_count', 'apply_count',
+]
 
 @csrf_exempt
 @require_POST
@@ -66,7 +91,10 @@ def toggle_save_job(request):
             )
             action = 'saved'
             logger.info(f'User {request.user.id} saved job {job_id}')
+        log_application_event(request.user, job_page, action)
         
+        # 收藏数量由信号原子更新，这里重新读取最新值
+        job_page.refresh_from_db(fields=['save_count'])
         return JsonResponse({
             'success': True,
             'action': action,
@@ -126,6 +154,191 @@ def get_client_ip(request):
     return ip
 
 def log_application_event(user, job_page, event_type):
-    """记录申请事件（可用于分析）"""
-    # 这里可以集成到分析系统，如Google Analytics或自建事件追踪
-    pass
\ No newline at end of file
+    """记录职位事件（放入缓冲区，由后台线程批量写入事件日志，不阻塞请求）"""
+    event_log.log_event(user, job_page.pk, event_type)
+
+def _job_list_etag(request):
+    """职位列表API的ETag：职位数据代数 + 互动计数版本（响应中包含收藏数、申请数）+ 查询参数"""
+    payload = f'{get_job_generation()}|{get_counter_version()}|{request.GET.urlencode()}'
+    return hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+
+def _job_list_last_modified(request):
+    modified_at = get_job_modified_at()
+    counters_modified_at = get_counters_modified_at()
+    if counters_modified_at is not None:
+        modified_at = max(modified_at, counters_modified_at)
+    return modified_at
+
+
+def serialize_job(job, request):
+    """将职位序列化为列表API的输出"""
+    description = Truncator(strip_tags(job.description_prefix or '')).chars(JOB_LIST_API_DESCRIPTION_CHARS)
+    return {
+        'id': job.id,
+        'url': job.get_url(request),
+        'job_title': job.job_title,
+        'company_name': job.company_name,
+        'location': job.location,
+        'province': job.province,
+        'city': job.city,
+        'district': job.district,
+        'salary': job.salary,
+        'salary_min_yuan': job.salary_min_yuan,
+        'salary_max_yuan': job.salary_max_yuan,
+        'job_type': job.job_type,
+        'job_type_display': job.get_job_type_display(),
+        'source_website': job.source_website,
+        'first_published_at': job.first_published_at.isoformat() if job.first_published_at else None,
+        'save_count': job.save_count,
+        'apply_count': job.apply_count,
+        'description': description,
+    }
+
+
+@gzip_page
+@require_GET
+@condition(etag_func=_job_list_etag, last_modified_func=_job_list_last_modified)
+def job_list_api(request):
+    """
+    职位列表API（与职位列表页共用筛选逻辑）
+
+    参数：q, job_type, province, city, district, salary_min, salary_max, sort（同列表页，sort=popular 按热度），
+    cursor（无关键词时的游标）、page（有关键词时的页码）、limit（每页数量，最多50）
+    """
+    try:
+        limit = int(request.GET.get('limit', 15))
+    except ValueError:
+        limit = 15
+    limit = max(1, min(limit, JOB_LIST_API_MAX_LIMIT))
+
+    # 只读取需要的列；描述只截取前缀，在服务端生成摘要
+    queryset = JobPage.objects.only(*JOB_LIST_API_FIELDS).annotate(
+        description_prefix=Substr('description', 1, JOB_LIST_API_DESCRIPTION_PREFIX)
+    )
+    results, cursor_pagination = get_job_listing(
+        None,
+        parse_job_filters(request.GET),
+        cursor=request.GET.get('cursor'),
+        page=request.GET.get('page'),
+        per_page=limit,
+        queryset=queryset,
+    )
+
+    data = {
+        'results': [serialize_job(job, request) for job in results],
+        'count': results.paginator.count,
+        'has_next': results.has_next(),
+        'has_previous': results.has_previous(),
+    }
+    if cursor_pagination:
+        data['next_cursor'] = results.next_cursor
+        data['previous_cursor'] = results.previous_cursor
+    else:
+        data['page'] = results.number
+        data['num_pages'] = results.paginator.num_pages
+    return JsonResponse(data, json_dumps_params={'ensure_ascii': False})
+
+
+@require_GET
+def autocomplete_api(request):
+    """
+    搜索框自动补全：按前缀返回职位名称、公司名称、城市候选词
+
+    参数：q（已输入的前缀）、limit（返回数量，默认10）
+    """
+    try:
+        limit = int(request.GET.get('limit', 10))
+    except ValueError:
+        limit = 10
+    suggestions = autocomplete.suggest(request.GET.get('q', ''), limit)
+    return JsonResponse({
+        'suggestions': [
+            {'text': text, 'type': kind, 'weight': weight}
+            for text, kind, weight in suggestions
+        ],
+    }, json_dumps_params={'ensure_ascii': False})
+
+
+@require_GET
+def resume_matches_api(request):
+    """
+    按当前用户的简历文本匹配职位
+
+    参数：limit（返回数量，默认20，最多50）
+    每个结果在职位列表API字段的基础上增加 score、matched_terms、matched_skills
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': '请先登录', 'login_required': True}, status=401)
+
+    try:
+        limit = int(request.GET.get('limit', 20))
+    except ValueError:
+        limit = 20
+    limit = max(1, min(limit, JOB_LIST_API_MAX_LIMIT))
+
+    profile = StudentProfile.objects.filter(user=request.user).only('user_id', 'resume_text').first()
+    if profile is None or not (profile.resume_text or '').strip():
+        return JsonResponse({'results': [], 'source': None, 'message': '请先上传或填写简历'},
+                            json_dumps_params={'ensure_ascii': False})
+
+    result = match_resume(profile, limit)
+    queryset = JobPage.objects.only(*JOB_LIST_API_FIELDS).annotate(
+        description_prefix=Substr('description', 1, JOB_LIST_API_DESCRIPTION_PREFIX)
+    )
+    jobs = {job.pk: job for job in load_jobs([match['job_id'] for match in result['matches']], queryset)}
+
+    results = []
+    for match in result['matches']:
+        job = jobs.get(match['job_id'])
+        if job is None:
+            continue
+        data = serialize_job(job, request)
+        data.update(
+            score=match['score'],
+            matched_terms=match['matched_terms'],
+            matched_skills=match['matched_skills'],
+        )
+        results.append(data)
+    return JsonResponse({'results': results, 'source': result['source']},
+                        json_dumps_params={'ensure_ascii': False})
+
+
+def _parse_tracking_event(item):
+    """校验单个曝光/点击事件，无效时返回 None"""
+    if not isinstance(item, dict):
+        return None
+    try:
+        job_id = int(item.get('job_id'))
+        rank = int(item['rank']) if item.get('rank') not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+    event_type = item.get('event', RecommendationEvent.EVENT_CLICK)
+    if event_type not in dict(RecommendationEvent.EVENT_TYPES) or job_id <= 0 or (rank is not None and not 0 < rank < 1000):
+        return None
+    algorithm = str(item.get('algorithm') or RECOMMENDATION_ALGORITHM)[:50]
+    return {'job_id': job_id, 'event_type': event_type, 'rank': rank, 'algorithm': algorithm}
+
+
+@require_POST
+def track_recommendation_event(request):
+    """
+    记录推荐曝光/点击（只放入缓冲区，由后台线程批量写入）
+
+    请求体：单个事件 {job_id, event, rank, algorithm}，或 {"events": [...]}（最多100个）；
+    event 为 impression 或 click（默认 click），algorithm 默认为当前推荐算法版本
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': '请先登录', 'login_required': True}, status=401)
+    try:
+        data = json.loads(request.body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse({'error': '无效的请求数据'}, status=400)
+
+    items = data.get('events') if isinstance(data, dict) and 'events' in data else [data]
+    if not isinstance(items, list) or len(items) > tracking.MAX_EVENTS_PER_REQUEST:
+        return JsonResponse({'error': '无效的请求数据'}, status=400)
+    events = [event for event in map(_parse_tracking_event, items) if event is not None]
+    if events:
+        tracking.track_events(request.user, events)
+    return JsonResponse({'accepted': len(events)}, status=202)
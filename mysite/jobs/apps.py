@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+
+    def ready(self):
+        # 注册信号处理（发布/下线时维护派生数据）
+        from . import signals  # noqa: F401
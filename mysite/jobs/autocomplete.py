@@ -0,0 +1,339 @@
+"""
+职位搜索自动补全模块
+在工作进程内维护一个按规范化文本排序的候选词数组（职位名称、公司名称、城市），
+前缀查询用二分查找定位区间，不访问数据库
+
+候选词权重 = 包含该词的已发布职位数 + 这些职位的申请/收藏数 * APPLICATION_WEIGHT
+
+更新方式：
+- 本进程内发布、下线、删除职位时增量更新（只改动该职位贡献的候选词）
+- 其他进程修改了职位数据（职位数据代数变化）时，间隔至少 REBUILD_INTERVAL 秒后整体重建；
+  重建在后台线程中构建新的索引对象，完成后整体替换，请求中只使用当前（可能稍旧的）索引，
+  进程首次查询时索引为空、返回空结果，直到后台构建完成
+
+查询代价：长度不超过 TOP_PREFIX_LENGTH 的前缀（一两个字母或汉字，区间最大）在构建和增量更新时
+预先算好前 MAX_SUGGESTIONS 个候选词；更长的前缀最多扫描 MAX_SCANNED_KEYS 个候选词
+"""
+import bisect
+import heapq
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 候选词类型
+KIND_TITLE = 'title'
+KIND_COMPANY = 'company'
+KIND_CITY = 'city'
+
+# 一次申请/收藏相当于多少个职位的权重
+APPLICATION_WEIGHT = 0.5
+
+# 检测到其他进程修改数据后，两次整体重建之间的最小间隔（秒）
+REBUILD_INTERVAL = 60
+
+# 查询结果的缓存条目上限（数据变化时清空）
+MEMO_SIZE = 2048
+
+# 每次最多返回的候选词数量
+MAX_SUGGESTIONS = 20
+
+# 预先计算候选词排名的前缀长度上限
+TOP_PREFIX_LENGTH = 2
+
+# 较长前缀查询时最多扫描的候选词数量
+MAX_SCANNED_KEYS = 5000
+
+
+def normalize(text):
+    """规范化候选词和查询：转小写并合并空白"""
+    return ' '.join((text or '').lower().split())
+
+
+def get_job_terms(title, company, city):
+    """一个职位贡献的候选词集合 {(类型, 显示文本)}"""
+    terms = set()
+    for kind, text in ((KIND_TITLE, title), (KIND_COMPANY, company), (KIND_CITY, city)):
+        text = (text or '').strip()
+        if text:
+            terms.add((kind, text))
+    return terms
+
+
+class AutocompleteIndex:
+    """
+    前缀补全索引
+
+    keys: 按 (规范化文本, 类型, 显示文本) 排序的数组，用 bisect 定位前缀区间
+    top_prefixes: 短前缀的预计算结果 {前缀: [(权重, 显示文本, 类型)]}，按权重从高到低
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.weights = {}       # {(类型, 显示文本): 权重}
+        self.job_terms = {}     # {职位ID: (候选词集合, 职位权重)}
+        self.top_prefixes = {}
+        self.generation = None
+        self.built_at = 0.0
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    # 构建与增量更新
+
+    def build(self, rows, application_counts, generation=None):
+        """
+        整体构建索引
+
+        rows: [(职位ID, 职位名称, 公司名称, 城市)]
+        application_counts: {职位ID: 申请/收藏数}
+        """
+        weights = {}
+        job_terms = {}
+        for job_id, title, company, city in rows:
+            job_weight = 1 + APPLICATION_WEIGHT * application_counts.get(job_id, 0)
+            terms = get_job_terms(title, company, city)
+            job_terms[job_id] = (terms, job_weight)
+            for term in terms:
+                weights[term] = weights.get(term, 0) + job_weight
+
+        keys = sorted((normalize(text), kind, text) for kind, text in weights)
+        grouped = {}
+        for normalized, kind, text in keys:
+            entry = (weights[(kind, text)], text, kind)
+            for prefix in _short_prefixes(normalized):
+                grouped.setdefault(prefix, []).append(entry)
+        top_prefixes = {
+            prefix: heapq.nlargest(MAX_SUGGESTIONS, entries) for prefix, entries in grouped.items()
+        }
+        with self._lock:
+            self.keys = keys
+            self.weights = weights
+            self.job_terms = job_terms
+            self.top_prefixes = top_prefixes
+            self.generation = generation
+            self.built_at = time.monotonic()
+            self._memo = {}
+
+    def _prefix_range(self, prefix):
+        start = bisect.bisect_left(self.keys, (prefix,))
+        end = bisect.bisect_left(self.keys, (prefix + '\uffff',), start)
+        return start, end
+
+    def _rank(self, start, end, limit):
+        weights = self.weights
+        return heapq.nlargest(
+            limit,
+            ((weights.get((kind, text), 0), text, kind) for _, kind, text in self.keys[start:end]),
+        )
+
+    def _refresh_prefixes(self, prefixes):
+        """增量更新后重新计算受影响的短前缀排名（在发布职位的路径上执行，不在查询中执行）"""
+        for prefix in prefixes:
+            top = self._rank(*self._prefix_range(prefix), MAX_SUGGESTIONS)
+            if top:
+                self.top_prefixes[prefix] = top
+            else:
+                self.top_prefixes.pop(prefix, None)
+
+    def _add_term(self, term, weight):
+        kind, text = term
+        if term not in self.weights:
+            bisect.insort(self.keys, (normalize(text), kind, text))
+            self.weights[term] = 0
+        self.weights[term] += weight
+
+    def _remove_term(self, term, weight):
+        kind, text = term
+        remaining = self.weights.get(term, 0) - weight
+        if remaining > 1e-9:
+            self.weights[term] = remaining
+            return
+        self.weights.pop(term, None)
+        key = (normalize(text), kind, text)
+        index = bisect.bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            del self.keys[index]
+
+    def update_job(self, job_id, title, company, city, live=True, application_count=None):
+        """职位发布或修改后增量更新；live=False 时移除该职位的候选词"""
+        with self._lock:
+            previous_terms, previous_weight = self.job_terms.pop(job_id, (set(), None))
+            for term in previous_terms:
+                self._remove_term(term, previous_weight)
+            terms = set()
+            if live:
+                if application_count is None:
+                    job_weight = previous_weight or 1
+                else:
+                    job_weight = 1 + APPLICATION_WEIGHT * application_count
+                terms = get_job_terms(title, company, city)
+                for term in terms:
+                    self._add_term(term, job_weight)
+                self.job_terms[job_id] = (terms, job_weight)
+            self._refresh_prefixes({
+                prefix for _, text in previous_terms | terms for prefix in _short_prefixes(normalize(text))
+            })
+            self._memo = {}
+
+    def remove_job(self, job_id):
+        self.update_job(job_id, None, None, None, live=False)
+
+    # 查询
+
+    def suggest(self, prefix, limit=10):
+        """返回以 prefix 开头、权重最高的候选词 [(显示文本, 类型, 权重)]"""
+        prefix = normalize(prefix)
+        limit = max(1, min(limit, MAX_SUGGESTIONS))
+        if not prefix:
+            return []
+
+        memo_key = (prefix, limit)
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            return cached
+
+        if len(prefix) <= TOP_PREFIX_LENGTH:
+            top = self.top_prefixes.get(prefix, [])[:limit]
+        else:
+            start, end = self._prefix_range(prefix)
+            top = self._rank(start, min(end, start + MAX_SCANNED_KEYS), limit)
+        results = [(text, kind, weight) for weight, text, kind in top]
+
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo = {}
+        self._memo[memo_key] = results
+        return results
+
+
+def _short_prefixes(normalized):
+    """规范化文本中需要预计算排名的前缀（长度 1 ~ TOP_PREFIX_LENGTH）"""
+    return [normalized[:length] for length in range(1, min(len(normalized), TOP_PREFIX_LENGTH) + 1)]
+
+
+_index = AutocompleteIndex()
+
+# 后台重建线程；重建期间本进程的增量更新记录在 _pending 中，替换索引前重放到新索引上
+_rebuild_lock = threading.Lock()
+_rebuild_thread = None
+_pending = None
+
+
+def build_autocomplete_index(index=None):
+    """从数据库整体构建索引（在后台重建线程中调用；测试和管理命令中也可以直接调用）"""
+    from django.db.models import Count
+    from .listing import get_job_generation
+    from .models import JobApplication, JobPage
+
+    index = index or _index
+    generation = get_job_generation()
+    rows = JobPage.objects.live().values_list('pk', 'job_title', 'company_name', 'city')
+    application_counts = dict(
+        JobApplication.objects.values('job_page_id')
+        .annotate(total=Count('id'))
+        .values_list('job_page_id', 'total')
+    )
+    index.build(rows.iterator(), application_counts, generation)
+    return index
+
+
+def rebuild_autocomplete_index():
+    """构建一个新的索引对象，重放构建期间的增量更新后替换本进程的索引"""
+    global _index, _pending
+
+    with _rebuild_lock:
+        _pending = {}
+    try:
+        index = build_autocomplete_index(AutocompleteIndex())
+    except Exception:
+        logger.exception('重建自动补全索引失败')
+        with _rebuild_lock:
+            _pending = None
+        return None
+    with _rebuild_lock:
+        for job_id, fields in _pending.items():
+            index.update_job(job_id, *fields)
+        _pending = None
+        _index = index
+    return index
+
+
+def _run_rebuild():
+    from django.db import close_old_connections, connection
+
+    close_old_connections()
+    try:
+        rebuild_autocomplete_index()
+    finally:
+        # 后台线程的数据库连接不会被请求结束时的清理关闭，这里主动关闭
+        connection.close()
+
+
+def _rebuild_in_background():
+    """启动后台重建线程；已有重建在进行时不重复启动"""
+    global _rebuild_thread
+
+    with _rebuild_lock:
+        if _rebuild_thread is not None and _rebuild_thread.is_alive():
+            return
+        _rebuild_thread = threading.Thread(target=_run_rebuild, name='autocomplete-rebuild', daemon=True)
+        _rebuild_thread.start()
+
+
+def get_autocomplete_index():
+    """
+    获取本进程的索引
+
+    尚未构建，或职位数据代数变化且超过重建间隔时，在后台重建；本次请求仍使用当前的索引
+    """
+    from .listing import get_job_generation
+
+    if _index.generation is None or (
+        _index.generation != get_job_generation()
+        and time.monotonic() - _index.built_at >= REBUILD_INTERVAL
+    ):
+        _rebuild_in_background()
+    return _index
+
+
+def _record_pending(job_id, *fields):
+    """后台重建期间记录增量更新，重建完成后重放"""
+    with _rebuild_lock:
+        if _pending is not None:
+            _pending[job_id] = fields
+
+
+def _advance_generation(generation):
+    """
+    增量更新后记录新的代数；只有在这次修改之前索引是最新的情况下才记录，
+    否则说明其他进程也修改过数据，仍需按间隔整体重建
+    """
+    if generation is not None and _index.generation == generation - 1:
+        _index.generation = generation
+
+
+def update_job(job, generation=None):
+    """
+    职位发布、下线后增量更新本进程的索引
+
+    generation: 本次修改后的职位数据代数；增量更新已经包含这次修改，不需要再整体重建
+    """
+    _record_pending(job.pk, job.job_title, job.company_name, job.city, job.live)
+    if _index.generation is None:
+        # 本进程尚未构建索引，首次查询时会整体构建
+        return
+    _index.update_job(job.pk, job.job_title, job.company_name, job.city, live=job.live)
+    _advance_generation(generation)
+
+
+def remove_job(job, generation=None):
+    """职位删除后从本进程的索引中移除"""
+    _record_pending(job.pk, None, None, None, False)
+    if _index.generation is None:
+        return
+    _index.remove_job(job.pk)
+    _advance_generation(generation)
+
+
+def suggest(prefix, limit=10):
+    return get_autocomplete_index().suggest(prefix, limit)
@@ -0,0 +1,100 @@
+"""
+进程内缓冲的批量写入
+请求中只把待写入的模型对象放进内存缓冲区，由后台线程每累积 flush_size 条或每隔 flush_interval 秒
+用一次 bulk_create 写入数据库，请求路径上没有数据库写操作
+
+- 每个进程各自缓冲；进程退出时（atexit）写入剩余数据，进程异常终止时未写入的数据会丢失，
+  只适合允许少量丢失的统计类数据
+- 写入失败时记录日志并丢弃这一批，不重试，避免缓冲区无限增长
+- 缓冲区超过 max_buffer 条时丢弃新数据（数据库长时间不可用时保护内存）
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedWriter:
+    """
+    model: 要写入的模型类
+    prepare: 可选，写入前对一批对象做过滤或补全（在后台线程中执行，可以查询数据库），返回要写入的对象列表
+    background: 为 False 时不启动后台线程，也不在进程退出时写入，只在调用 flush() 时写入（用于测试和管理命令）
+    """
+
+    def __init__(self, model, flush_size=200, flush_interval=5.0, max_buffer=50000, prepare=None, background=True):
+        self.model = model
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.prepare = prepare
+        self.background = background
+        self.dropped = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        if background:
+            atexit.register(self.flush)
+
+    def add(self, objects):
+        """放入缓冲区（不访问数据库）"""
+        with self._lock:
+            room = self.max_buffer - len(self._buffer)
+            if room < len(objects):
+                self.dropped += len(objects) - max(room, 0)
+                objects = objects[:max(room, 0)]
+            self._buffer.extend(objects)
+            full = len(self._buffer) >= self.flush_size
+        if self.background:
+            self._ensure_thread()
+            if full:
+                self._wakeup.set()
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def flush(self):
+        """立即写入缓冲区中的全部数据，返回写入的数量"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            try:
+                if self.prepare is not None:
+                    batch = self.prepare(batch)
+                self.model.objects.bulk_create(batch, batch_size=1000)
+            except Exception:
+                logger.exception('批量写入 %s 失败，丢弃 %d 条', self.model.__name__, len(batch))
+                return 0
+            return len(batch)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=f'{self.model.__name__}-writer', daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            started = time.monotonic()
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                # 后台线程的数据库连接不会被请求结束时的清理关闭，这里主动关闭
+                connection.close()
+            # 持续高写入量时也至少间隔一小段时间，合并更多数据到一批
+            time.sleep(max(0.0, 0.05 - (time.monotonic() - started)))
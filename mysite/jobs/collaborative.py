@@ -0,0 +1,120 @@
+"""
+基于物品的协同过滤（职位-职位相似度）
+离线由 JobApplication（收藏、申请等记录）构建 用户 × 职位 的稀疏交互矩阵，
+计算每个职位最相似的前 N 个职位，保存到 JobNeighbor 表；推荐时只做一次查表，不在线计算
+
+相似度为二值交互的余弦相似度，并按共同用户数收缩：
+    sim(i, j) = co(i, j) / sqrt(n(i) * n(j)) * co(i, j) / (co(i, j) + SHRINKAGE)
+其中 co(i, j) 为同时收藏/申请过两个职位的用户数，n(i) 为与职位 i 有交互的用户数
+
+相似度矩阵按职位分块计算（每块 block_size 个职位），内存占用与块大小成正比
+"""
+import heapq
+
+import numpy as np
+from django.db import transaction
+from scipy import sparse
+
+# 每个职位保存的相似职位数量
+TOP_N = 20
+
+# 每块计算的职位数量
+BLOCK_SIZE = 1000
+
+# 共同用户数收缩系数（共同用户越少，相似度打折越多）
+SHRINKAGE = 2.0
+
+# 至少有多少个共同用户才认为相似
+MIN_SUPPORT = 2
+
+
+def load_interactions(before=None):
+    """
+    读取交互记录，构建二值的 用户 × 职位 稀疏矩阵（只包含已发布职位）
+
+    before: 只使用此时间之前的交互记录（离线评估时按时间切分）
+
+    返回: (CSC 矩阵, 列对应的职位ID数组)
+    """
+    from .models import JobApplication
+
+    rows = JobApplication.objects.filter(
+        status__in=JobApplication.INTERACTION_STATUSES,
+        job_page__live=True,
+    )
+    if before is not None:
+        rows = rows.filter(created_at__lt=before)
+    rows = rows.values_list('user_id', 'job_page_id').iterator()
+
+    user_index = {}
+    job_index = {}
+    user_rows = []
+    job_cols = []
+    for user_id, job_id in rows:
+        user_rows.append(user_index.setdefault(user_id, len(user_index)))
+        job_cols.append(job_index.setdefault(job_id, len(job_index)))
+
+    matrix = sparse.csc_matrix(
+        (np.ones(len(user_rows), dtype=np.float32), (user_rows, job_cols)),
+        shape=(len(user_index), len(job_index)),
+    )
+    # 同一用户对同一职位只计一次
+    matrix.data[:] = 1
+
+    job_ids = np.empty(len(job_index), dtype=np.int64)
+    for job_id, column in job_index.items():
+        job_ids[column] = job_id
+    return matrix, job_ids
+
+
+def compute_neighbors(matrix, job_ids, top_n=TOP_N, block_size=BLOCK_SIZE, min_support=MIN_SUPPORT):
+    """
+    分块计算每个职位的前 N 个相似职位
+
+    生成: (职位ID, [(相似职位ID, 相似度)])
+    """
+    counts = np.asarray(matrix.sum(axis=0)).ravel()
+    matrix_t = matrix.T.tocsr()
+
+    for start in range(0, matrix.shape[1], block_size):
+        stop = min(start + block_size, matrix.shape[1])
+        # 当前块职位与所有职位的共同用户数（块大小 × 职位数 的稀疏矩阵）
+        co = (matrix_t[start:stop] @ matrix).tocsr()
+        for offset in range(stop - start):
+            row = start + offset
+            begin, end = co.indptr[offset], co.indptr[offset + 1]
+            columns = co.indices[begin:end]
+            shared = co.data[begin:end]
+
+            keep = (columns != row) & (shared >= min_support)
+            columns, shared = columns[keep], shared[keep]
+            if not len(columns):
+                continue
+
+            scores = shared / np.sqrt(counts[row] * counts[columns]) * shared / (shared + SHRINKAGE)
+            top = heapq.nlargest(top_n, zip(scores.tolist(), job_ids[columns].tolist()))
+            yield int(job_ids[row]), [(neighbor_id, score) for score, neighbor_id in top]
+
+
+def build_job_neighbors(top_n=TOP_N, block_size=BLOCK_SIZE, min_support=MIN_SUPPORT, batch_size=5000):
+    """重新计算并替换 JobNeighbor 表，返回 (职位数, 相似关系数)"""
+    from .models import JobNeighbor
+
+    matrix, job_ids = load_interactions()
+    job_count = 0
+    pair_count = 0
+    with transaction.atomic():
+        JobNeighbor.objects.all().delete()
+        batch = []
+        for job_id, neighbors in compute_neighbors(matrix, job_ids, top_n, block_size, min_support):
+            job_count += 1
+            for neighbor_id, score in neighbors:
+                batch.append(JobNeighbor(job_page_id=job_id, neighbor_id=neighbor_id, score=score))
+            if len(batch) >= batch_size:
+                JobNeighbor.objects.bulk_create(batch)
+                pair_count += len(batch)
+                batch = []
+        if batch:
+            JobNeighbor.objects.bulk_create(batch)
+            pair_count += len(batch)
+    return job_count, pair_count
@@ -0,0 +1,86 @@
+"""
+职位互动计数（JobPage.save_count / apply_count / view_count）
+计数保存在 JobPage 表中，页面显示和按热度排序时不再对 applications 执行 COUNT(*)
+
+JobApplication 新建、状态变化、删除时，由信号（见 signals）在同一事务内用 F() 表达式原子增减；
+bulk_create / bulk_update / QuerySet.update 不触发信号，批量修改后运行 reconcile_job_counters 重新统计
+
+浏览数量不对应申请状态：事件日志批量写入浏览事件时按职位累加（见 event_log），
+对账时按 ApplicationEvent 和 ApplicationEventDaily 中的浏览事件重新统计
+"""
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+
+# 申请状态 -> 计数字段
+STATUS_COUNTER_FIELDS = {
+    'saved': 'save_count',
+    'applied': 'apply_count',
+}
+
+VIEW_COUNTER_FIELD = 'view_count'
+
+COUNTER_FIELDS = tuple(STATUS_COUNTER_FIELDS.values()) + (VIEW_COUNTER_FIELD,)
+
+
+def apply_status_change(job_id, old_status, new_status):
+    """状态从 old_status 变为 new_status（新建时 old 为 None，删除时 new 为 None），更新对应计数"""
+    from .models import JobPage
+
+    if old_status == new_status:
+        return
+    updates = {}
+    old_field = STATUS_COUNTER_FIELDS.get(old_status)
+    new_field = STATUS_COUNTER_FIELDS.get(new_status)
+    if old_field:
+        # 计数可能因批量操作而偏小，减到 0 为止（由对账命令修正）；
+        # 先判断再减，避免无符号列（MySQL）计算 0 - 1 时报超出范围错误
+        updates[old_field] = Case(
+            When(**{f'{old_field}__gt': 0}, then=F(old_field) - 1),
+            default=Value(0),
+        )
+    if new_field:
+        updates[new_field] = F(new_field) + 1
+    if updates:
+        from .listing import bump_counter_version
+        JobPage.objects.filter(pk=job_id).update(**updates)
+        bump_counter_version()
+
+
+def add_views(view_counts):
+    """累加浏览数量；view_counts: {职位ID: 新增浏览数}，每个职位一次 F() 更新"""
+    from .models import JobPage
+
+    for job_id, count in view_counts.items():
+        JobPage.objects.filter(pk=job_id).update(**{VIEW_COUNTER_FIELD: F(VIEW_COUNTER_FIELD) + count})
+
+
+def count_interactions(job_ids):
+    """
+    按 JobApplication 和浏览事件实际统计计数：{职位ID: {计数字段: 数量}}
+
+    申请状态一次聚合查询；浏览数量为原始事件与按天汇总行之和，各一次聚合查询
+    """
+    from .models import ApplicationEvent, ApplicationEventDaily, JobApplication
+
+    rows = (
+        JobApplication.objects.filter(job_page_id__in=job_ids)
+        .values('job_page_id')
+        .annotate(**{
+            field: Count('pk', filter=Q(status=status))
+            for status, field in STATUS_COUNTER_FIELDS.items()
+        })
+    )
+    counts = {row.pop('job_page_id'): row for row in rows}
+
+    view_rows = [
+        ApplicationEvent.objects.filter(job_page_id__in=job_ids, event_type=ApplicationEvent.EVENT_VIEW)
+        .values('job_page_id').annotate(total=Count('pk')).order_by()
+        .values_list('job_page_id', 'total'),
+        ApplicationEventDaily.objects.filter(job_page_id__in=job_ids, event_type=ApplicationEvent.EVENT_VIEW)
+        .values('job_page_id').annotate(total=Sum('count')).order_by()
+        .values_list('job_page_id', 'total'),
+    ]
+    for queryset in view_rows:
+        for job_id, total in queryset:
+            job_counts = counts.setdefault(job_id, {})
+            job_counts[VIEW_COUNTER_FIELD] = job_counts.get(VIEW_COUNTER_FIELD, 0) + total
+    return counts
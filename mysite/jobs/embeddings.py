@@ -0,0 +1,78 @@
+"""
+文本向量（embedding）模块
+为简历文本与职位描述生成定长向量，供本地向量索引（vector_index）做近似最近邻检索
+
+嵌入器可以通过 settings.JOB_EMBEDDER 替换（填写类的导入路径，例如接入本地语义模型），
+需要实现 Embedder 接口：dim 属性 + embed(texts) 返回 L2 归一化的 float32 矩阵
+
+默认的 HashingEmbedder 不依赖任何模型或外部服务：
+对分词结果做特征哈希（带符号，减少碰撞偏差），词频取 1 + log(tf)，结果稳定可复现
+"""
+import hashlib
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.utils.html import strip_tags
+from django.utils.module_loading import import_string
+
+from .search_index import tokenize
+
+# 默认向量维度
+DEFAULT_DIM = 256
+
+# 职位名称在职位向量中的权重
+TITLE_WEIGHT = 2
+
+
+class Embedder:
+    """嵌入器接口"""
+    dim = DEFAULT_DIM
+
+    def embed(self, texts):
+        """返回形状为 (len(texts), dim) 的 float32 矩阵，每行 L2 归一化（空文本为全零行）"""
+        raise NotImplementedError
+
+    def embed_one(self, text):
+        return self.embed([text])[0]
+
+
+class HashingEmbedder(Embedder):
+    """基于特征哈希的确定性嵌入器"""
+
+    def __init__(self, dim=DEFAULT_DIM):
+        self.dim = dim
+        self._buckets = {}
+
+    def _bucket(self, term):
+        """词项 -> (维度, 符号)；使用 blake2b 保证跨进程结果一致（内置 hash() 每个进程不同）"""
+        bucket = self._buckets.get(term)
+        if bucket is None:
+            value = int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+            bucket = (value % self.dim, 1.0 if (value >> 63) & 1 else -1.0)
+            if len(self._buckets) < 200000:
+                self._buckets[term] = bucket
+        return bucket
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for term, frequency in Counter(tokenize(text or '')).items():
+                column, sign = self._bucket(term)
+                vectors[row, column] += sign * (1 + np.log(frequency))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+
+def get_embedder():
+    """按 settings.JOB_EMBEDDER 创建嵌入器（默认 HashingEmbedder）"""
+    path = getattr(settings, 'JOB_EMBEDDER', None)
+    if path:
+        return import_string(path)()
+    return HashingEmbedder()
+
+
+def get_job_text(title, description):
+    """职位用于向量化的文本：职位名称（加权重复） + 描述纯文本"""
+    return ' '.join([title or ''] * TITLE_WEIGHT + [strip_tags(description or '')])
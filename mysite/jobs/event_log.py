@@ -0,0 +1,117 @@
+"""
+职位事件日志
+记录用户浏览、收藏、取消收藏、申请职位的事件；事件先放入进程内缓冲区，由后台线程批量写入
+ApplicationEvent（见 buffered_writes），浏览详情页、收藏、申请的请求中不写数据库；
+批量写入时同时按职位累加 JobPage.view_count（见 counters）
+
+超过保留期的原始事件由 compact_application_events 命令按 (日期, 职位, 事件类型) 汇总到
+ApplicationEventDaily 后删除
+"""
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .buffered_writes import BufferedWriter
+
+# 默认保留原始事件的天数
+DEFAULT_RETENTION_DAYS = 90
+
+
+def _count_views(batch):
+    """
+    写入一批事件前累加其中浏览事件对应职位的 view_count
+
+    写入失败时这一批事件被丢弃而计数已累加，偏差由 reconcile_job_counters 修正
+    """
+    from .counters import add_views
+    from .models import ApplicationEvent
+
+    add_views(Counter(event.job_page_id for event in batch if event.event_type == ApplicationEvent.EVENT_VIEW))
+    return batch
+
+
+def create_event_writer(background=True):
+    from .models import ApplicationEvent
+
+    return BufferedWriter(
+        ApplicationEvent,
+        flush_size=getattr(settings, 'APPLICATION_EVENT_FLUSH_SIZE', 200),
+        flush_interval=getattr(settings, 'APPLICATION_EVENT_FLUSH_INTERVAL', 5.0),
+        prepare=_count_views,
+        background=background,
+    )
+
+
+_writer = None
+
+
+def get_event_writer():
+    global _writer
+    if _writer is None:
+        _writer = create_event_writer()
+    return _writer
+
+
+def log_event(user, job_id, event):
+    """记录一个事件（只放入缓冲区）；event 为 ApplicationEvent.EVENT_NAMES 中的名称，未登录用户记为匿名"""
+    from .models import ApplicationEvent
+
+    user_id = user.pk if user is not None and user.is_authenticated else None
+    get_event_writer().add([ApplicationEvent(user_id=user_id, job_page_id=job_id, event_type=ApplicationEvent.EVENT_NAMES[event])])
+
+
+def compact_events(before, dry_run=False):
+    """
+    把 before 之前的原始事件按天（当前时区）汇总到 ApplicationEventDaily 并删除
+
+    按 created_at 范围逐天处理（走时间索引），每天在一个事务中汇总累加到已有的日汇总行并删除当天的原始事件，
+    中途中断后重新执行不会重复计数
+    返回: [(日期, 原始事件数, 汇总行数)]
+    """
+    from .models import ApplicationEvent, ApplicationEventDaily
+
+    oldest = ApplicationEvent.objects.filter(created_at__lt=before).aggregate(oldest=Min('created_at'))['oldest']
+    if oldest is None:
+        return []
+
+    results = []
+    day = timezone.localtime(oldest).date()
+    while True:
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        if start >= before:
+            break
+        end = min(timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min)), before)
+        day_events = ApplicationEvent.objects.filter(created_at__gte=start, created_at__lt=end)
+        with transaction.atomic():
+            rows = list(
+                day_events.values('job_page_id', 'event_type')
+                .annotate(count=Count('pk'))
+                .order_by()
+            )
+            if rows and not dry_run:
+                existing = {
+                    (daily.job_page_id, daily.event_type): daily
+                    for daily in ApplicationEventDaily.objects.select_for_update().filter(date=day)
+                }
+                created = []
+                updated = []
+                for row in rows:
+                    daily = existing.get((row['job_page_id'], row['event_type']))
+                    if daily is None:
+                        created.append(ApplicationEventDaily(
+                            date=day, job_page_id=row['job_page_id'], event_type=row['event_type'], count=row['count'],
+                        ))
+                    else:
+                        daily.count += row['count']
+                        updated.append(daily)
+                ApplicationEventDaily.objects.bulk_create(created, batch_size=1000)
+                ApplicationEventDaily.objects.bulk_update(updated, ['count'], batch_size=1000)
+                day_events.delete()
+        if rows:
+            results.append((day, sum(row['count'] for row in rows), len(rows)))
+        day += timedelta(days=1)
+    return results
@@ -0,0 +1,238 @@
+"""
+职位列表查询模块
+职位列表页与职位API共用的筛选、排序、分页逻辑
+
+同一组筛选条件（规范化后）对应的结果ID会缓存一段时间；
+任何职位发布、下线、删除都会递增"职位数据代数"，使所有列表缓存一起失效
+"""
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator, Page
+from django.utils import timezone
+
+from .pagination import CursorPage, CursorPaginator
+from .salary_utils import build_salary_query, parse_salary_filter
+from .search_index import tokenize_query
+
+# 每页职位数量（适合移动端）
+PAGE_SIZE = 15
+
+# 无关键词时的排序键（游标分页）
+LISTING_ORDERING = ('-first_published_at', '-id')
+
+# 按热度排序（sort=popular）：申请数、收藏数（jobpage_popularity_idx），计数变化后最多 LISTING_CACHE_TIMEOUT 内生效
+POPULAR_ORDERING = ('-apply_count', '-save_count', '-id')
+
+# 列表结果缓存
+LISTING_CACHE_TIMEOUT = 60 * 5
+GENERATION_CACHE_KEY = 'jobs:generation'
+MODIFIED_AT_CACHE_KEY = 'jobs:modified_at'
+
+# 收藏数、申请数的版本号：计数变化不使列表缓存失效（缓存只有职位ID），只用于列表API的 ETag/Last-Modified
+COUNTER_VERSION_CACHE_KEY = 'jobs:counter_version'
+COUNTERS_MODIFIED_AT_CACHE_KEY = 'jobs:counters_modified_at'
+
+# 支持的筛选参数
+FILTER_KEYS = ('q', 'job_type', 'province', 'city', 'district', 'salary_min', 'salary_max', 'sort')
+
+# 支持的排序方式（空值为按发布时间）
+SORT_OPTIONS = ('popular',)
+
+
+def get_job_generation():
+    """当前的职位数据代数（缓存丢失时用时间戳重新初始化，保证不会与旧值重复）"""
+    generation = cache.get(GENERATION_CACHE_KEY)
+    if generation is None:
+        generation = int(time.time() * 1000)
+        if not cache.add(GENERATION_CACHE_KEY, generation, None):
+            generation = cache.get(GENERATION_CACHE_KEY, generation)
+    return generation
+
+
+def bump_job_generation():
+    """职位数据发生变化时调用，使所有列表缓存失效"""
+    cache.set(MODIFIED_AT_CACHE_KEY, timezone.now().replace(microsecond=0), None)
+    try:
+        return cache.incr(GENERATION_CACHE_KEY)
+    except ValueError:
+        return get_job_generation()
+
+
+def get_job_modified_at():
+    """职位数据最后一次变化的时间（用于 Last-Modified 响应头）"""
+    modified_at = cache.get(MODIFIED_AT_CACHE_KEY)
+    if modified_at is None:
+        modified_at = timezone.now().replace(microsecond=0)
+        if not cache.add(MODIFIED_AT_CACHE_KEY, modified_at, None):
+            modified_at = cache.get(MODIFIED_AT_CACHE_KEY, modified_at)
+    return modified_at
+
+
+def get_counter_version():
+    """当前的互动计数版本号（缓存丢失时用时间戳重新初始化）"""
+    version = cache.get(COUNTER_VERSION_CACHE_KEY)
+    if version is None:
+        version = int(time.time() * 1000)
+        if not cache.add(COUNTER_VERSION_CACHE_KEY, version, None):
+            version = cache.get(COUNTER_VERSION_CACHE_KEY, version)
+    return version
+
+
+def bump_counter_version():
+    """收藏数、申请数变化时调用，使列表API的 ETag 和 Last-Modified 随之变化"""
+    cache.set(COUNTERS_MODIFIED_AT_CACHE_KEY, timezone.now().replace(microsecond=0), None)
+    try:
+        return cache.incr(COUNTER_VERSION_CACHE_KEY)
+    except ValueError:
+        return get_counter_version()
+
+
+def get_counters_modified_at():
+    """互动计数最后一次变化的时间；从未变化过时返回 None"""
+    return cache.get(COUNTERS_MODIFIED_AT_CACHE_KEY)
+
+
+def parse_job_filters(params):
+    """从请求参数中读取筛选条件（去除首尾空白）"""
+    return {key: params.get(key, '').strip() for key in FILTER_KEYS}
+
+
+def canonicalize_filters(filters):
+    """
+    规范化筛选条件，使等价的请求得到相同的缓存键
+
+    - 关键词合并空白并转为小写
+    - 薪资换算为元（无法解析的值视为未填写）
+    - 省略空值
+    """
+    canonical = {}
+    for key in FILTER_KEYS:
+        value = filters.get(key, '')
+        if key == 'q':
+            value = ' '.join(value.lower().split())
+        elif key in ('salary_min', 'salary_max'):
+            value = parse_salary_filter(value)
+        elif key == 'sort' and value not in SORT_OPTIONS:
+            value = ''
+        if value:
+            canonical[key] = value
+    return canonical
+
+
+def filter_jobs(queryset, filters):
+    """应用除关键词以外的筛选条件（职位类型、省市区、薪资）"""
+    if filters.get('job_type'):
+        queryset = queryset.filter(job_type=filters['job_type'])
+
+    # 使用保存时解析好的省市区字段，直接命中复合索引
+    for field in ('province', 'city', 'district'):
+        if filters.get(field):
+            queryset = queryset.filter(**{field: filters[field]})
+
+    # 使用保存时解析好的薪资区间字段，在数据库中完成筛选
+    if filters.get('salary_min') or filters.get('salary_max'):
+        queryset = queryset.filter(build_salary_query(filters.get('salary_min'), filters.get('salary_max')))
+
+    return queryset
+
+
+def get_listing_queryset(parent, filters):
+    """父页面下已发布、且符合筛选条件的职位"""
+    from .models import JobPage
+
+    queryset = JobPage.objects.live()
+    if parent is not None:
+        queryset = queryset.child_of(parent)
+    return filter_jobs(queryset, filters)
+
+
+def _listing_cache_key(parent, filters, position, per_page):
+    payload = json.dumps(
+        [parent.pk if parent is not None else None, canonicalize_filters(filters), position, per_page],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    digest = hashlib.md5(payload.encode('utf-8')).hexdigest()
+    return f'jobs:listing:{get_job_generation()}:{digest}'
+
+
+def _compute_listing(parent, filters, cursor, page, per_page):
+    """执行查询，返回可缓存的结果描述（只包含职位ID和分页信息）"""
+    queryset = get_listing_queryset(parent, filters)
+    search_query = filters.get('q', '')
+
+    if tokenize_query(search_query):
+        # 关键词检索：BM25 相关度排序，使用页码分页
+        from .ranking import RankedJobResults
+        paginator = Paginator(RankedJobResults(search_query, candidates=queryset), per_page)
+        try:
+            results = paginator.page(page)
+        except PageNotAnInteger:
+            results = paginator.page(1)
+        except EmptyPage:
+            results = paginator.page(paginator.num_pages)
+        return {
+            'mode': 'ranked',
+            'ids': [job.pk for job in results],
+            'number': results.number,
+            'count': paginator.count,
+        }
+
+    # 无关键词时按发布时间（或热度）倒序，使用游标分页
+    ordering = POPULAR_ORDERING if filters.get('sort') == 'popular' else LISTING_ORDERING
+    paginator = CursorPaginator(queryset, per_page, ordering=ordering)
+    results = paginator.page(cursor)
+    return {
+        'mode': 'cursor',
+        'ids': [job.pk for job in results],
+        'has_next': results.has_next(),
+        'has_previous': results.has_previous(),
+        'next_cursor': results.next_cursor,
+        'previous_cursor': results.previous_cursor,
+    }
+
+
+def load_jobs(ids, queryset=None):
+    """按给定顺序加载职位对象（一次查询）"""
+    from .models import JobPage
+
+    if queryset is None:
+        queryset = JobPage.objects.all()
+    jobs = queryset.filter(pk__in=ids).in_bulk()
+    return [jobs[pk] for pk in ids if pk in jobs]
+
+
+def get_job_listing(parent, filters, cursor=None, page=None, per_page=PAGE_SIZE, queryset=None):
+    """
+    获取一页职位列表
+
+    parent: 职位索引页（为None时不限父页面）
+    queryset: 可选，用于加载职位对象的 QuerySet（例如用 only() 限定字段）
+    返回: (分页对象, 是否为游标分页)
+    """
+    position = {'cursor': cursor or ''} if not tokenize_query(filters.get('q', '')) else {'page': page or 1}
+    key = _listing_cache_key(parent, filters, position, per_page)
+    listing = cache.get(key)
+    if listing is None:
+        listing = _compute_listing(parent, filters, cursor, page, per_page)
+        cache.set(key, listing, LISTING_CACHE_TIMEOUT)
+
+    object_list = load_jobs(listing['ids'], queryset)
+
+    if listing['mode'] == 'ranked':
+        paginator = Paginator([], per_page)
+        paginator.count = listing['count']
+        return Page(object_list, listing['number'], paginator), False
+
+    paginator = CursorPaginator(get_listing_queryset(parent, filters), per_page, ordering=LISTING_ORDERING)
+    return CursorPage(
+        object_list,
+        paginator,
+        listing['has_next'],
+        listing['has_previous'],
+        listing['next_cursor'],
+        listing['previous_cursor'],
+    ), True
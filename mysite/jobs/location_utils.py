@@ -96,57 +96,153 @@ def parse_location(location_str):
     return province, city, district
 
 
-def extract_provinces_from_jobs():
-    """从所有职位中提取唯一的省份列表"""
-    from .models import JobPage
+# 地点统计树的缓存键（内容变化时整体替换）
+LOCATION_TREE_CACHE_KEY = 'jobs:location_tree'
+LOCATION_TREE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def rebuild_location_facets():
+    """
+    根据已发布职位的省市区字段全量重建 LocationFacet 表
     
-    provinces = set()
-    for job in JobPage.objects.live().values_list('location', flat=True):
-        if job:
-            province, _, _ = parse_location(job)
-            if province:
-                provinces.add(province)
+    只在回填或修复数据时使用，日常更新由发布/下线信号增量完成
+    """
+    from django.db import transaction
+    from django.db.models import Count
+    from .models import JobPage, LocationFacet
+    
+    rows = (
+        JobPage.objects.live()
+        .values('province', 'city', 'district')
+        .annotate(job_count=Count('id'))
+        .order_by()
+    )
+    facets = [LocationFacet(**row) for row in rows]
+    with transaction.atomic():
+        LocationFacet.objects.all().delete()
+        LocationFacet.objects.bulk_create(facets, batch_size=1000)
+    invalidate_location_tree()
+    return len(facets)
+
+
+def refresh_location_facets(keys):
+    """
+    增量刷新指定 (省份, 城市, 区县) 的职位数量
     
-    return sorted(list(provinces))
+    每个键只做一次走索引的 COUNT，代价与全表大小无关
+    """
+    from .models import JobPage, LocationFacet
+    
+    for province, city, district in set(keys):
+        job_count = JobPage.objects.live().filter(
+            province=province, city=city, district=district
+        ).count()
+        if job_count:
+            LocationFacet.objects.update_or_create(
+                province=province, city=city, district=district,
+                defaults={'job_count': job_count},
+            )
+        else:
+            LocationFacet.objects.filter(
+                province=province, city=city, district=district
+            ).delete()
+    invalidate_location_tree()
 
 
-def extract_cities_from_jobs(province=None):
-    """从所有职位中提取唯一的城市列表"""
-    from .models import JobPage
+def invalidate_location_tree():
+    """清除缓存的地点统计树，下次读取时从 LocationFacet 重新构建"""
+    from django.core.cache import cache
+    cache.delete(LOCATION_TREE_CACHE_KEY)
+
+
+def build_location_tree():
+    """
+    从 LocationFacet 构建 省 -> 市 -> 区 的统计树
     
-    cities = set()
-    for job in JobPage.objects.live().values_list('location', flat=True):
-        if job:
-            p, city, _ = parse_location(job)
+    返回: {'version': str, 'tree': {province: {'count': n, 'cities': {city: {'count': n, 'districts': {district: n}}}}}}
+    """
+    import hashlib
+    import json
+    from .models import LocationFacet
+    
+    tree = {}
+    facets = LocationFacet.objects.filter(job_count__gt=0).values_list(
+        'province', 'city', 'district', 'job_count'
+    )
+    for province, city, district, job_count in facets:
+        province_node = tree.setdefault(province, {'count': 0, 'cities': {}})
+        province_node['count'] += job_count
+        city_node = province_node['cities'].setdefault(city, {'count': 0, 'districts': {}})
+        city_node['count'] += job_count
+        city_node['districts'][district] = city_node['districts'].get(district, 0) + job_count
+    
+    payload = json.dumps(tree, sort_keys=True, ensure_ascii=False)
+    version = hashlib.md5(payload.encode('utf-8')).hexdigest()
+    return {'version': version, 'tree': tree}
+
+
+def get_location_tree():
+    """获取地点统计树（优先读取缓存）"""
+    from django.core.cache import cache
+    
+    location_tree = cache.get(LOCATION_TREE_CACHE_KEY)
+    if location_tree is None:
+        location_tree = build_location_tree()
+        cache.set(LOCATION_TREE_CACHE_KEY, location_tree, LOCATION_TREE_CACHE_TIMEOUT)
+    return location_tree
+
+
+def get_live_job_count():
+    """已发布职位总数（LocationFacet 各行之和，随职位发布/下线/删除增量维护，读取缓存的统计树）"""
+    tree = get_location_tree()['tree']
+    return sum(node['count'] for node in tree.values())
+
+
+def get_province_counts():
+    """返回 {省份: 职位数量}"""
+    tree = get_location_tree()['tree']
+    return {province: node['count'] for province, node in tree.items() if province}
+
+
+def get_city_counts(province=None):
+    """返回 {城市: 职位数量}，可按省份过滤"""
+    tree = get_location_tree()['tree']
+    counts = {}
+    for p, province_node in tree.items():
+        if province and p != province:
+            continue
+        for city, city_node in province_node['cities'].items():
             if city:
-                if province:
-                    if p == province:
-                        cities.add(city)
-                else:
-                    cities.add(city)
-    
-    return sorted(list(cities))
+                counts[city] = counts.get(city, 0) + city_node['count']
+    return counts
+
+
+def get_district_counts(province=None, city=None):
+    """返回 {区县: 职位数量}，可按省份和城市过滤"""
+    tree = get_location_tree()['tree']
+    counts = {}
+    for p, province_node in tree.items():
+        if province and p != province:
+            continue
+        for c, city_node in province_node['cities'].items():
+            if city and c != city:
+                continue
+            for district, job_count in city_node['districts'].items():
+                if district:
+                    counts[district] = counts.get(district, 0) + job_count
+    return counts
+
+
+def extract_provinces_from_jobs():
+    """从地点统计树中获取唯一的省份列表"""
+    return sorted(get_province_counts())
+
+
+def extract_cities_from_jobs(province=None):
+    """从地点统计树中获取唯一的城市列表"""
+    return sorted(get_city_counts(province=province))
 
 
 def extract_districts_from_jobs(province=None, city=None):
-    """从所有职位中提取唯一的区县列表"""
-    from .models import JobPage
-    
-    districts = set()
-    for job in JobPage.objects.live().values_list('location', flat=True):
-        if job:
-            p, c, district = parse_location(job)
-            if district:
-                if province and city:
-                    if p == province and c == city:
-                        districts.add(district)
-                elif province:
-                    if p == province:
-                        districts.add(district)
-                elif city:
-                    if c == city:
-                        districts.add(district)
-                else:
-                    districts.add(district)
-    
-    return sorted(list(districts))
+    """从地点统计树中获取唯一的区县列表"""
+    return sorted(get_district_counts(province=province, city=city))
@@ -0,0 +1,99 @@
+"""
+按主键分批回填 JobPage 字段的管理命令基类（文件名以下划线开头，Django 不会把它当作命令）
+
+子类只需要声明要更新的字段、计算所需的列，并实现计算步骤；分批遍历、比较、批量写回、
+预览模式和进度输出都在这里完成
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs.listing import bump_job_generation
+from jobs.models import JobPage
+
+
+class ChunkedJobUpdateCommand(BaseCommand):
+    """
+    fields: 要回填的字段
+    source_fields: 计算新值需要读取的列
+    compute(*source_values): 返回 fields 对应的新值元组；需要按批次查询时改为覆盖 compute_chunk
+    after_write(changed): 每批写入后调用，默认使职位列表缓存失效
+    finish(): 全部写入后调用，返回追加到完成提示中的说明
+    """
+    fields = ()
+    source_fields = ()
+    done_label = '回填完成'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='每批处理的职位数量（默认1000）',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='只统计需要更新的数据，不实际修改',
+        )
+
+    def compute(self, *source_values):
+        raise NotImplementedError
+
+    def compute_chunk(self, rows):
+        """rows: [(pk, *source_values)]，返回与之对应的新值元组列表"""
+        return [self.compute(*row[1:]) for row in rows]
+
+    def after_write(self, changed):
+        # 批量更新不会触发发布信号，需要手动使列表缓存失效
+        bump_job_generation()
+
+    def finish(self):
+        return ''
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        dry_run = options['dry_run']
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('这是预览模式，不会实际修改数据'))
+
+        fields = list(self.fields)
+        source_count = 1 + len(self.source_fields)
+        last_pk = 0
+        scanned_count = 0
+        updated_count = 0
+
+        # 按主键分批遍历，每批只取需要的列，避免一次性加载全表
+        while True:
+            rows = list(
+                JobPage.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', *self.source_fields, *fields)[:chunk_size]
+            )
+            if not rows:
+                break
+
+            expected = self.compute_chunk([row[:source_count] for row in rows])
+            changed = []
+            for row, values in zip(rows, expected):
+                values = tuple(values)
+                if tuple(row[source_count:]) != values:
+                    changed.append(JobPage(pk=row[0], **dict(zip(fields, values))))
+
+            if changed and not dry_run:
+                with transaction.atomic():
+                    JobPage.objects.bulk_update(changed, fields)
+                self.after_write(changed)
+
+            last_pk = rows[-1][0]
+            scanned_count += len(rows)
+            updated_count += len(changed)
+            self.stdout.write(f'已处理 {scanned_count} 个职位，需更新 {updated_count} 个')
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(
+                f'\n预览完成！共扫描 {scanned_count} 个职位，将更新 {updated_count} 个'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'\n{self.done_label}！共扫描 {scanned_count} 个职位，更新 {updated_count} 个{self.finish()}'
+            ))
@@ -0,0 +1,21 @@
+"""
+为已有的 JobPage 回填省市区字段（province / city / district）
+使用方法: python manage.py backfill_job_locations [--chunk-size 1000] [--dry-run]
+"""
+from jobs.location_utils import parse_location, rebuild_location_facets
+
+from ._chunked import ChunkedJobUpdateCommand
+
+
+class Command(ChunkedJobUpdateCommand):
+    help = '按批次为已有职位回填解析后的省市区字段'
+    fields = ('province', 'city', 'district')
+    source_fields = ('location',)
+
+    def compute(self, location):
+        return tuple(part or '' for part in parse_location(location))
+
+    def finish(self):
+        # 批量更新不会触发发布信号，需要重建地点统计
+        facet_count = rebuild_location_facets()
+        return f'，重建地点统计 {facet_count} 条'
@@ -0,0 +1,17 @@
+"""
+为已有的 JobPage 回填标签位掩码（tag_bits：专业、应届生、技能）
+使用方法: python manage.py backfill_job_tags [--chunk-size 1000] [--dry-run]
+修改 tag_utils 中的标签词表后也需要运行一次
+"""
+from jobs.tag_utils import compute_tag_bits
+
+from ._chunked import ChunkedJobUpdateCommand
+
+
+class Command(ChunkedJobUpdateCommand):
+    help = '按批次为已有职位回填标签位掩码'
+    fields = ('tag_bits',)
+    source_fields = ('job_title', 'description')
+
+    def compute(self, title, description):
+        return (compute_tag_bits(title, description),)
@@ -0,0 +1,16 @@
+"""
+为已有的 JobPage 回填标准化薪资区间字段（salary_min_yuan / salary_max_yuan / salary_negotiable）
+使用方法: python manage.py backfill_salary_ranges [--chunk-size 1000] [--dry-run]
+"""
+from jobs.salary_utils import normalize_salary
+
+from ._chunked import ChunkedJobUpdateCommand
+
+
+class Command(ChunkedJobUpdateCommand):
+    help = '按批次为已有职位回填标准化薪资区间字段'
+    fields = ('salary_min_yuan', 'salary_max_yuan', 'salary_negotiable')
+    source_fields = ('salary',)
+
+    def compute(self, salary):
+        return normalize_salary(salary)
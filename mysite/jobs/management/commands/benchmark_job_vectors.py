@@ -0,0 +1,95 @@
+"""
+评估职位向量索引：近似检索与精确检索（暴力扫描）对比的召回率和查询耗时
+使用方法: python manage.py benchmark_job_vectors [--queries 200] [--k 10] [--nprobe 4 8 16]
+查询向量优先使用学生档案文本（专业、求职偏好、简历），不足时用已索引的职位向量补足
+"""
+import random
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.embeddings import get_embedder
+from jobs.models import StudentProfile
+from jobs.recommend import get_profile_text
+from jobs.vector_index import DEFAULT_NPROBE, get_vector_index
+
+
+def _percentile(values, percent):
+    return float(np.percentile(values, percent)) * 1000 if values else 0.0
+
+
+class Command(BaseCommand):
+    help = '评估职位向量索引的召回率和查询耗时'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=200,
+            help='查询数量（默认200）',
+        )
+        parser.add_argument(
+            '--k',
+            type=int,
+            default=10,
+            help='每次查询返回的数量（默认10）',
+        )
+        parser.add_argument(
+            '--nprobe',
+            type=int,
+            nargs='+',
+            default=[DEFAULT_NPROBE],
+            help=f'探测的聚类数量，可以指定多个（默认{DEFAULT_NPROBE}）',
+        )
+
+    def get_queries(self, index, count):
+        texts = [
+            text for text in (
+                get_profile_text(profile) for profile in StudentProfile.objects.all()[:count]
+            ) if text
+        ]
+        queries = list(get_embedder().embed(texts)) if texts else []
+        if len(queries) < count:
+            _, vectors = index.iter_vectors()
+            if len(vectors):
+                rows = random.Random(0).choices(range(len(vectors)), k=count - len(queries))
+                queries.extend(np.asarray(vectors[rows]))
+        return [query for query in queries if query.any()]
+
+    def handle(self, *args, **options):
+        index = get_vector_index(force_check=True)
+        if index is None:
+            raise CommandError('还没有构建向量索引，请先运行 build_job_vectors')
+
+        k = max(1, options['k'])
+        queries = self.get_queries(index, max(1, options['queries']))
+        if not queries:
+            raise CommandError('没有可用的查询')
+
+        exact_results = []
+        exact_times = []
+        for query in queries:
+            started = time.perf_counter()
+            exact_results.append({job_id for job_id, _ in index.brute_force(query, k)})
+            exact_times.append(time.perf_counter() - started)
+
+        self.stdout.write(
+            f'{len(index)} 个职位，{len(queries)} 个查询，k={k}\n'
+            f'暴力扫描: p50 {_percentile(exact_times, 50):.2f} ms, p95 {_percentile(exact_times, 95):.2f} ms'
+        )
+        for nprobe in options['nprobe']:
+            hits = 0
+            expected = 0
+            times = []
+            for query, exact in zip(queries, exact_results):
+                started = time.perf_counter()
+                found = {job_id for job_id, _ in index.search(query, k, nprobe=max(1, nprobe))}
+                times.append(time.perf_counter() - started)
+                hits += len(found & exact)
+                expected += len(exact)
+            recall = hits / expected if expected else 1.0
+            self.stdout.write(
+                f'nprobe={nprobe}: recall@{k} {recall:.3f}, '
+                f'p50 {_percentile(times, 50):.2f} ms, p95 {_percentile(times, 95):.2f} ms'
+            )
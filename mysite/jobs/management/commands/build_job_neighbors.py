@@ -0,0 +1,45 @@
+"""
+由收藏/申请记录计算相似职位（协同过滤），替换 JobNeighbor 表
+使用方法: python manage.py build_job_neighbors [--top-n 20] [--block-size 1000] [--min-support 2]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.collaborative import BLOCK_SIZE, MIN_SUPPORT, TOP_N, build_job_neighbors
+
+
+class Command(BaseCommand):
+    help = '由收藏/申请记录计算每个职位的相似职位'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-n',
+            type=int,
+            default=TOP_N,
+            help=f'每个职位保存的相似职位数量（默认{TOP_N}）',
+        )
+        parser.add_argument(
+            '--block-size',
+            type=int,
+            default=BLOCK_SIZE,
+            help=f'每块计算的职位数量，越小内存占用越低（默认{BLOCK_SIZE}）',
+        )
+        parser.add_argument(
+            '--min-support',
+            type=int,
+            default=MIN_SUPPORT,
+            help=f'至少有多少个共同用户才认为相似（默认{MIN_SUPPORT}）',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        job_count, pair_count = build_job_neighbors(
+            top_n=max(1, options['top_n']),
+            block_size=max(1, options['block_size']),
+            min_support=max(1, options['min_support']),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'计算完成！{job_count} 个职位共保存 {pair_count} 条相似关系，'
+            f'耗时 {time.perf_counter() - started:.1f} 秒'
+        ))
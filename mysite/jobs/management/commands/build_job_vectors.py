@@ -0,0 +1,39 @@
+"""
+构建职位向量索引（IVF 近似最近邻）并保存到 JOB_INDEX_DIR/ann
+使用方法: python manage.py build_job_vectors [--chunk-size 2000] [--nlist 0]
+构建之后新发布/下线的职位由信号增量写入；建议定时重新构建，合并增量数据并清理已删除的向量
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.vector_index import build_job_vectors, get_index_dir
+
+
+class Command(BaseCommand):
+    help = '构建职位向量索引'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='每批读取并向量化的职位数量（默认2000）',
+        )
+        parser.add_argument(
+            '--nlist',
+            type=int,
+            default=0,
+            help='聚类（倒排列表）数量（默认 sqrt(职位数)）',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        index = build_job_vectors(
+            chunk_size=max(1, options['chunk_size']),
+            nlist=options['nlist'] or None,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'构建完成！共 {len(index)} 个职位、{index.meta["nlist"]} 个聚类、{index.dim} 维，'
+            f'耗时 {time.perf_counter() - started:.1f} 秒，保存在 {get_index_dir()}'
+        ))
@@ -0,0 +1,39 @@
+"""
+构建职位文本 TF-IDF 索引并保存到 JOB_INDEX_DIR（推荐时用于档案与职位的文本匹配）
+使用方法: python manage.py build_tfidf_index [--chunk-size 2000] [--min-df 1]
+建议定时运行；索引构建之后发布的职位在下次构建前按专业关键词匹配
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.tfidf import MIN_DF, build_tfidf_index, get_index_dir
+
+
+class Command(BaseCommand):
+    help = '构建职位文本 TF-IDF 索引'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='每批读取的职位数量（默认2000）',
+        )
+        parser.add_argument(
+            '--min-df',
+            type=int,
+            default=MIN_DF,
+            help=f'词项至少出现在多少个职位中才保留（默认{MIN_DF}）',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        doc_count, term_count = build_tfidf_index(
+            chunk_size=max(1, options['chunk_size']),
+            min_df=max(1, options['min_df']),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'构建完成！共 {doc_count} 个职位、{term_count} 个词项，'
+            f'耗时 {time.perf_counter() - started:.1f} 秒，保存在 {get_index_dir()}'
+        ))
@@ -0,0 +1,105 @@
+"""
+离线检查职位 slug 完整性，可选择自动修复
+检查项：slug 为空、slug 含非ASCII字符、同一父页面下 slug 重复、url_path 与 slug 不一致
+使用方法: python manage.py check_job_slugs [--fix] [--chunk-size 1000]
+"""
+from django.core.management.base import BaseCommand
+from wagtail.models import Page
+
+from jobs.models import JobPage
+from jobs.slug_utils import build_job_slug, find_unique_slug, is_valid_job_slug
+
+
+class Command(BaseCommand):
+    help = '检查职位 slug 完整性（为空、非ASCII、重复、url_path 不一致），可选择修复'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='修复发现的问题（默认只报告）',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='每批扫描的职位数量（默认1000）',
+        )
+
+    def handle(self, *args, **options):
+        fix = options['fix']
+        chunk_size = max(1, options['chunk_size'])
+        steplen = Page.steplen
+
+        # {父页面path: {slug: 职位ID}}，用于检查同级重复
+        siblings = {}
+        problems = []
+        last_pk = 0
+        scanned_count = 0
+
+        # 按主键分批扫描，只读取检查需要的列
+        while True:
+            rows = list(
+                JobPage.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', 'slug', 'path', 'url_path')[:chunk_size]
+            )
+            if not rows:
+                break
+
+            for pk, slug, path, url_path in rows:
+                taken = siblings.setdefault(path[:-steplen], {})
+                if not is_valid_job_slug(slug):
+                    problems.append((pk, 'slug 为空或包含非ASCII字符', slug))
+                elif slug in taken:
+                    problems.append((pk, f'与职位 {taken[slug]} 的 slug 重复', slug))
+                else:
+                    taken[slug] = pk
+                    if not url_path.endswith(f'/{slug}/'):
+                        problems.append((pk, 'url_path 与 slug 不一致', url_path))
+
+            last_pk = rows[-1][0]
+            scanned_count += len(rows)
+
+        for pk, reason, value in problems:
+            self.stdout.write(f'  职位 {pk}: {reason}（{value!r}）')
+
+        if not problems:
+            self.stdout.write(self.style.SUCCESS(f'[OK] 共扫描 {scanned_count} 个职位，没有发现问题'))
+            return
+
+        if not fix:
+            self.stdout.write(self.style.WARNING(
+                f'\n共扫描 {scanned_count} 个职位，发现 {len(problems)} 个问题'
+            ))
+            self.stdout.write('加上 --fix 参数来修复')
+            return
+
+        fixed_count = 0
+        skipped_count = 0
+        for pk, reason, value in problems:
+            job = JobPage.objects.get(pk=pk)
+            taken = siblings.setdefault(job.path[:-steplen], {})
+            try:
+                if is_valid_job_slug(job.slug) and taken.get(job.slug) == job.pk:
+                    # slug 本身没有问题，只需要根据父页面重新计算 url_path
+                    job.set_url_path(job.get_parent())
+                    job.save(update_fields=['url_path'])
+                else:
+                    job.slug = find_unique_slug(
+                        build_job_slug(job.company_name, job.job_title, job.pk), taken
+                    )
+                    job.save(update_fields=['slug'])
+                    taken[job.slug] = job.pk
+                    # 如果页面已发布，需要重新发布以更新 URL
+                    if job.live:
+                        job.save_revision().publish()
+                fixed_count += 1
+                self.stdout.write(f'[OK] 修复: {job.title} -> {job.url_path}')
+            except Exception as e:
+                skipped_count += 1
+                self.stdout.write(self.style.ERROR(f'[ERROR] 跳过: {job.title} - 错误: {str(e)}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n修复完成！共扫描 {scanned_count} 个职位，成功修复 {fixed_count} 个，跳过 {skipped_count} 个'
+        ))
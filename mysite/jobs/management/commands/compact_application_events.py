@@ -0,0 +1,46 @@
+"""
+压缩职位事件日志：超过保留期的原始事件（ApplicationEvent）按天汇总到 ApplicationEventDaily 后删除
+使用方法: python manage.py compact_application_events [--keep-days 90] [--dry-run]
+"""
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.event_log import DEFAULT_RETENTION_DAYS, compact_events
+
+
+class Command(BaseCommand):
+    help = '把超过保留期的职位事件按天汇总并删除原始记录'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-days',
+            type=int,
+            default=DEFAULT_RETENTION_DAYS,
+            help=f'保留最近多少天的原始事件（默认{DEFAULT_RETENTION_DAYS}天）',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='只统计需要压缩的数据，不实际修改',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        if dry_run:
+            self.stdout.write(self.style.WARNING('这是预览模式，不会实际修改数据'))
+
+        # 保留期从当天零点起算，每次只压缩完整的自然日
+        today = timezone.localdate()
+        before = timezone.make_aware(datetime.combine(today - timedelta(days=max(0, options['keep_days'])), time.min))
+
+        event_count = 0
+        for day, count, row_count in compact_events(before, dry_run=dry_run):
+            event_count += count
+            self.stdout.write(f'{day}: {count} 条事件 -> {row_count} 行汇总')
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f'\n预览完成！{before:%Y-%m-%d} 之前共 {event_count} 条事件需要压缩'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'\n压缩完成！共汇总并删除 {event_count} 条事件'))
@@ -0,0 +1,78 @@
+"""
+离线评估推荐引擎：按时间切分 JobApplication 历史，重放各引擎变体，比较排序质量和耗时
+使用方法: python manage.py evaluate_recommendations [--k 10] [--test-fraction 0.2] [--cutoff 2025-06-01]
+          [--variants default no_neighbor] [--max-users 1000]
+修改候选生成或打分逻辑后，上线前运行一次，与修改前的结果对比
+"""
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from jobs.evaluation import TEST_FRACTION, VARIANTS, evaluate_recommendations
+
+
+class Command(BaseCommand):
+    help = '离线评估推荐引擎（precision@k、recall@k、覆盖率、耗时）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--k',
+            type=int,
+            default=10,
+            help='每个用户推荐的数量（默认10）',
+        )
+        parser.add_argument(
+            '--test-fraction',
+            type=float,
+            default=TEST_FRACTION,
+            help=f'最近多少比例的交互记录作为测试期（默认{TEST_FRACTION}）',
+        )
+        parser.add_argument(
+            '--cutoff',
+            help='切分日期（YYYY-MM-DD），指定后忽略 --test-fraction',
+        )
+        parser.add_argument(
+            '--variants',
+            nargs='+',
+            choices=list(VARIANTS),
+            help='要评估的引擎变体（默认全部）',
+        )
+        parser.add_argument(
+            '--max-users',
+            type=int,
+            default=0,
+            help='最多评估的用户数量（默认不限）',
+        )
+
+    def handle(self, *args, **options):
+        k = max(1, options['k'])
+        cutoff = None
+        if options['cutoff']:
+            try:
+                cutoff = timezone.make_aware(datetime.combine(
+                    datetime.strptime(options['cutoff'], '%Y-%m-%d').date(), time.min,
+                ))
+            except ValueError:
+                raise CommandError('切分日期格式应为 YYYY-MM-DD')
+        test_fraction = options['test_fraction']
+        if not 0 < test_fraction < 1:
+            raise CommandError('--test-fraction 应在 0 和 1 之间')
+
+        cutoff, results = evaluate_recommendations(
+            k=k,
+            cutoff=cutoff,
+            test_fraction=test_fraction,
+            variants=options['variants'],
+            max_users=options['max_users'] or None,
+        )
+        if not results:
+            self.stdout.write(self.style.WARNING('没有可评估的用户（测试期内没有交互记录）'))
+            return
+
+        self.stdout.write(f'切分时间 {cutoff:%Y-%m-%d %H:%M}，评估 {results[0].user_count} 个用户，k={k}\n')
+        for result in results:
+            self.stdout.write(
+                f'{result.name}: precision@{k} {result.precision:.4f}, recall@{k} {result.recall:.4f}, '
+                f'coverage {result.coverage:.2%}, p50 {result.latency(50):.1f} ms, p95 {result.latency(95):.1f} ms'
+            )
@@ -0,0 +1,53 @@
+"""
+按批次重建职位搜索倒排索引
+使用方法: python manage.py rebuild_job_search_index [--chunk-size 500]
+"""
+from django.core.management.base import BaseCommand
+from jobs.listing import bump_job_generation
+from jobs.models import JobPage, JobSearchDocument, JobSearchPosting
+from jobs.search_index import index_job
+
+
+class Command(BaseCommand):
+    help = '按批次为所有已发布职位重建搜索倒排索引'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='每批处理的职位数量（默认500）',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+
+        # 清理已下线或已删除职位遗留的索引记录
+        live_ids = JobPage.objects.live().values('pk')
+        removed, _ = JobSearchPosting.objects.exclude(job_page_id__in=live_ids).delete()
+        JobSearchDocument.objects.exclude(job_page_id__in=live_ids).delete()
+        if removed:
+            self.stdout.write(f'清理了 {removed} 条过期索引记录')
+
+        last_pk = 0
+        indexed_count = 0
+        fields = ['pk', 'live', 'job_title', 'company_name', 'description']
+        while True:
+            jobs = list(
+                JobPage.objects.live().filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only(*fields)[:chunk_size]
+            )
+            if not jobs:
+                break
+
+            for job in jobs:
+                index_job(job)
+
+            last_pk = jobs[-1].pk
+            indexed_count += len(jobs)
+            self.stdout.write(f'已索引 {indexed_count} 个职位')
+
+        # 关键词检索结果可能变化，使列表缓存失效
+        bump_job_generation()
+        self.stdout.write(self.style.SUCCESS(f'\n索引重建完成！共索引 {indexed_count} 个职位'))
@@ -0,0 +1,14 @@
+"""
+根据已发布职位全量重建地点统计表（LocationFacet）
+使用方法: python manage.py rebuild_location_facets
+"""
+from django.core.management.base import BaseCommand
+from jobs.location_utils import rebuild_location_facets
+
+
+class Command(BaseCommand):
+    help = '全量重建省市区职位数量统计'
+
+    def handle(self, *args, **options):
+        facet_count = rebuild_location_facets()
+        self.stdout.write(self.style.SUCCESS(f'[OK] 地点统计已重建，共 {facet_count} 条'))
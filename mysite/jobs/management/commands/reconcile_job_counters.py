@@ -0,0 +1,28 @@
+"""
+重新统计职位的收藏、申请、查看数量（JobPage.save_count / apply_count / view_count）
+收藏、申请数量平时由信号原子增减，查看数量在写入浏览事件时累加；
+新增计数字段后、批量导入或批量修改 JobApplication 后、事件写入失败后运行本命令修正
+使用方法: python manage.py reconcile_job_counters [--chunk-size 1000] [--dry-run]
+"""
+from jobs.counters import COUNTER_FIELDS, count_interactions
+from jobs.listing import bump_counter_version
+
+from ._chunked import ChunkedJobUpdateCommand
+
+
+class Command(ChunkedJobUpdateCommand):
+    help = '按批次重新统计职位的互动计数'
+    fields = COUNTER_FIELDS
+    done_label = '统计完成'
+
+    def compute_chunk(self, rows):
+        # 每批一次聚合查询统计实际数量
+        actual = count_interactions([pk for pk, in rows])
+        return [
+            tuple(actual.get(pk, {}).get(field, 0) for field in COUNTER_FIELDS)
+            for pk, in rows
+        ]
+
+    def after_write(self, changed):
+        # 计数不影响列表缓存（只缓存职位ID），只需更新列表API的计数版本
+        bump_counter_version()
@@ -0,0 +1,68 @@
+"""
+按批次计算并保存用户推荐列表（UserRecommendation）
+默认只刷新需要更新的用户：从未计算过推荐、计算时间早于最近一次职位变化、或已超过最长有效期
+使用方法: python manage.py refresh_user_recommendations [--all] [--chunk-size 200]
+建议定时运行（间隔小于 RECOMMENDATION_MAX_AGE），使新发布的职位及时进入推荐列表
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.listing import get_job_modified_at
+from jobs.models import StudentProfile
+from jobs.recommend import RECOMMENDATION_MAX_AGE, RecommendationEngine, materialize_recommendations
+
+
+class Command(BaseCommand):
+    help = '按批次刷新用户推荐列表'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='刷新所有用户（默认只刷新过期的）',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=200,
+            help='每批处理的用户数量（默认200）',
+        )
+
+    def handle(self, *args, **options):
+        refresh_all = options['all']
+        chunk_size = max(1, options['chunk_size'])
+
+        # 早于此时间计算的推荐列表需要刷新
+        stale_before = max(get_job_modified_at(), timezone.now() - RECOMMENDATION_MAX_AGE)
+        engine = RecommendationEngine()
+
+        last_pk = 0
+        scanned_count = 0
+        refreshed_count = 0
+
+        # 按主键分批遍历学生档案
+        while True:
+            profiles = list(StudentProfile.objects.filter(pk__gt=last_pk).order_by('pk')[:chunk_size])
+            if not profiles:
+                break
+
+            if refresh_all:
+                stale = profiles
+            else:
+                stale = [
+                    profile for profile in profiles
+                    if profile.recommendations_computed_at is None
+                    or profile.recommendations_computed_at < stale_before
+                ]
+
+            for profile in stale:
+                materialize_recommendations(profile, engine=engine)
+
+            last_pk = profiles[-1].pk
+            scanned_count += len(profiles)
+            refreshed_count += len(stale)
+            self.stdout.write(f'已处理 {scanned_count} 个用户，刷新 {refreshed_count} 个')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n刷新完成！共扫描 {scanned_count} 个用户，刷新 {refreshed_count} 个'
+        ))
@@ -0,0 +1,41 @@
+"""
+按推荐算法版本统计推荐点击率（CTR）
+使用方法: python manage.py report_recommendation_ctr [--days 7] [--by-rank]
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.tracking import get_ctr_stats
+
+
+class Command(BaseCommand):
+    help = '统计推荐曝光、点击和点击率'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='统计最近多少天（默认7天，0表示全部）',
+        )
+        parser.add_argument(
+            '--by-rank',
+            action='store_true',
+            help='按推荐排名分别统计',
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options['days']) if options['days'] > 0 else None
+        rows = get_ctr_stats(since=since, by_rank=options['by_rank'])
+        if not rows:
+            self.stdout.write(self.style.WARNING('没有曝光/点击记录'))
+            return
+
+        for row in rows:
+            label = row['algorithm']
+            if options['by_rank']:
+                label += f' 第{row["rank"]}位' if row['rank'] else ' 排名未知'
+            ctr = f'{row["ctr"]:.2%}' if row['ctr'] is not None else '-'
+            self.stdout.write(f'{label}: 曝光 {row["impressions"]}，点击 {row["clicks"]}，点击率 {ctr}')
@@ -0,0 +1,39 @@
+"""
+增量更新后台统计页面使用的汇总表（职位、申请记录、用户每日统计、职位事件每小时统计和活跃用户排行）
+默认从最近一次汇总的日期重新计算到今天；从未汇总过时从最早的数据开始
+使用方法: python manage.py rollup_job_stats [--days 7]
+建议每小时定时运行
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.rollups import get_rollup_start, rollup_stats
+
+
+class Command(BaseCommand):
+    help = '增量更新职位、申请记录、用户和职位事件的统计汇总表'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=0,
+            help='重新计算最近多少天（默认0，从最近一次汇总的日期开始）',
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] > 0:
+            start_day = timezone.localdate() - timedelta(days=options['days'] - 1)
+        else:
+            start_day = get_rollup_start()
+        if start_day is None:
+            self.stdout.write(self.style.WARNING('没有需要汇总的数据'))
+            return
+
+        written = rollup_stats(start_day)
+        self.stdout.write(self.style.SUCCESS(
+            f'汇总完成！从 {start_day} 起写入 职位 {written["jobs"]} 行，申请记录 {written["applications"]} 行，'
+            f'用户 {written["users"]} 行，职位事件 {written["activity"]} 行，活跃用户 {written["active_users"]} 行'
+        ))
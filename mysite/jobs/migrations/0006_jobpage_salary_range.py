@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_studentprofile_avatar'),
+        ('wagtailcore', '0096_referenceindex_referenceindex_source_object_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpage',
+            name='salary_max_yuan',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='最高薪资（元）'),
+        ),
+        migrations.AddField(
+            model_name='jobpage',
+            name='salary_min_yuan',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='最低薪资（元）'),
+        ),
+        migrations.AddField(
+            model_name='jobpage',
+            name='salary_negotiable',
+            field=models.BooleanField(default=False, editable=False, verbose_name='薪资面议'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpage',
+            index=models.Index(fields=['salary_min_yuan', 'salary_max_yuan'], name='jobpage_salary_range_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpage',
+            index=models.Index(fields=['salary_max_yuan'], name='jobpage_salary_max_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_jobpage_salary_range'),
+        ('wagtailcore', '0096_referenceindex_referenceindex_source_object_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpage',
+            name='city',
+            field=models.CharField(blank=True, editable=False, max_length=100, verbose_name='城市'),
+        ),
+        migrations.AddField(
+            model_name='jobpage',
+            name='district',
+            field=models.CharField(blank=True, editable=False, max_length=100, verbose_name='区县'),
+        ),
+        migrations.AddField(
+            model_name='jobpage',
+            name='province',
+            field=models.CharField(blank=True, editable=False, max_length=100, verbose_name='省份'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpage',
+            index=models.Index(fields=['province', 'city', 'district'], name='jobpage_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpage',
+            index=models.Index(fields=['city', 'district'], name='jobpage_city_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_jobpage_location_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('province', models.CharField(blank=True, max_length=100, verbose_name='省份')),
+                ('city', models.CharField(blank=True, max_length=100, verbose_name='城市')),
+                ('district', models.CharField(blank=True, max_length=100, verbose_name='区县')),
+                ('job_count', models.PositiveIntegerField(default=0, verbose_name='职位数量')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '地点统计',
+                'verbose_name_plural': '地点统计',
+                'unique_together': {('province', 'city', 'district')},
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_locationfacet'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchDocument',
+            fields=[
+                ('job_page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='jobs.jobpage')),
+                ('title_length', models.PositiveIntegerField(default=0, verbose_name='职位名称词数')),
+                ('company_length', models.PositiveIntegerField(default=0, verbose_name='公司名称词数')),
+                ('description_length', models.PositiveIntegerField(default=0, verbose_name='职位描述词数')),
+                ('indexed_at', models.DateTimeField(auto_now=True, verbose_name='索引时间')),
+            ],
+            options={
+                'verbose_name': '搜索文档',
+                'verbose_name_plural': '搜索文档',
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, unique=True, verbose_name='词项')),
+            ],
+            options={
+                'verbose_name': '搜索词项',
+                'verbose_name_plural': '搜索词项',
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.PositiveSmallIntegerField(choices=[(1, '职位名称'), (2, '公司名称'), (3, '职位描述')], verbose_name='字段')),
+                ('frequency', models.PositiveSmallIntegerField(default=1, verbose_name='词频')),
+                ('job_page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_postings', to='jobs.jobpage')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='jobs.jobsearchterm')),
+            ],
+            options={
+                'verbose_name': '搜索倒排记录',
+                'verbose_name_plural': '搜索倒排记录',
+                'unique_together': {('term', 'job_page', 'field')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_job_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['user', 'status', '-created_at', '-id'], name='jobapp_user_status_idx'),
+        ),
+    ]
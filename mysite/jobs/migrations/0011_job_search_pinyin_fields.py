@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_jobapplication_user_status_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobsearchposting',
+            name='field',
+            field=models.PositiveSmallIntegerField(choices=[(1, '职位名称'), (2, '公司名称'), (3, '职位描述'), (4, '职位名称拼音'), (5, '公司名称拼音')], verbose_name='字段'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_search_pinyin_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='推荐得分')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='排名')),
+                ('computed_at', models.DateTimeField(verbose_name='计算时间')),
+                ('job_page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jobs.jobpage')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '用户推荐',
+                'verbose_name_plural': '用户推荐',
+                'indexes': [models.Index(fields=['user', 'rank'], name='userrec_user_rank_idx'), models.Index(fields=['computed_at'], name='userrec_computed_at_idx')],
+                'unique_together': {('user', 'job_page')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_userrecommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobNeighbor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='相似度')),
+                ('job_page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='jobs.jobpage')),
+                ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jobs.jobpage')),
+            ],
+            options={
+                'verbose_name': '相似职位',
+                'verbose_name_plural': '相似职位',
+                'unique_together': {('job_page', 'neighbor')},
+            },
+        ),
+    ]
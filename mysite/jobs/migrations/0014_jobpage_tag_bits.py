@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_jobneighbor'),
+        ('wagtailcore', '0096_referenceindex_referenceindex_source_object_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpage',
+            name='tag_bits',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='标签'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpage',
+            index=models.Index(fields=['tag_bits'], name='jobpage_tag_bits_idx'),
+        ),
+    ]
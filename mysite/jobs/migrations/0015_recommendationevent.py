@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_jobpage_tag_bits'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('impression', '曝光'), ('click', '点击')], max_length=20, verbose_name='事件类型')),
+                ('rank', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='排名')),
+                ('algorithm', models.CharField(max_length=50, verbose_name='推荐算法版本')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='发生时间')),
+                ('job_page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jobs.jobpage')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '推荐曝光点击记录',
+                'verbose_name_plural': '推荐曝光点击记录',
+                'indexes': [models.Index(fields=['algorithm', 'event_type', 'created_at'], name='recevent_algo_type_idx'), models.Index(fields=['created_at'], name='recevent_created_at_idx')],
+            },
+        ),
+    ]
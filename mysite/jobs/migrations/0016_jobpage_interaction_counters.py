@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0015_recommendationevent'),
+        ('wagtailcore', '0096_referenceindex_referenceindex_source_object_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpage',
+            name='apply_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='申请数量'),
+        ),
+        migrations.AddField(
+            model_name='jobpage',
+            name='save_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='收藏数量'),
+        ),
+        migrations.AddField(
+            model_name='jobpage',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='查看数量'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpage',
+            index=models.Index(fields=['-apply_count', '-save_count'], name='jobpage_popularity_idx'),
+        ),
+    ]
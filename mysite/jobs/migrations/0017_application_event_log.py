@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_jobpage_interaction_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('event_type', models.PositiveSmallIntegerField(choices=[(1, '浏览'), (2, '收藏'), (3, '取消收藏'), (4, '申请')], verbose_name='事件类型')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='发生时间')),
+                ('job_page', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='jobs.jobpage')),
+                ('user', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '职位事件',
+                'verbose_name_plural': '职位事件',
+                'indexes': [models.Index(fields=['created_at'], name='appevent_created_at_idx'), models.Index(fields=['job_page', 'created_at'], name='appevent_job_created_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ApplicationEventDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='日期')),
+                ('event_type', models.PositiveSmallIntegerField(choices=[(1, '浏览'), (2, '收藏'), (3, '取消收藏'), (4, '申请')], verbose_name='事件类型')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='事件数量')),
+                ('job_page', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='jobs.jobpage')),
+            ],
+            options={
+                'verbose_name': '职位事件日汇总',
+                'verbose_name_plural': '职位事件日汇总',
+                'unique_together': {('date', 'job_page', 'event_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_application_event_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='日期')),
+                ('new_users', models.PositiveIntegerField(default=0, verbose_name='新注册用户数')),
+                ('total_users', models.PositiveIntegerField(default=0, verbose_name='用户总数')),
+                ('active_users', models.PositiveIntegerField(default=0, verbose_name='活跃用户数')),
+                ('profile_users', models.PositiveIntegerField(default=0, verbose_name='有学生档案的用户数')),
+                ('applicant_users', models.PositiveIntegerField(default=0, verbose_name='有申请记录的用户数')),
+            ],
+            options={
+                'verbose_name': '用户每日统计',
+                'verbose_name_plural': '用户每日统计',
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivityHourlyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(verbose_name='小时')),
+                ('event_type', models.PositiveSmallIntegerField(choices=[(1, '浏览'), (2, '收藏'), (3, '取消收藏'), (4, '申请')], verbose_name='事件类型')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='事件数量')),
+            ],
+            options={
+                'verbose_name': '职位事件每小时统计',
+                'verbose_name_plural': '职位事件每小时统计',
+                'unique_together': {('hour', 'event_type')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ApplicationDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='日期')),
+                ('status', models.CharField(max_length=20, verbose_name='申请状态')),
+                ('created_count', models.PositiveIntegerField(default=0, verbose_name='新增记录数')),
+                ('total_count', models.PositiveIntegerField(default=0, verbose_name='记录总数')),
+            ],
+            options={
+                'verbose_name': '申请记录每日统计',
+                'verbose_name_plural': '申请记录每日统计',
+                'unique_together': {('date', 'status')},
+            },
+        ),
+        migrations.CreateModel(
+            name='JobDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='日期')),
+                ('source_website', models.CharField(max_length=50, verbose_name='来源网站')),
+                ('job_type', models.CharField(max_length=20, verbose_name='职位类型')),
+                ('published_count', models.PositiveIntegerField(default=0, verbose_name='新发布职位数')),
+                ('total_count', models.PositiveIntegerField(default=0, verbose_name='职位总数')),
+            ],
+            options={
+                'verbose_name': '职位每日统计',
+                'verbose_name_plural': '职位每日统计',
+                'unique_together': {('date', 'source_website', 'job_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0018_activity_rollups'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='jobpage',
+            name='view_count',
+        ),
+    ]
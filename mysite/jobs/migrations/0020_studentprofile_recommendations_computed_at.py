@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:40
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def backfill_computed_at(apps, schema_editor):
+    """已有推荐列表的用户以列表的计算时间作为初始值"""
+    StudentProfile = apps.get_model('jobs', 'StudentProfile')
+    UserRecommendation = apps.get_model('jobs', 'UserRecommendation')
+    computed_at = (
+        UserRecommendation.objects.filter(user_id=OuterRef('user_id'))
+        .values('user_id')
+        .annotate(computed_at=Max('computed_at'))
+        .values('computed_at')
+    )
+    StudentProfile.objects.update(recommendations_computed_at=Subquery(computed_at))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0019_remove_jobpage_view_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='recommendations_computed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='推荐计算时间'),
+        ),
+        migrations.RunPython(backfill_computed_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0020_studentprofile_recommendations_computed_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='jobpage',
+            name='jobpage_tag_bits_idx',
+        ),
+    ]
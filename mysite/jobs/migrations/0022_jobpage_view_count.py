@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0021_remove_jobpage_tag_bits_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpage',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='查看数量'),
+        ),
+    ]
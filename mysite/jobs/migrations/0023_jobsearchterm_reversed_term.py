@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:31
+
+from django.db import migrations, models
+
+
+def backfill_reversed_terms(apps, schema_editor):
+    """为已有的词项按主键分批填入倒序词项"""
+    JobSearchTerm = apps.get_model('jobs', 'JobSearchTerm')
+    last_pk = 0
+    while True:
+        terms = list(JobSearchTerm.objects.filter(pk__gt=last_pk).order_by('pk')[:1000])
+        if not terms:
+            break
+        for term in terms:
+            term.reversed_term = term.term[::-1]
+        JobSearchTerm.objects.bulk_update(terms, ['reversed_term'])
+        last_pk = terms[-1].pk
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0022_jobpage_view_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobsearchterm',
+            name='reversed_term',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=64, verbose_name='倒序词项'),
+        ),
+        migrations.RunPython(backfill_reversed_terms, migrations.RunPython.noop),
+    ]
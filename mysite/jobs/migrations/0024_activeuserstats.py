@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0023_jobsearchterm_reversed_term'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActiveUserStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(unique=True, verbose_name='排名')),
+                ('application_count', models.PositiveIntegerField(default=0, verbose_name='申请记录数')),
+                ('computed_at', models.DateTimeField(verbose_name='汇总时间')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '活跃用户统计',
+                'verbose_name_plural': '活跃用户统计',
+            },
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from wagtail.models import Page
 from wagtail.fields import RichTextField
 from wagtail.admin.panels import FieldPanel,MultiFieldPanel
@@ -6,6 +6,7 @@ from django.conf import settings
 from django.utils import timezone
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from modelcluster.fields import ParentalKey
+from modelcluster.models import get_all_child_m2m_relations, get_all_child_relations
 # Create your models here.
 class JobPage(Page):
     # 基础信息
@@ -13,9 +14,19 @@ class JobPage(Page):
     job_title = models.CharField(max_length=255, verbose_name="职位名称")
     location = models.CharField(max_length=100, verbose_name="工作地点")
     
+    # 从 location 解析出的省市区，保存时自动填充，用于数据库筛选
+    province = models.CharField(max_length=100, blank=True, editable=False, verbose_name="省份")
+    city = models.CharField(max_length=100, blank=True, editable=False, verbose_name="城市")
+    district = models.CharField(max_length=100, blank=True, editable=False, verbose_name="区县")
+    
     # 薪资可以用字符串灵活表示，如“8-12K”
     salary = models.CharField(max_length=100, verbose_name="薪资范围", blank=True)
     
+    # 标准化后的薪资区间（单位：元），保存时由 salary 自动解析，用于数据库筛选
+    salary_min_yuan = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name="最低薪资（元）")
+    salary_max_yuan = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name="最高薪资（元）")
+    salary_negotiable = models.BooleanField(default=False, editable=False, verbose_name="薪资面议")
+    
     # 岗位详情，使用富文本字段方便格式化描述
     description = RichTextField(features=['bold', 'italic', 'link', 'ol', 'ul'], verbose_name="职位描述")
     
@@ -26,6 +37,14 @@ class JobPage(Page):
         ('parttime', '兼职'),
     ]
     job_type = models.CharField(max_length=20, choices=JOB_TYPES, default='fulltime', verbose_name="职位类型")
+
+    # 由职位名称和描述匹配出的标签（专业、应届生、技能）位掩码，保存时自动计算，见 tag_utils
+    tag_bits = models.BigIntegerField(default=0, editable=False, verbose_name="标签")
+
+    # 收藏、申请数量，由 JobApplication 信号原子增减；查看数量在事件日志写入浏览事件时累加。见 counters
+    save_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="收藏数量")
+    apply_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="申请数量")
+    view_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="查看数量")
     
     # 来源网站
     source_website = models.CharField(max_length=50, verbose_name="来源网站", default='智联招聘')
@@ -80,33 +99,108 @@ class JobPage(Page):
         # 添加到上下文
         context['job_pages'] = job_pages
         context['job_types'] = JobPage.JOB_TYPES  # 用于筛选标签
+        # 当前用户的收藏/申请状态
+        from .user_jobs import get_user_job_context
+        context.update(get_user_job_context(request.user))
         return context
 
+    def serve(self, request, *args, **kwargs):
+        # 记录浏览事件（只放入缓冲区，不写数据库；预览不经过这里）
+        from .event_log import log_event
+        log_event(request.user, self.pk, 'viewed')
+        return super().serve(request, *args, **kwargs)
+
+    def update_salary_range(self):
+        """根据 salary 字符串刷新标准化的薪资区间字段"""
+        from .salary_utils import normalize_salary
+        self.salary_min_yuan, self.salary_max_yuan, self.salary_negotiable = normalize_salary(self.salary)
+
+    def update_location_fields(self):
+        """根据 location 字符串刷新省市区字段"""
+        from .location_utils import parse_location
+        # 记录解析前的省市区，发布/下线时用于增量更新地点统计
+        self._previous_location_key = self.location_key
+        province, city, district = parse_location(self.location)
+        self.province = province or ''
+        self.city = city or ''
+        self.district = district or ''
+
+    def update_tags(self):
+        """根据职位名称和描述刷新标签位掩码"""
+        from .tag_utils import compute_tag_bits
+        self.tag_bits = compute_tag_bits(self.job_title, self.description)
+
     @property
-    def save_count(self):
-        """收藏数量"""
-        return self.applications.filter(status='saved').count()
-    
+    def is_fresh_graduate(self):
+        """职位是否接受应届毕业生"""
+        from .tag_utils import FRESH_GRADUATE_MASK
+        return bool(self.tag_bits & FRESH_GRADUATE_MASK)
+
     @property
-    def apply_count(self):
-        """申请数量"""
-        return self.applications.filter(status='applied').count()
-    
+    def skill_labels(self):
+        """职位要求的技能"""
+        from .tag_utils import get_skill_labels
+        return get_skill_labels(self.tag_bits)
+
+    @property
+    def location_key(self):
+        """(省份, 城市, 区县) 三元组，对应 LocationFacet 的一行"""
+        return (self.province, self.city, self.district)
+
+    # 由原始字段派生出的标准化字段，只更新原始字段时也要一并写入
+    DERIVED_FIELDS = {
+        'salary': {'salary_min_yuan', 'salary_max_yuan', 'salary_negotiable'},
+        'location': {'province', 'city', 'district'},
+        'job_title': {'tag_bits'},
+        'description': {'tag_bits'},
+    }
+
+    def save(self, *args, **kwargs):
+        # 每次保存（包括后台编辑发布、爬虫入库）都重新解析薪资、地点和标签
+        self.update_salary_range()
+        self.update_location_fields()
+        self.update_tags()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            for source, derived in self.DERIVED_FIELDS.items():
+                if source in update_fields:
+                    update_fields |= derived
+            kwargs['update_fields'] = update_fields
+        elif self.pk is not None and not kwargs.get('force_insert'):
+            # 互动计数只通过 F() 增减；整页保存（如发布修订版本，对象由修订内容还原）时不写回可能过期的计数。
+            # 子关系和 ParentalManyToMany 字段也要列出，modelcluster 才会像整页保存一样提交它们
+            from .counters import COUNTER_FIELDS
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in COUNTER_FIELDS
+            ] + [
+                rel.get_accessor_name() for rel in get_all_child_relations(self)
+            ] + [
+                field.name for field in get_all_child_m2m_relations(self)
+            ]
+        super().save(*args, **kwargs)
+
     def is_saved_by_user(self, user):
-        """检查用户是否已收藏"""
-        if not user.is_authenticated:
-            return False
-        return self.applications.filter(user=user, status='saved').exists()
+        """检查用户是否已收藏（读取按用户缓存的职位ID集合）"""
+        from .user_jobs import get_user_job_ids
+        return self.pk in get_user_job_ids(user)['saved']
     
     def is_applied_by_user(self, user):
-        """检查用户是否已申请"""
-        if not user.is_authenticated:
-            return False
-        return self.applications.filter(user=user, status='applied').exists()
+        """检查用户是否已申请（读取按用户缓存的职位ID集合）"""
+        from .user_jobs import get_user_job_ids
+        return self.pk in get_user_job_ids(user)['applied']
 
     class Meta:
         verbose_name = "职位页面"
         verbose_name_plural = "职位页面"
+        indexes = [
+            models.Index(fields=['salary_min_yuan', 'salary_max_yuan'], name='jobpage_salary_range_idx'),
+            models.Index(fields=['salary_max_yuan'], name='jobpage_salary_max_idx'),
+            models.Index(fields=['province', 'city', 'district'], name='jobpage_location_idx'),
+            models.Index(fields=['city', 'district'], name='jobpage_city_idx'),
+            models.Index(fields=['-apply_count', '-save_count'], name='jobpage_popularity_idx'),
+        ]
 
     # 单个职位详情页使用 job_page.html 模板
     template = "jobs/job_page.html"
@@ -129,201 +223,20 @@ class JobIndexPage(Page):
     def get_context(self, request, *args, **kwargs):
         """职位列表页的上下文，包含搜索和筛选功能"""
         context = super().get_context(request, *args, **kwargs)
-        from django.db.models import Q
-        import re
-        
-        # 获取所有子页面（职位）- 直接使用 JobPage.objects 确保可以过滤 JobPage 字段
-        job_pages = JobPage.objects.child_of(self).live()
-        
-        # 1. 关键词搜索（职位名称、公司名称、职位描述）
-        search_query = request.GET.get('q', '').strip()
-        if search_query:
-            job_pages = job_pages.filter(
-                Q(job_title__icontains=search_query) |
-                Q(company_name__icontains=search_query) |
-                Q(description__icontains=search_query)
-            )
-        
-        # 2. 按职位类型筛选
-        job_type = request.GET.get('job_type', '').strip()
-        if job_type:
-            job_pages = job_pages.filter(job_type=job_type)
-        
-        # 3. 按工作地点筛选（支持省市区分级筛选）
-        province = request.GET.get('province', '').strip()
-        city = request.GET.get('city', '').strip()
-        district = request.GET.get('district', '').strip()
-        
-        if province or city or district:
-            from .location_utils import parse_location
-            location_query = Q()
-            
-            # 遍历所有职位，检查是否符合筛选条件
-            filtered_job_ids = []
-            for job in job_pages:
-                job_province, job_city, job_district = parse_location(job.location)
-                
-                match = True
-                
-                if province:
-                    if job_province != province:
-                        match = False
-                
-                if match and city:
-                    if job_city != city:
-                        match = False
-                
-                if match and district:
-                    if job_district != district:
-                        match = False
-                
-                if match:
-                    filtered_job_ids.append(job.id)
-            
-            if filtered_job_ids:
-                job_pages = job_pages.filter(id__in=filtered_job_ids)
-            else:
-                job_pages = job_pages.none()
-        
-        # 4. 按薪资范围筛选
-        salary_min = request.GET.get('salary_min', '').strip()
-        salary_max = request.GET.get('salary_max', '').strip()
         
-        if salary_min or salary_max:
-            # 解析薪资字符串，提取数字范围
-            # 支持格式：8-12K, 8K-12K, 8000-12000, 8万-12万等
-            def parse_salary(salary_str):
-                """解析薪资字符串，返回最小值和最大值（单位：元）"""
-                if not salary_str:
-                    return None, None
-                
-                # 移除空格
-                salary_str = salary_str.replace(' ', '')
-                
-                # 处理"面议"等特殊情况
-                if '面议' in salary_str or 'negotiable' in salary_str.lower():
-                    return None, None
-                
-                # 提取数字和单位
-                # 匹配模式：数字-数字K/万/元
-                pattern = r'(\d+(?:\.\d+)?)\s*[-~至]\s*(\d+(?:\.\d+)?)\s*([Kk万万千]?)|(\d+(?:\.\d+)?)\s*([Kk万万千]?)以上|(\d+(?:\.\d+)?)\s*([Kk万万千]?)以下'
-                match = re.search(pattern, salary_str)
-                
-                if match:
-                    if match.group(1) and match.group(2):  # 范围格式：8-12K
-                        min_val = float(match.group(1))
-                        max_val = float(match.group(2))
-                        unit = match.group(3) or ''
-                        
-                        # 转换为元
-                        if '万' in unit or 'w' in unit.lower():
-                            min_val *= 10000
-                            max_val *= 10000
-                        elif 'K' in unit or 'k' in unit or '千' in unit:
-                            min_val *= 1000
-                            max_val *= 1000
-                        
-                        return int(min_val), int(max_val)
-                    elif match.group(4):  # 单个数字格式
-                        val = float(match.group(4))
-                        unit = match.group(5) or ''
-                        
-                        if '万' in unit or 'w' in unit.lower():
-                            val *= 10000
-                        elif 'K' in unit or 'k' in unit or '千' in unit:
-                            val *= 1000
-                        
-                        return int(val), int(val)
-                    elif match.group(6):  # 以上格式
-                        val = float(match.group(6))
-                        unit = match.group(7) or ''
-                        
-                        if '万' in unit or 'w' in unit.lower():
-                            val *= 10000
-                        elif 'K' in unit or 'k' in unit or '千' in unit:
-                            val *= 1000
-                        
-                        return int(val), None
-                    elif match.group(8):  # 以下格式
-                        val = float(match.group(8))
-                        unit = match.group(9) or ''
-                        
-                        if '万' in unit or 'w' in unit.lower():
-                            val *= 10000
-                        elif 'K' in unit or 'k' in unit or '千' in unit:
-                            val *= 1000
-                        
-                        return None, int(val)
-                
-                return None, None
-            
-            # 筛选符合条件的职位
-            # 先将 QuerySet 转换为列表以便逐个检查薪资
-            job_list = list(job_pages)
-            filtered_job_ids = []
-            
-            for job in job_list:
-                job_min, job_max = parse_salary(job.salary)
-                
-                # 如果职位没有薪资信息
-                if job_min is None and job_max is None:
-                    # 如果用户指定了薪资要求，则排除没有薪资信息的职位
-                    # 如果用户没有指定薪资要求，则包含该职位
-                    if not salary_min and not salary_max:
-                        filtered_job_ids.append(job.id)
-                    continue
-                
-                # 用户指定的最小薪资（单位：元）
-                user_min = None
-                if salary_min:
-                    try:
-                        user_min = int(float(salary_min) * 1000)  # 假设用户输入的是K为单位
-                    except ValueError:
-                        pass
-                
-                # 用户指定的最大薪资（单位：元）
-                user_max = None
-                if salary_max:
-                    try:
-                        user_max = int(float(salary_max) * 1000)  # 假设用户输入的是K为单位
-                    except ValueError:
-                        pass
-                
-                # 判断是否匹配
-                match = True
-                
-                if user_min is not None:
-                    # 用户要求最低薪资，职位最高薪资必须大于等于用户最低要求
-                    if job_max is not None and job_max < user_min:
-                        match = False
-                    # 如果职位只有最低薪资，检查是否满足要求
-                    elif job_max is None and job_min is not None and job_min < user_min:
-                        match = False
-                
-                if user_max is not None and match:
-                    # 用户要求最高薪资，职位最低薪资必须小于等于用户最高要求
-                    if job_min is not None and job_min > user_max:
-                        match = False
-                
-                if match:
-                    filtered_job_ids.append(job.id)
-            
-            # 使用 id__in 来筛选符合条件的职位
-            if filtered_job_ids:
-                job_pages = job_pages.filter(id__in=filtered_job_ids)
-            else:
-                # 如果没有匹配的职位，返回空 QuerySet
-                job_pages = job_pages.none()
+        # 筛选条件：关键词、职位类型、省市区、薪资范围
+        from .listing import get_job_listing, parse_job_filters
+        filters = parse_job_filters(request.GET)
         
-        # 分页（每页15条，适合移动端）
-        paginator = Paginator(job_pages, 15)
-        page = request.GET.get('page')
-        try:
-            job_pages = paginator.page(page)
-        except PageNotAnInteger:
-            job_pages = paginator.page(1)
-        except EmptyPage:
-            job_pages = paginator.page(paginator.num_pages)
+        # 相同筛选条件的结果ID会被缓存，职位发布/下线时整体失效
+        # 有关键词时按相关度排序并使用页码分页，否则按发布时间倒序使用游标分页
+        job_pages, cursor_pagination = get_job_listing(
+            self,
+            filters,
+            cursor=request.GET.get('cursor'),
+            page=request.GET.get('page'),
+        )
+        context['cursor_pagination'] = cursor_pagination
         
         # 获取省份列表，用于下拉选择
         from .location_utils import extract_provinces_from_jobs
@@ -333,15 +246,10 @@ class JobIndexPage(Page):
         context['job_pages'] = job_pages
         context['job_types'] = JobPage.JOB_TYPES  # 用于筛选标签
         context['provinces'] = provinces  # 用于省份下拉选择
-        context['current_filters'] = {
-            'q': search_query,
-            'job_type': job_type,
-            'province': province,
-            'city': city,
-            'district': district,
-            'salary_min': salary_min,
-            'salary_max': salary_max,
-        }
+        context['current_filters'] = filters
+        # 当前用户收藏/申请过的职位ID（一次查询并按用户缓存，模板中不再逐个职位查询）
+        from .user_jobs import get_user_job_context
+        context.update(get_user_job_context(request.user))
         
         return context
     
@@ -349,6 +257,82 @@ class JobIndexPage(Page):
     template = "jobs/job_index_page.html"
 
 
+class LocationFacet(models.Model):
+    """省市区维度的职位数量统计（物化表），用于地点级联下拉和筛选"""
+    province = models.CharField('省份', max_length=100, blank=True)
+    city = models.CharField('城市', max_length=100, blank=True)
+    district = models.CharField('区县', max_length=100, blank=True)
+    job_count = models.PositiveIntegerField('职位数量', default=0)
+    updated_at = models.DateTimeField('更新时间', auto_now=True)
+
+    class Meta:
+        unique_together = ['province', 'city', 'district']
+        verbose_name = '地点统计'
+        verbose_name_plural = '地点统计'
+
+    def __str__(self):
+        return f"{self.province}/{self.city}/{self.district}: {self.job_count}"
+
+
+class JobSearchTerm(models.Model):
+    """职位搜索索引的词典表：每个词项只存一次，倒排记录通过整数ID引用"""
+    term = models.CharField('词项', max_length=64, unique=True)
+    # 倒序存放的词项，按词尾匹配时（单个汉字命中以该字结尾的二元组）也走前缀索引
+    reversed_term = models.CharField('倒序词项', max_length=64, db_index=True, default='', editable=False)
+
+    class Meta:
+        verbose_name = '搜索词项'
+        verbose_name_plural = '搜索词项'
+
+    def __str__(self):
+        return self.term
+
+
+class JobSearchPosting(models.Model):
+    """职位搜索倒排记录：某个词项在某个职位的某个字段中出现的次数"""
+    FIELD_TITLE = 1
+    FIELD_COMPANY = 2
+    FIELD_DESCRIPTION = 3
+    # 拼音检索词（由职位名称、公司名称生成的全拼和首字母）
+    FIELD_TITLE_PINYIN = 4
+    FIELD_COMPANY_PINYIN = 5
+    FIELD_CHOICES = [
+        (FIELD_TITLE, '职位名称'),
+        (FIELD_COMPANY, '公司名称'),
+        (FIELD_DESCRIPTION, '职位描述'),
+        (FIELD_TITLE_PINYIN, '职位名称拼音'),
+        (FIELD_COMPANY_PINYIN, '公司名称拼音'),
+    ]
+
+    term = models.ForeignKey(JobSearchTerm, on_delete=models.CASCADE, related_name='postings')
+    job_page = models.ForeignKey(JobPage, on_delete=models.CASCADE, related_name='search_postings')
+    field = models.PositiveSmallIntegerField('字段', choices=FIELD_CHOICES)
+    frequency = models.PositiveSmallIntegerField('词频', default=1)
+
+    class Meta:
+        unique_together = ['term', 'job_page', 'field']
+        verbose_name = '搜索倒排记录'
+        verbose_name_plural = '搜索倒排记录'
+
+
+class JobSearchDocument(models.Model):
+    """职位搜索索引中的文档信息：记录各字段的词项数量，用于相关度计算"""
+    job_page = models.OneToOneField(
+        JobPage,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document'
+    )
+    title_length = models.PositiveIntegerField('职位名称词数', default=0)
+    company_length = models.PositiveIntegerField('公司名称词数', default=0)
+    description_length = models.PositiveIntegerField('职位描述词数', default=0)
+    indexed_at = models.DateTimeField('索引时间', auto_now=True)
+
+    class Meta:
+        verbose_name = '搜索文档'
+        verbose_name_plural = '搜索文档'
+
+
 class RecommendationsPage(Page):
     """个性化推荐页面 - Wagtail页面模型"""
     intro = RichTextField(blank=True, verbose_name="页面介绍", help_text="显示在推荐列表上方的介绍文字")
@@ -359,13 +343,20 @@ class RecommendationsPage(Page):
     
     # 不允许添加子页面
     subpage_types = []
+
+    # 最多推荐的职位数量
+    RECOMMENDATION_LIMIT = 20
     
     class Meta:
         verbose_name = "个性化推荐页面"
         verbose_name_plural = "个性化推荐页面"
     
     def get_context(self, request, *args, **kwargs):
-        """重写get_context方法，添加个性化推荐逻辑"""
+        """
+        重写get_context方法，添加个性化推荐逻辑
+
+        请求过程只读：通常只需一次查询读取物化的推荐列表，不在请求中修改任何数据
+        """
         context = super().get_context(request, *args, **kwargs)
         
         # 检查用户是否已登录
@@ -382,106 +373,17 @@ class RecommendationsPage(Page):
             context['needs_profile'] = True
             return context
         
-        # 基础查询：所有已发布的职位（使用.specific()确保加载具体类型）
-        from django.db.models import Q
-        all_jobs = JobPage.objects.live().specific()
-        
-        # 规则1：按偏好职位类型筛选
-        preferred_types = profile.get_preferred_job_types_list()
-        if preferred_types:
-            type_jobs = all_jobs.filter(job_type__in=preferred_types)
-        else:
-            type_jobs = all_jobs
-        
-        # 规则2：按偏好地点筛选（简单文本匹配）
-        preferred_locations = [loc.strip() for loc in profile.preferred_locations.split(',') if loc.strip()]
-        location_jobs = type_jobs
-        if preferred_locations:
-            # 构建地点查询：多个地点OR条件
-            location_query = Q()
-            for location in preferred_locations:
-                location_query |= Q(location__icontains=location)
-            location_jobs = type_jobs.filter(location_query)
-        
-        # 规则3：按专业匹配（从职位描述中匹配专业关键词）
-        major_keywords = {
-            'cs': ['计算机', '软件', '编程', '算法', '后端', '前端', '开发'],
-            'se': ['软件工程', '测试', '运维', 'DevOps'],
-            'ee': ['电子', '硬件', '电路', '嵌入式'],
-            'business': ['商业', '市场', '营销', '管理'],
-            'finance': ['金融', '财务', '会计', '投资'],
-            'design': ['设计', 'UI', 'UX', '视觉', '平面']
-        }
-        
-        major_jobs = location_jobs
-        keywords = major_keywords.get(profile.major, [])
-        if keywords:
-            major_query = Q()
-            for keyword in keywords:
-                major_query |= Q(description__icontains=keyword) | Q(job_title__icontains=keyword)
-            major_jobs = location_jobs.filter(major_query)
-        
-        # 规则4：应届生优先（标记为接受应届生的职位）
-        # 需要先转换为列表才能进行文本搜索，使用.specific()确保属性已加载
-        major_jobs_list = list(major_jobs.specific())
-        fresh_graduate_jobs = [job for job in major_jobs_list if '应届' in job.description or '毕业生' in job.description]
-        other_jobs = [job for job in major_jobs_list if job not in fresh_graduate_jobs]
-        
-        # 组合结果：应届生职位在前，其他在后
-        final_jobs = fresh_graduate_jobs + other_jobs
-        
-        # 去重并限制数量，同时确保所有职位都有有效的 slug
-        seen_ids = set()
-        unique_jobs = []
-        for job in final_jobs:
-            if job.id not in seen_ids:
-                # 强制重新从数据库加载以确保所有属性（包括 slug）都被正确加载
-                try:
-                    reloaded_job = JobPage.objects.filter(pk=job.pk).live().specific().first()
-                    if reloaded_job and reloaded_job.slug:
-                        seen_ids.add(reloaded_job.id)
-                        unique_jobs.append(reloaded_job)
-                    elif reloaded_job and not reloaded_job.slug:
-                        # 如果重新加载后仍然没有 slug，生成一个
-                        from django.utils.text import slugify
-                        # 尝试使用 unidecode 处理中文
-                        company = reloaded_job.company_name or "未知公司"
-                        title = reloaded_job.job_title or "未知职位"
-                        try:
-                            from unidecode import unidecode
-                            company = unidecode(company)
-                            title = unidecode(title)
-                        except ImportError:
-                            pass
-                        base_slug = slugify(f"{company}-{title}")
-                        if not base_slug or len(base_slug.strip()) == 0:
-                            base_slug = f"job-{reloaded_job.id}"
-                        # 确保唯一性
-                        slug = base_slug
-                        counter = 1
-                        while JobPage.objects.filter(slug=slug).exclude(pk=reloaded_job.pk).exists():
-                            slug = f"{base_slug}-{counter}"
-                            counter += 1
-                        reloaded_job.slug = slug
-                        reloaded_job.save(update_fields=['slug'])
-                        if reloaded_job.live:
-                            reloaded_job.save_revision().publish()
-                        seen_ids.add(reloaded_job.id)
-                        unique_jobs.append(reloaded_job)
-                except Exception as e:
-                    # 如果重新加载失败，跳过这个职位
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.warning(f"无法加载职位 {job.id}: {str(e)}")
-                    pass
-        
-        recommendations = unique_jobs[:20]  # 最多推荐20个
+        # 优先读取物化的推荐列表，缺失或过期时由推荐引擎实时计算（与 personalized_recommendations 视图共用）
+        from .recommend import RECOMMENDATION_ALGORITHM, get_preferred_locations, get_user_recommendations
         
         # 添加到上下文
-        context['recommendations'] = recommendations
+        context['recommendations'] = get_user_recommendations(profile, limit=self.RECOMMENDATION_LIMIT)
+        context['recommendation_algorithm'] = RECOMMENDATION_ALGORITHM
         context['profile'] = profile
         # 预处理偏好地点列表，供模板使用
-        context['preferred_locations_list'] = preferred_locations
+        context['preferred_locations_list'] = get_preferred_locations(profile)
+        from .user_jobs import get_user_job_context
+        context.update(get_user_job_context(user))
         
         return context
     
@@ -589,6 +491,8 @@ class StudentProfile(models.Model):
     is_verified = models.BooleanField('已验证学生身份', default=False)
     last_active = models.DateTimeField('最后活跃时间', default=timezone.now)
     created_at = models.DateTimeField('创建时间', auto_now_add=True)
+    # 最近一次物化推荐列表的时间（推荐结果为空时也会记录）
+    recommendations_computed_at = models.DateTimeField('推荐计算时间', null=True, blank=True, editable=False)
     
     class Meta:
         verbose_name = '学生档案'
@@ -759,6 +663,8 @@ class JobApplication(models.Model):
         ('rejected', '已拒绝'),
         ('accepted', '已接受'),
     ]
+    # 表示用户对职位感兴趣的状态（"已拒绝"除外），用于协同过滤
+     INTERACTION_STATUSES = ['saved', 'applied', 'viewed', 'contacted', 'accepted']
     
      user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -791,6 +697,9 @@ class JobApplication(models.Model):
     
      class Meta:
         unique_together = ['user', 'job_page']  # 防止重复收藏
+        indexes = [
+            models.Index(fields=['user', 'status', '-created_at', '-id'], name='jobapp_user_status_idx'),
+        ]
         verbose_name = '职位申请'
         verbose_name_plural = '职位申请'
         ordering = ['-updated_at']
@@ -798,9 +707,224 @@ class JobApplication(models.Model):
      def __str__(self):
         return f"{self.user.email} - {self.job_page.job_title}"
     
+     @classmethod
+     def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 记录读取时的状态，保存时据此增减职位的互动计数（见 signals）
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+    
      def save(self, *args, **kwargs):
         # 如果是第一次申请，记录申请时间
         if self.status == 'applied' and not self.applied_date:
             self.applied_date = timezone.now()
-        super().save(*args, **kwargs)
+        # 与 post_save 信号中的计数更新放在同一个事务中
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+
+
+class UserRecommendation(models.Model):
+    """用户推荐列表（物化结果）：由 refresh_user_recommendations 命令和档案变更信号维护"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='recommendations'
+    )
+    job_page = models.ForeignKey(JobPage, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField('推荐得分')
+    rank = models.PositiveSmallIntegerField('排名')
+    computed_at = models.DateTimeField('计算时间')
+
+    class Meta:
+        unique_together = ['user', 'job_page']
+        indexes = [
+            models.Index(fields=['user', 'rank'], name='userrec_user_rank_idx'),
+            models.Index(fields=['computed_at'], name='userrec_computed_at_idx'),
+        ]
+        verbose_name = '用户推荐'
+        verbose_name_plural = '用户推荐'
+
+
+class JobNeighbor(models.Model):
+    """相似职位（协同过滤离线计算结果）：收藏/申请过 job_page 的用户也常收藏/申请 neighbor"""
+    job_page = models.ForeignKey(JobPage, on_delete=models.CASCADE, related_name='neighbors')
+    neighbor = models.ForeignKey(JobPage, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField('相似度')
+
+    class Meta:
+        unique_together = ['job_page', 'neighbor']
+        verbose_name = '相似职位'
+        verbose_name_plural = '相似职位'
+
+
+class RecommendationEvent(models.Model):
+    """推荐曝光/点击记录：由 tracking 模块在进程内缓冲后批量写入，用于统计推荐点击率"""
+    EVENT_IMPRESSION = 'impression'
+    EVENT_CLICK = 'click'
+    EVENT_TYPES = [
+        (EVENT_IMPRESSION, '曝光'),
+        (EVENT_CLICK, '点击'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    job_page = models.ForeignKey(JobPage, on_delete=models.CASCADE, related_name='+')
+    event_type = models.CharField('事件类型', max_length=20, choices=EVENT_TYPES)
+    rank = models.PositiveSmallIntegerField('排名', null=True, blank=True)
+    algorithm = models.CharField('推荐算法版本', max_length=50)
+    created_at = models.DateTimeField('发生时间', default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['algorithm', 'event_type', 'created_at'], name='recevent_algo_type_idx'),
+            models.Index(fields=['created_at'], name='recevent_created_at_idx'),
+        ]
+        verbose_name = '推荐曝光点击记录'
+        verbose_name_plural = '推荐曝光点击记录'
+
+
+class ApplicationEvent(models.Model):
+    """
+    职位浏览/收藏/申请事件日志（只追加）：由 event_log 模块在进程内缓冲后批量写入
+
+    - 事件类型用小整数编码
+    - 用户、职位不建外键约束：写入不需要检查或锁定被引用的行，用户或职位删除后事件仍保留，
+      表可以按 created_at 分区或按时间范围整段删除
+    - 超过保留期的事件由 compact_application_events 汇总到 ApplicationEventDaily 后删除
+    """
+    EVENT_VIEW = 1
+    EVENT_SAVE = 2
+    EVENT_UNSAVE = 3
+    EVENT_APPLY = 4
+    EVENT_TYPES = [
+        (EVENT_VIEW, '浏览'),
+        (EVENT_SAVE, '收藏'),
+        (EVENT_UNSAVE, '取消收藏'),
+        (EVENT_APPLY, '申请'),
+    ]
+    # 事件名称（与 JobApplication 的状态名称一致）-> 事件类型编码
+    EVENT_NAMES = {
+        'viewed': EVENT_VIEW,
+        'saved': EVENT_SAVE,
+        'unsaved': EVENT_UNSAVE,
+        'applied': EVENT_APPLY,
+    }
+
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    job_page = models.ForeignKey(JobPage, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    event_type = models.PositiveSmallIntegerField('事件类型', choices=EVENT_TYPES)
+    created_at = models.DateTimeField('发生时间', default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='appevent_created_at_idx'),
+            models.Index(fields=['job_page', 'created_at'], name='appevent_job_created_idx'),
+        ]
+        verbose_name = '职位事件'
+        verbose_name_plural = '职位事件'
+
+
+class ApplicationEventDaily(models.Model):
+    """职位事件按天汇总（原始事件超过保留期后压缩到这里）"""
+    date = models.DateField('日期')
+    job_page = models.ForeignKey(JobPage, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    event_type = models.PositiveSmallIntegerField('事件类型', choices=ApplicationEvent.EVENT_TYPES)
+    count = models.PositiveIntegerField('事件数量', default=0)
+
+    class Meta:
+        unique_together = ['date', 'job_page', 'event_type']
+        verbose_name = '职位事件日汇总'
+        verbose_name_plural = '职位事件日汇总'
+
+
+class JobDailyStats(models.Model):
+    """
+    职位按 (日期, 来源网站, 职位类型) 的每日汇总，由 rollup_job_stats 命令维护
+
+    published_count 为当天首次发布的职位数；total_count 为截至当天结束时已发布过的职位数（按汇总时仍存在的职位计算）
+    """
+    date = models.DateField('日期')
+    source_website = models.CharField('来源网站', max_length=50)
+    job_type = models.CharField('职位类型', max_length=20)
+    published_count = models.PositiveIntegerField('新发布职位数', default=0)
+    total_count = models.PositiveIntegerField('职位总数', default=0)
+
+    class Meta:
+        unique_together = ['date', 'source_website', 'job_type']
+        verbose_name = '职位每日统计'
+        verbose_name_plural = '职位每日统计'
+
+
+class ApplicationDailyStats(models.Model):
+    """
+    收藏/申请记录按 (日期, 状态) 的每日汇总，由 rollup_job_stats 命令维护
 
+    created_count 为当天新增、目前处于该状态的记录数；total_count 为截至当天结束时该状态的记录数
+    """
+    date = models.DateField('日期')
+    status = models.CharField('申请状态', max_length=20)
+    created_count = models.PositiveIntegerField('新增记录数', default=0)
+    total_count = models.PositiveIntegerField('记录总数', default=0)
+
+    class Meta:
+        unique_together = ['date', 'status']
+        verbose_name = '申请记录每日统计'
+        verbose_name_plural = '申请记录每日统计'
+
+
+class UserDailyStats(models.Model):
+    """
+    用户每日汇总，由 rollup_job_stats 命令维护
+
+    new_users、total_users 按注册时间计算；其余字段无法按历史日期还原，为汇总时的快照
+    """
+    date = models.DateField('日期', unique=True)
+    new_users = models.PositiveIntegerField('新注册用户数', default=0)
+    total_users = models.PositiveIntegerField('用户总数', default=0)
+    active_users = models.PositiveIntegerField('活跃用户数', default=0)
+    profile_users = models.PositiveIntegerField('有学生档案的用户数', default=0)
+    applicant_users = models.PositiveIntegerField('有申请记录的用户数', default=0)
+
+    class Meta:
+        verbose_name = '用户每日统计'
+        verbose_name_plural = '用户每日统计'
+
+
+class ActivityHourlyStats(models.Model):
+    """职位事件（浏览/收藏/申请）按 (小时, 事件类型) 的汇总，由 rollup_job_stats 命令从 ApplicationEvent 维护"""
+    hour = models.DateTimeField('小时')
+    event_type = models.PositiveSmallIntegerField('事件类型', choices=ApplicationEvent.EVENT_TYPES)
+    count = models.PositiveIntegerField('事件数量', default=0)
+
+    class Meta:
+        unique_together = ['hour', 'event_type']
+        verbose_name = '职位事件每小时统计'
+        verbose_name_plural = '职位事件每小时统计'
+
+
+class ActiveUserStats(models.Model):
+    """申请记录最多的用户排行，由 rollup_job_stats 命令整体重写；后台用户统计页面只读取本表"""
+    rank = models.PositiveSmallIntegerField('排名', unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    application_count = models.PositiveIntegerField('申请记录数', default=0)
+    computed_at = models.DateTimeField('汇总时间')
+
+    class Meta:
+        verbose_name = '活跃用户统计'
+        verbose_name_plural = '活跃用户统计'
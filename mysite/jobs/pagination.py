@@ -0,0 +1,175 @@
+"""
+游标（keyset）分页工具模块
+按排序键记录翻页位置，用 WHERE 条件代替 OFFSET，深翻页与第一页代价相同；
+总数使用带过期时间的缓存计数，不在每次请求时执行 COUNT(*)
+"""
+import base64
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+# 缓存计数的过期时间（秒）
+COUNT_CACHE_TIMEOUT = 60 * 5
+
+
+def encode_cursor(values, direction):
+    """将排序键的值编码为不透明的游标字符串"""
+    payload = json.dumps({'v': values, 'd': direction}, separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    解码游标字符串
+
+    返回: (values, direction)；游标无效时返回 (None, None)
+    """
+    if not token:
+        return None, None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        values, direction = payload['v'], payload['d']
+    except (ValueError, KeyError, TypeError):
+        return None, None
+    if direction not in ('next', 'prev') or not isinstance(values, list):
+        return None, None
+    return values, direction
+
+
+def get_cached_count(queryset, timeout=COUNT_CACHE_TIMEOUT):
+    """
+    返回 QuerySet 的近似总数：同一条 SQL 的 COUNT 结果在缓存中保留一段时间
+    """
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(f'{sql}|{params!r}'.encode('utf-8')).hexdigest()
+    return cache.get_or_set(f'jobs:count:{digest}', queryset.count, timeout)
+
+
+class CursorPage:
+    """游标分页的一页结果，接口与 Django 的 Page 对象尽量保持一致"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+
+class CursorPaginator:
+    """
+    游标分页器
+
+    ordering: 排序字段（例如 ('-first_published_at', '-id')），最后一个字段必须能唯一确定一行
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = list(ordering)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+        self.descending = [field.startswith('-') for field in self.ordering]
+
+    @property
+    def count(self):
+        """近似总数（来自缓存计数）"""
+        return get_cached_count(self.queryset.order_by())
+
+    def _key_values(self, obj):
+        return [getattr(obj, field) for field in self.fields]
+
+    def _parse_values(self, values):
+        """
+        将游标中的值转换回字段对应的 Python 类型
+
+        游标来自客户端，可能被篡改：空值、对象/数组、超出字段范围的值都视为无效游标
+        """
+        if len(values) != len(self.fields):
+            return None
+        if any(isinstance(value, bool) or not isinstance(value, (str, int, float)) for value in values):
+            return None
+        model = self.queryset.model
+        parsed = []
+        try:
+            for field_name, value in zip(self.fields, values):
+                field = model._meta.get_field(field_name)
+                value = field.to_python(value)
+                field.run_validators(value)
+                parsed.append(value)
+        except (ValidationError, TypeError, ValueError, OverflowError):
+            return None
+        return parsed
+
+    def _keyset_filter(self, values, forward):
+        """
+        构造"排在游标之后"的条件：(f1, f2, ...) 按字典序在游标之后
+
+        forward=False 时构造"排在游标之前"的条件
+        """
+        condition = Q()
+        for index, (field, descending) in enumerate(zip(self.fields, self.descending)):
+            after = descending == forward
+            clause = Q(**{f'{field}__{"lt" if after else "gt"}': values[index]})
+            for prev_field, prev_value in zip(self.fields[:index], values[:index]):
+                clause &= Q(**{prev_field: prev_value})
+            condition |= clause
+        return condition
+
+    def page(self, cursor=None):
+        values, direction = decode_cursor(cursor)
+        if values is not None:
+            values = self._parse_values(values)
+        if values is None:
+            direction = None
+
+        if direction == 'prev':
+            reversed_ordering = [
+                field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering
+            ]
+            rows = list(
+                self.queryset.filter(self._keyset_filter(values, forward=False))
+                .order_by(*reversed_ordering)[:self.per_page + 1]
+            )
+            has_previous = len(rows) > self.per_page
+            object_list = list(reversed(rows[:self.per_page]))
+            has_next = True
+        else:
+            queryset = self.queryset
+            if direction == 'next':
+                queryset = queryset.filter(self._keyset_filter(values, forward=True))
+            rows = list(queryset.order_by(*self.ordering)[:self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            object_list = rows[:self.per_page]
+            has_previous = direction == 'next'
+
+        next_cursor = previous_cursor = None
+        if object_list:
+            if has_next:
+                next_cursor = encode_cursor(self._key_values(object_list[-1]), 'next')
+            if has_previous:
+                previous_cursor = encode_cursor(self._key_values(object_list[0]), 'prev')
+
+        return CursorPage(object_list, self, has_next, has_previous, next_cursor, previous_cursor)
@@ -0,0 +1,134 @@
+"""
+拼音工具模块
+为职位名称、公司名称生成拼音检索词，使用户输入 "qianduan"、"qd" 也能搜到"前端"相关职位
+
+- 建索引时：中文二元组 "前端" -> 全拼 "qianduan"、首字母 "qd"（单个汉字只生成全拼）
+- 查询时：整段拼音 "qianduankaifa" 切分为音节后组合成相邻音节对
+  （qianduan、duankai、kaifa），首字母串 "qdkf" 组合为 qd、dk、kf
+
+汉字转拼音优先使用 pypinyin（能根据词语处理多音字），其次使用 unidecode；
+两者都未安装时不生成拼音检索词
+"""
+import functools
+
+# 普通话音节表（ü 写作 v），用于切分用户输入的整段拼音
+PINYIN_SYLLABLES = frozenset('''
+a ai an ang ao ba bai ban bang bao bei ben beng bi bian biang biao bie bin bing bo bong bu
+ca cai can cang cao ce cei cen ceng cha chai chan chang chao che chen cheng chi chong chou
+chu chua chuai chuan chuang chui chun chuo ci cong cou cu cuan cui cun cuo da dai dan dang
+dao de dei den deng di dia dian diao die din ding diu dong dou du duan dui dun duo e ei en
+eng er fa fan fang fei fen feng fiao fo fou fu ga gai gan gang gao ge gei gen geng gong
+gou gu gua guai guan guang gui gun guo ha hai han hang hao he hei hen heng hong hou hu hua
+huai huan huang hui hun huo ji jia jian jiang jiao jie jin jing jiong jiu ju juan jue jun
+ka kai kan kang kao ke kei ken keng kong kou ku kua kuai kuan kuang kui kun kuo la lai lan
+lang lao le lei len leng li lia lian liang liao lie lin ling liu lo long lou lu luan lun
+luo lv lve ma mai man mang mao me mei men meng mi mian miao mie min ming miu mo mou mu na
+nai nan nang nao ne nei nen neng ni nia nian niang niao nie nin ning niu nong nou nu nuan
+nun nuo nv nve o ou pa pai pan pang pao pei pen peng pi pian piao pie pin ping po pou pu
+qi qia qian qiang qiao qie qin qing qiong qiu qu quan que qun ran rang rao re ren reng ri
+rong rou ru rua ruan rui run ruo sa sai san sang sao se sen seng sha shai shan shang shao
+she shei shen sheng shi shou shu shua shuai shuan shuang shui shun shuo si song sou su
+suan sui sun suo ta tai tan tang tao te tei teng ti tian tiao tie ting tong tou tu tuan
+tui tun tuo wa wai wan wang wei wen weng wo wong wu xi xia xian xiang xiao xie xin xing
+xiong xiu xu xuan xue xun ya yan yang yao ye yi yin ying yo yong you yu yuan yue yun za
+zai zan zang zao ze zei zen zeng zha zhai zhan zhang zhao zhe zhei zhen zheng zhi zhong
+zhou zhu zhua zhuai zhuan zhuang zhui zhun zhuo zi zong zou zu zuan zui zun zuo
+'''.split())
+
+MAX_SYLLABLE_LENGTH = max(len(syllable) for syllable in PINYIN_SYLLABLES)
+
+# 首字母串按两两组合检索时的最小长度（更短的直接按词项查找）
+MIN_INITIALS_LENGTH = 3
+
+
+@functools.lru_cache(maxsize=None)
+def _get_converter():
+    """返回 汉字串 -> 音节列表 的转换函数；没有可用的拼音库时返回 None"""
+    try:
+        from pypinyin import lazy_pinyin
+        return lazy_pinyin
+    except ImportError:
+        pass
+    try:
+        from unidecode import unidecode
+        return lambda text: unidecode(text).lower().split()
+    except ImportError:
+        return None
+
+
+def is_pinyin_available():
+    return _get_converter() is not None
+
+
+def to_syllables(text):
+    """
+    将连续的中文字符串转换为音节列表（每个汉字一个音节）
+
+    无法转换或结果与字数不一致时返回 None
+    """
+    converter = _get_converter()
+    if converter is None or not text:
+        return None
+    syllables = [syllable.lower().replace('ü', 'v') for syllable in converter(text)]
+    if len(syllables) != len(text) or not all(syllable.isascii() and syllable.isalpha() for syllable in syllables):
+        return None
+    return syllables
+
+
+def pinyin_terms(chunk):
+    """
+    为一段连续的中文字符生成拼音检索词（保留重复，用于统计词频）
+
+    与 search_index.tokenize 的二元组切分一一对应：每个二元组生成全拼和首字母两个词项
+    """
+    syllables = to_syllables(chunk)
+    if not syllables:
+        return []
+    if len(syllables) == 1:
+        return [syllables[0]]
+
+    terms = []
+    for first, second in zip(syllables, syllables[1:]):
+        terms.append(first + second)
+        terms.append(first[0] + second[0])
+    return terms
+
+
+def split_syllables(text):
+    """
+    将整段拼音切分为音节（音节数最少的切分方式）
+
+    无法完整切分时返回 None
+    """
+    # best[i]: text[:i] 的最少音节切分
+    best = [None] * (len(text) + 1)
+    best[0] = []
+    for end in range(1, len(text) + 1):
+        for start in range(max(0, end - MAX_SYLLABLE_LENGTH), end):
+            if best[start] is None or text[start:end] not in PINYIN_SYLLABLES:
+                continue
+            candidate = best[start] + [text[start:end]]
+            if best[end] is None or len(candidate) < len(best[end]):
+                best[end] = candidate
+    return best[-1]
+
+
+def expand_romanized(token):
+    """
+    将查询中的拼音词展开为需要同时命中的检索词列表
+
+    返回: 检索词列表；无法按拼音解释时返回 None
+    """
+    if not (token.isascii() and token.isalpha()):
+        return None
+
+    syllables = split_syllables(token)
+    if syllables is not None:
+        if len(syllables) < 2:
+            return None
+        return [first + second for first, second in zip(syllables, syllables[1:])]
+
+    # 不能切分为音节时按首字母串处理：qdkf -> qd、dk、kf
+    if len(token) >= MIN_INITIALS_LENGTH:
+        return [token[i:i + 2] for i in range(len(token) - 1)]
+    return None
@@ -0,0 +1,237 @@
+"""
+职位相关度排序模块
+基于职位搜索倒排索引的 BM25F 打分（按字段加权），叠加发布时间的新鲜度衰减，
+用小顶堆只选出当前页需要的前 k 个结果，翻页时不必对整个命中集合排序
+
+打分量有上限：由命中职位最少的查询词驱动，只取其影响（词频 × 字段权重）最大的前
+MAX_SCORED_POSTINGS 条倒排记录，其他查询词只在这些职位中查找；常见词的命中数再多，
+取回和打分的数据量也不超过这个上限。命中集合超过上限时结果是近似的（影响较小的职位不参与排序，
+也不计入结果总数）
+"""
+import heapq
+import math
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .search_index import (
+    get_field_weights, get_length_field, posting_impact_expression, resolve_query_terms, tokenize_query,
+)
+
+# BM25 参数
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 新鲜度衰减：半衰期（天）与在总分中的占比
+FRESHNESS_HALF_LIFE_DAYS = 30
+FRESHNESS_WEIGHT = 0.2
+
+# 每次查询最多取回并打分的驱动查询词倒排记录数
+MAX_SCORED_POSTINGS = 5000
+
+# 索引全局统计（文档数、各字段平均长度）的缓存
+SEARCH_STATS_CACHE_KEY = 'jobs:search_stats'
+SEARCH_STATS_CACHE_TIMEOUT = 60 * 10
+
+
+def get_search_stats():
+    """
+    获取索引全局统计：{'doc_count': N, 'avg_lengths': {字段代码: 平均词数}}
+    """
+    from django.db.models import Avg, Count
+    from .models import JobSearchDocument, JobSearchPosting
+
+    stats = cache.get(SEARCH_STATS_CACHE_KEY)
+    if stats is None:
+        row = JobSearchDocument.objects.aggregate(
+            doc_count=Count('pk'),
+            title=Avg('title_length'),
+            company=Avg('company_length'),
+            description=Avg('description_length'),
+        )
+        stats = {
+            'doc_count': row['doc_count'],
+            'avg_lengths': {
+                JobSearchPosting.FIELD_TITLE: row['title'] or 1.0,
+                JobSearchPosting.FIELD_COMPANY: row['company'] or 1.0,
+                JobSearchPosting.FIELD_DESCRIPTION: row['description'] or 1.0,
+            },
+        }
+        cache.set(SEARCH_STATS_CACHE_KEY, stats, SEARCH_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def idf(doc_count, doc_freq):
+    """BM25 的逆文档频率（始终为正）"""
+    return math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def freshness(published_at, now=None):
+    """按发布时间计算的新鲜度系数，范围 (0, 1]"""
+    if not published_at:
+        return 0.0
+    now = now or timezone.now()
+    age_days = max(0.0, (now - published_at).total_seconds() / 86400)
+    return 0.5 ** (age_days / FRESHNESS_HALF_LIFE_DAYS)
+
+
+class JobRanker:
+    """
+    对一次查询的命中职位进行 BM25F 打分
+
+    candidates: 可选的职位 QuerySet，用于限定参与排序的职位（例如已应用其他筛选条件）
+    """
+
+    def __init__(self, query, candidates=None):
+        self.query = query
+        self.candidates = candidates
+        self._scores = None
+
+    def _load_scores(self):
+        from .models import JobSearchDocument, JobSearchPosting
+
+        groups = resolve_query_terms(self.query) if tokenize_query(self.query) else None
+        if not groups:
+            return {}
+
+        # 同一个词项可能属于多个查询词分组（如"前 前端"中"前"的扩展包含"前端"），命中时计入所有分组
+        term_groups = {}
+        for index, group in enumerate(groups):
+            for term_id in group:
+                term_groups.setdefault(term_id, set()).add(index)
+
+        postings = JobSearchPosting.objects.all()
+        if self.candidates is not None:
+            postings = postings.filter(job_page_id__in=self.candidates.values('pk'))
+
+        # 各分组命中的职位数在数据库中计数（不取回倒排记录），用于 idf 和选择驱动分组
+        doc_freqs = [
+            postings.filter(term_id__in=group).values('job_page_id').distinct().count() for group in groups
+        ]
+        if not all(doc_freqs):
+            return {}
+
+        # 命中职位最少的分组驱动：按影响从大到小只取前 MAX_SCORED_POSTINGS 条倒排记录
+        driver = min(range(len(groups)), key=doc_freqs.__getitem__)
+        driver_terms = set(groups[driver])
+        fields = ('job_page_id', 'term_id', 'field', 'frequency')
+        rows = list(
+            postings.filter(term_id__in=driver_terms)
+            .annotate(impact=posting_impact_expression())
+            .order_by('-impact', '-job_page_id')
+            .values_list(*fields)[:MAX_SCORED_POSTINGS]
+        )
+        # 其他分组只在驱动分组命中的职位中查找
+        other_terms = set(term_groups) - driver_terms
+        if other_terms:
+            rows += list(
+                postings.filter(term_id__in=other_terms, job_page_id__in={row[0] for row in rows})
+                .values_list(*fields)
+            )
+
+        # {job_id: {group: {field: frequency}}}
+        matches = {}
+        for job_id, term_id, field, frequency in rows:
+            hits = matches.setdefault(job_id, {})
+            for group in term_groups[term_id]:
+                fields_hit = hits.setdefault(group, {})
+                fields_hit[field] = fields_hit.get(field, 0) + frequency
+
+        # 所有查询词都必须命中
+        matches = {job_id: hits for job_id, hits in matches.items() if len(hits) == len(groups)}
+        if not matches:
+            return {}
+
+        stats = get_search_stats()
+        doc_count = max(stats['doc_count'], *doc_freqs)
+        avg_lengths = stats['avg_lengths']
+        weights = get_field_weights()
+        idfs = [idf(doc_count, doc_freq) for doc_freq in doc_freqs]
+
+        documents = {
+            row[0]: row[1:]
+            for row in JobSearchDocument.objects.filter(job_page_id__in=list(matches)).values_list(
+                'job_page_id', 'title_length', 'company_length', 'description_length',
+                'job_page__first_published_at',
+            )
+        }
+        field_order = [
+            JobSearchPosting.FIELD_TITLE,
+            JobSearchPosting.FIELD_COMPANY,
+            JobSearchPosting.FIELD_DESCRIPTION,
+        ]
+
+        now = timezone.now()
+        scores = {}
+        for job_id, hits in matches.items():
+            document = documents.get(job_id)
+            lengths = dict(zip(field_order, document[:3])) if document else {}
+            score = 0.0
+            for group, fields in hits.items():
+                # BM25F：先按字段长度归一化并加权合并词频，再做饱和
+                tf = 0.0
+                for field, frequency in fields.items():
+                    length_field = get_length_field(field)
+                    norm = (
+                        1 - BM25_B
+                        + BM25_B * lengths.get(length_field, avg_lengths[length_field]) / avg_lengths[length_field]
+                    )
+                    tf += weights[field] * frequency / norm
+                score += idfs[group] * tf / (BM25_K1 + tf)
+            decay = freshness(document[3], now) if document else 0.0
+            scores[job_id] = score * (1 - FRESHNESS_WEIGHT + FRESHNESS_WEIGHT * decay)
+        return scores
+
+    @property
+    def scores(self):
+        """{job_id: score}"""
+        if self._scores is None:
+            self._scores = self._load_scores()
+        return self._scores
+
+    def count(self):
+        return len(self.scores)
+
+    def top(self, k):
+        """返回得分最高的前 k 个 (job_id, score)，按得分降序；同分时职位ID大的在前"""
+        if k <= 0:
+            return []
+        return heapq.nlargest(k, self.scores.items(), key=lambda item: (item[1], item[0]))
+
+
+class RankedJobResults:
+    """
+    按相关度排序的职位结果序列，可直接交给 Django Paginator 分页
+
+    切片时只用堆选出到当前页末尾为止的结果，并只加载当前页的职位对象
+    """
+
+    def __init__(self, query, candidates=None):
+        self.ranker = JobRanker(query, candidates)
+
+    def count(self):
+        return self.ranker.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        from .models import JobPage
+
+        if isinstance(item, slice):
+            start, stop = item.start or 0, item.stop
+            if stop is None:
+                stop = self.count()
+            ranked = self.ranker.top(stop)[start:stop]
+            jobs = JobPage.objects.filter(pk__in=[job_id for job_id, _ in ranked]).in_bulk()
+            results = []
+            for job_id, score in ranked:
+                job = jobs.get(job_id)
+                if job is not None:
+                    job.search_score = score
+                    results.append(job)
+            return results
+        results = self[item:item + 1]
+        if not results:
+            raise IndexError(item)
+        return results[0]
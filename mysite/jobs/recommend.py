@@ -0,0 +1,403 @@
+"""
+职位推荐引擎
+个性化推荐页面（RecommendationsPage）与推荐视图（personalized_recommendations）共用
+
+推荐分为三个阶段：
+1. 候选生成：按学生档案（偏好职位类型、偏好地点、专业匹配）在数据库中筛选候选职位，
+   只读取打分需要的列，最多 CANDIDATE_LIMIT 个。
+   专业匹配优先使用 TF-IDF 索引（专业、偏好职位类型、简历文本 与 职位名称+描述 的相似度），
+   没有索引时退回专业关键词匹配；
+   另外混入协同过滤候选（与该用户收藏/申请过的职位相似的职位，来自离线计算的 JobNeighbor 表）
+2. 打分：依次调用打分器链，每个打分器为全部候选给出分数，按权重累加
+3. 选取：用堆选出得分最高的前 k 个，再一次性加载这些职位对象
+
+每个阶段的耗时记录在结果的 timings 中（毫秒），便于定位瓶颈
+
+推荐结果会物化到 UserRecommendation 表：页面请求只读取物化结果（一次索引查询），
+从未物化或超过 RECOMMENDATION_MAX_AGE 时才实时计算（只读，不在请求中写入）；物化的计算时间记录在学生档案上，
+物化结果为空时页面直接显示空列表
+"""
+import heapq
+import logging
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+
+from .ranking import freshness
+from .tag_utils import FRESH_GRADUATE_MASK, MAJOR_KEYWORDS, get_major_mask
+
+logger = logging.getLogger(__name__)
+
+# 默认推荐数量
+DEFAULT_LIMIT = 20
+
+# 协同过滤候选数量上限
+NEIGHBOR_CANDIDATE_LIMIT = 100
+
+# 参与打分的候选职位数量上限（按发布时间取最新的）
+CANDIDATE_LIMIT = 500
+
+# 每个用户物化保存的推荐数量（多于展示数量，职位下线后仍能补足）
+MATERIALIZED_LIMIT = 50
+
+# 物化结果的最长有效期，超过后页面改为实时计算
+RECOMMENDATION_MAX_AGE = timedelta(hours=6)
+
+# 推荐算法版本（记录在曝光/点击数据中，修改候选生成或打分逻辑时更新，便于按版本对比点击率）
+RECOMMENDATION_ALGORITHM = 'engine-v2'
+
+# 影响推荐结果的学生档案字段（这些字段变化时刷新该用户的推荐）
+PROFILE_FIELDS = {'major', 'preferred_job_types', 'preferred_locations', 'resume_text'}
+
+
+def get_preferred_locations(profile):
+    """学生档案中的偏好地点列表"""
+    return [loc.strip() for loc in profile.preferred_locations.split(',') if loc.strip()]
+
+
+def get_profile_text(profile):
+    """学生档案用于文本匹配的内容：专业名称及关键词、偏好职位类型、简历文本"""
+    from .models import JobPage
+
+    job_types = dict(JobPage.JOB_TYPES)
+    parts = [profile.get_major_display(), *MAJOR_KEYWORDS.get(profile.major, [])]
+    parts.extend(job_types.get(job_type, job_type) for job_type in profile.get_preferred_job_types_list())
+    parts.append(profile.resume_text or '')
+    return ' '.join(part for part in parts if part)
+
+
+class TextMatches:
+    """
+    TF-IDF 匹配结果
+
+    scores: {职位ID: 相似度}；built_at: 索引构建时间（之后发布的职位不在索引中）
+    """
+
+    def __init__(self, scores, built_at):
+        self.scores = scores
+        self.built_at = built_at
+
+
+def match_profile_text(profile, k=CANDIDATE_LIMIT):
+    """
+    用 TF-IDF 索引查找与档案文本最相似的前 k 个职位
+
+    没有可用的索引（未构建或未安装 numpy/scipy）或没有匹配时返回 None
+    """
+    try:
+        from .tfidf import get_tfidf_index
+    except ImportError:
+        return None
+    index = get_tfidf_index()
+    if index is None:
+        return None
+    scores = dict(index.top_k(get_profile_text(profile), k))
+    if not scores:
+        return None
+    return TextMatches(scores, index.built_at)
+
+
+def get_neighbor_scores(profile, limit=NEIGHBOR_CANDIDATE_LIMIT):
+    """
+    "和你相似的同学也收藏了"：汇总用户已收藏/申请职位的相似职位（一次查询，不含已交互过的职位）
+
+    返回: {职位ID: 相似度（按最大值归一化到 0~1）}
+    """
+    from .models import JobApplication, JobNeighbor
+
+    seeds = JobApplication.objects.filter(
+        user_id=profile.user_id,
+        status__in=JobApplication.INTERACTION_STATUSES,
+    ).values('job_page_id')
+    return top_neighbor_scores(
+        JobNeighbor.objects
+        .filter(job_page_id__in=seeds)
+        .exclude(neighbor_id__in=seeds)
+        .values_list('neighbor_id', 'score'),
+        limit,
+    )
+
+
+def top_neighbor_scores(pairs, limit=NEIGHBOR_CANDIDATE_LIMIT):
+    """累加 (相似职位ID, 相似度)，取前 limit 个并按最大值归一化到 0~1"""
+    scores = {}
+    for neighbor_id, score in pairs:
+        scores[neighbor_id] = scores.get(neighbor_id, 0.0) + score
+    if not scores:
+        return {}
+
+    top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+    best = top[0][1]
+    return {job_id: score / best for job_id, score in top}
+
+
+class Candidate:
+    """候选职位：只包含打分需要的字段"""
+    __slots__ = (
+        'job_id', 'job_type', 'first_published_at', 'fresh_graduate', 'text_score', 'neighbor_score', 'score',
+    )
+
+    def __init__(self, job_id, job_type, first_published_at, fresh_graduate, text_score=0.0, neighbor_score=0.0):
+        self.job_id = job_id
+        self.job_type = job_type
+        self.first_published_at = first_published_at
+        self.fresh_graduate = fresh_graduate
+        self.text_score = text_score
+        self.neighbor_score = neighbor_score
+        self.score = 0.0
+
+
+class Scorer:
+    """
+    打分器基类
+
+    子类实现 scores(candidates, profile)，按顺序返回每个候选的分数；
+    引擎将分数乘以 weight 后累加到候选的总分上
+    """
+    name = 'base'
+    weight = 1.0
+
+    def scores(self, candidates, profile):
+        raise NotImplementedError
+
+
+class FreshGraduateScorer(Scorer):
+    """应届生优先：带有应届生标签（名称或描述中提到应届/毕业生）的职位得 1 分"""
+    name = 'fresh_graduate'
+    weight = 1.0
+
+    def scores(self, candidates, profile):
+        return [1.0 if candidate.fresh_graduate else 0.0 for candidate in candidates]
+
+
+class TextMatchScorer(Scorer):
+    """档案文本与职位的 TF-IDF 余弦相似度（0~1）"""
+    name = 'text_match'
+    weight = 1.0
+
+    def scores(self, candidates, profile):
+        return [candidate.text_score for candidate in candidates]
+
+
+class NeighborScorer(Scorer):
+    """协同过滤得分：与用户收藏/申请过的职位的相似度（0~1）"""
+    name = 'neighbor'
+    weight = 1.0
+
+    def scores(self, candidates, profile):
+        return [candidate.neighbor_score for candidate in candidates]
+
+
+class RecencyScorer(Scorer):
+    """发布时间新鲜度（0~1，按半衰期衰减），权重较小，用于同档内排序"""
+    name = 'recency'
+    weight = 0.5
+
+    def scores(self, candidates, profile):
+        now = timezone.now()
+        return [freshness(candidate.first_published_at, now) for candidate in candidates]
+
+
+def get_default_scorers():
+    return [TextMatchScorer(), NeighborScorer(), FreshGraduateScorer(), RecencyScorer()]
+
+
+class RecommendationResult:
+    """推荐结果：职位列表 + 各阶段耗时"""
+
+    def __init__(self, jobs, scores, candidate_count, timings):
+        self.jobs = jobs
+        self.scores = scores
+        self.candidate_count = candidate_count
+        self.timings = timings
+
+    def __iter__(self):
+        return iter(self.jobs)
+
+    def __len__(self):
+        return len(self.jobs)
+
+
+class RecommendationEngine:
+    """
+    推荐引擎
+
+    scorers: 打分器列表（默认为文本相似度 + 协同过滤 + 应届生优先 + 新鲜度）
+    candidate_limit: 参与打分的候选数量上限
+    neighbor_source: 协同过滤候选来源，profile -> {职位ID: 得分}（默认 get_neighbor_scores；离线评估时替换）
+    """
+
+    def __init__(self, scorers=None, candidate_limit=CANDIDATE_LIMIT, neighbor_source=None):
+        self.scorers = scorers if scorers is not None else get_default_scorers()
+        self.candidate_limit = candidate_limit
+        self.neighbor_source = neighbor_source or get_neighbor_scores
+
+    def candidate_queryset(self, profile, text_matches=None, neighbor_ids=()):
+        """
+        按档案筛选候选职位（规则1~3：职位类型、地点、专业匹配）
+
+        text_matches: TF-IDF 匹配结果；提供时规则3改为"在匹配结果中，或在索引构建后发布且命中专业关键词"
+        neighbor_ids: 协同过滤候选，不受规则3限制
+        """
+        from .models import JobPage
+
+        # slug 缺失的职位无法生成链接，直接排除（由 check_job_slugs 命令离线修复）
+        jobs = JobPage.objects.live().exclude(slug='')
+
+        # 规则1：按偏好职位类型筛选
+        preferred_types = profile.get_preferred_job_types_list()
+        if preferred_types:
+            jobs = jobs.filter(job_type__in=preferred_types)
+
+        # 规则2：按偏好地点筛选（简单文本匹配，多个地点OR条件）
+        preferred_locations = get_preferred_locations(profile)
+        if preferred_locations:
+            location_query = Q()
+            for location in preferred_locations:
+                location_query |= Q(location__icontains=location)
+            jobs = jobs.filter(location_query)
+
+        # 规则3：按专业匹配（保存职位时已用专业关键词打好标签，这里只做位运算）
+        major_mask = get_major_mask(profile.major)
+        major_query = Q(GreaterThan(F('tag_bits').bitand(major_mask), 0)) if major_mask else Q()
+
+        if text_matches is not None:
+            # 索引构建之后发布的职位还不在索引中，仍按专业标签匹配
+            major_query = (
+                Q(pk__in=list(text_matches.scores))
+                | (Q(first_published_at__gt=text_matches.built_at) & major_query)
+            )
+        elif not major_mask:
+            return jobs
+
+        if neighbor_ids:
+            major_query |= Q(pk__in=list(neighbor_ids))
+        return jobs.filter(major_query)
+
+    def generate_candidates(self, profile):
+        """候选生成：只读取打分需要的列（应届生标记取自标签位掩码）"""
+        text_matches = match_profile_text(profile, self.candidate_limit)
+        text_scores = text_matches.scores if text_matches is not None else {}
+        neighbor_scores = self.neighbor_source(profile)
+
+        rows = (
+            self.candidate_queryset(profile, text_matches, neighbor_scores)
+            .order_by('-first_published_at', '-id')
+            .values_list('pk', 'job_type', 'first_published_at', 'tag_bits')[:self.candidate_limit]
+        )
+        return [
+            Candidate(
+                pk, job_type, published_at, bool(tag_bits & FRESH_GRADUATE_MASK),
+                text_scores.get(pk, 0.0), neighbor_scores.get(pk, 0.0),
+            )
+            for pk, job_type, published_at, tag_bits in rows
+        ]
+
+    def score(self, candidates, profile, timings):
+        """依次执行打分器链，累加加权分数"""
+        for scorer in self.scorers:
+            started = time.perf_counter()
+            for candidate, value in zip(candidates, scorer.scores(candidates, profile)):
+                candidate.score += scorer.weight * value
+            timings[f'score.{scorer.name}'] = (time.perf_counter() - started) * 1000
+
+    def rank(self, profile, limit=DEFAULT_LIMIT, timings=None):
+        """
+        执行候选生成、打分、选取，不加载职位对象
+
+        返回: ([(职位ID, 得分)]（按得分降序）, 候选数量)
+        """
+        timings = timings if timings is not None else {}
+
+        started = time.perf_counter()
+        candidates = self.generate_candidates(profile)
+        timings['candidates'] = (time.perf_counter() - started) * 1000
+
+        self.score(candidates, profile, timings)
+
+        # 同分时发布时间较新的在前（候选已按发布时间倒序，序号小的更新）
+        started = time.perf_counter()
+        top = heapq.nsmallest(
+            limit,
+            enumerate(candidates),
+            key=lambda item: (-item[1].score, item[0]),
+        )
+        timings['select'] = (time.perf_counter() - started) * 1000
+        return [(candidate.job_id, candidate.score) for _, candidate in top], len(candidates)
+
+    def recommend(self, profile, limit=DEFAULT_LIMIT):
+        from .listing import load_jobs
+
+        timings = {}
+        ranked, candidate_count = self.rank(profile, limit, timings)
+
+        started = time.perf_counter()
+        jobs = load_jobs([job_id for job_id, _ in ranked])
+        timings['load'] = (time.perf_counter() - started) * 1000
+
+        logger.debug(
+            '推荐完成: 用户档案 %s, 候选 %d 个, 耗时 %s',
+            profile.pk, candidate_count,
+            ', '.join(f'{stage}={elapsed:.1f}ms' for stage, elapsed in timings.items()),
+        )
+        return RecommendationResult(jobs, dict(ranked), candidate_count, timings)
+
+
+def recommend_jobs(profile, limit=DEFAULT_LIMIT, engine=None):
+    """使用默认引擎为学生档案生成推荐"""
+    return (engine or RecommendationEngine()).recommend(profile, limit)
+
+
+def materialize_recommendations(profile, limit=MATERIALIZED_LIMIT, engine=None):
+    """重新计算并保存用户的推荐列表，返回保存的数量；计算时间记录在档案上（结果为空时也记录）"""
+    from .models import StudentProfile, UserRecommendation
+
+    ranked, _ = (engine or RecommendationEngine()).rank(profile, limit)
+    computed_at = timezone.now()
+    with transaction.atomic():
+        UserRecommendation.objects.filter(user_id=profile.user_id).delete()
+        UserRecommendation.objects.bulk_create([
+            UserRecommendation(
+                user_id=profile.user_id,
+                job_page_id=job_id,
+                score=score,
+                rank=rank,
+                computed_at=computed_at,
+            )
+            for rank, (job_id, score) in enumerate(ranked, start=1)
+        ])
+        StudentProfile.objects.filter(pk=profile.pk).update(recommendations_computed_at=computed_at)
+    profile.recommendations_computed_at = computed_at
+    return len(ranked)
+
+
+def get_materialized_recommendations(profile, limit=DEFAULT_LIMIT, max_age=RECOMMENDATION_MAX_AGE):
+    """
+    读取物化的推荐列表（一次查询，同时加载职位对象）
+
+    从未物化或已过期时返回 None；物化时没有推荐结果则返回空列表
+    """
+    from .models import UserRecommendation
+
+    computed_at = profile.recommendations_computed_at
+    if computed_at is None or computed_at < timezone.now() - max_age:
+        return None
+    rows = (
+        UserRecommendation.objects
+        .filter(user_id=profile.user_id, job_page__live=True)
+        .select_related('job_page')
+        .order_by('rank')[:limit]
+    )
+    return [row.job_page for row in rows]
+
+
+def get_user_recommendations(profile, limit=DEFAULT_LIMIT):
+    """页面使用的推荐入口：优先读取物化结果，缺失或过期时实时计算（只读）"""
+    jobs = get_materialized_recommendations(profile, limit)
+    if jobs is None:
+        jobs = recommend_jobs(profile, limit).jobs
+    return jobs
@@ -0,0 +1,162 @@
+"""
+简历匹配模块
+用学生档案中的简历文本（StudentProfile.resume_text）为已发布职位打分，返回排序后的职位及匹配的词项
+
+- 已构建向量索引时，用简历向量在索引中做近似最近邻检索（余弦相似度）
+- 否则使用职位搜索倒排索引：取简历中出现最多的词项，按 字段权重 × 词频 × idf 在数据库中聚合打分，
+  出现在过多职位中的常见词区分度低，不参与打分
+- 每个结果附带简历与职位共同的词项（matched_terms）和技能标签（matched_skills）
+
+结果按 (用户, 简历文本哈希, 职位数据代数) 缓存：简历或职位变化后自然失效，重复访问不重新打分
+"""
+import hashlib
+from collections import Counter
+
+from django.core.cache import cache
+from django.utils.html import strip_tags
+
+from .listing import get_job_generation
+from .search_index import CJK_PATTERN, tokenize
+from .tag_utils import compute_tag_bits, get_skill_labels
+
+# 默认返回的职位数量
+DEFAULT_LIMIT = 20
+
+# 使用倒排索引打分时最多使用的简历词项数量（按词频取前若干个）
+MAX_RESUME_TERMS = 64
+
+# 文档频率超过职位总数的这一比例的词项视为常见词，不参与打分
+COMMON_TERM_RATIO = 0.2
+
+# 每个结果最多返回的匹配词项数量
+MATCHED_TERMS_LIMIT = 8
+
+RESUME_MATCH_CACHE_TIMEOUT = 60 * 60
+
+
+def get_resume_hash(text):
+    return hashlib.md5((text or '').encode('utf-8')).hexdigest()
+
+
+def _cache_key(profile, text, limit):
+    return f'jobs:resume_matches:{profile.user_id}:{get_resume_hash(text)}:{get_job_generation()}:{limit}'
+
+
+def _vector_scores(text, limit):
+    """向量索引检索：{职位ID: 相似度}；没有索引或嵌入器与索引不一致时返回 None"""
+    try:
+        from .embeddings import get_embedder
+        from .vector_index import get_embedder_name, get_vector_index
+    except ImportError:
+        return None
+
+    index = get_vector_index()
+    if index is None:
+        return None
+    embedder = get_embedder()
+    if get_embedder_name(embedder) != index.embedder_name:
+        return None
+    vector = embedder.embed_one(text)
+    if not vector.any():
+        return {}
+    return {job_id: score for job_id, score in index.search(vector, limit) if score > 0}
+
+
+def _search_index_scores(text, limit):
+    """倒排索引打分：{职位ID: 得分}"""
+    from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+    from .models import JobSearchPosting, JobSearchTerm
+    from .ranking import get_search_stats, idf
+    from .search_index import get_field_weights
+
+    terms = [term for term, _ in Counter(tokenize(text)).most_common(MAX_RESUME_TERMS)]
+    term_ids = list(JobSearchTerm.objects.filter(term__in=terms).values_list('id', flat=True))
+    if not term_ids:
+        return {}
+
+    doc_count = get_search_stats()['doc_count']
+    doc_freqs = (
+        JobSearchPosting.objects.filter(term_id__in=term_ids)
+        .values('term_id')
+        .annotate(doc_freq=Count('job_page_id', distinct=True))
+        .values_list('term_id', 'doc_freq')
+    )
+    max_doc_freq = max(1, doc_count * COMMON_TERM_RATIO)
+    idfs = {
+        term_id: idf(max(doc_count, doc_freq), doc_freq)
+        for term_id, doc_freq in doc_freqs if doc_freq <= max_doc_freq
+    }
+    if not idfs:
+        return {}
+
+    field_weight = Case(
+        *[When(field=field, then=Value(weight)) for field, weight in get_field_weights().items()],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    term_idf = Case(
+        *[When(term_id=term_id, then=Value(value)) for term_id, value in idfs.items()],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    rows = (
+        JobSearchPosting.objects.filter(term_id__in=list(idfs))
+        .values('job_page_id')
+        .annotate(score=Sum(F('frequency') * field_weight * term_idf, output_field=FloatField()))
+        .order_by('-score', '-job_page_id')
+        .values_list('job_page_id', 'score')[:limit]
+    )
+    return dict(rows)
+
+
+def get_matched_terms(resume_counts, job):
+    """简历与职位共同的词项：按简历中的词频排序，跳过单个汉字"""
+    job_terms = set(tokenize(job.job_title)) | set(tokenize(strip_tags(job.description or '')))
+    shared = [
+        term for term, _ in resume_counts.most_common()
+        if term in job_terms and not (len(term) == 1 and CJK_PATTERN.match(term))
+    ]
+    return shared[:MATCHED_TERMS_LIMIT]
+
+
+def match_resume(profile, limit=DEFAULT_LIMIT):
+    """
+    为学生档案的简历文本匹配职位（结果带缓存）
+
+    返回: {'source': 'vector' | 'search' | None, 'matches': [{'job_id', 'score', 'matched_terms', 'matched_skills'}]}
+    """
+    from .models import JobPage
+
+    text = (profile.resume_text or '').strip()
+    if not text:
+        return {'source': None, 'matches': []}
+
+    key = _cache_key(profile, text, limit)
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    source = 'vector'
+    scores = _vector_scores(text, limit)
+    if scores is None:
+        source = 'search'
+        scores = _search_index_scores(text, limit)
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+    jobs = JobPage.objects.live().only('id', 'job_title', 'description', 'tag_bits').in_bulk(
+        [job_id for job_id, _ in ranked]
+    )
+    resume_counts = Counter(tokenize(text))
+    resume_bits = compute_tag_bits('', text)
+    matches = [
+        {
+            'job_id': job_id,
+            'score': round(score, 4),
+            'matched_terms': get_matched_terms(resume_counts, jobs[job_id]),
+            'matched_skills': get_skill_labels(resume_bits & jobs[job_id].tag_bits),
+        }
+        for job_id, score in ranked if job_id in jobs
+    ]
+    result = {'source': source, 'matches': matches}
+    cache.set(key, result, RESUME_MATCH_CACHE_TIMEOUT)
+    return result
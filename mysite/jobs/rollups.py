@@ -0,0 +1,336 @@
+"""
+统计汇总表
+后台统计页面（职位统计 JobStatsView、用户统计 statistics_view）读取按天/按小时预先汇总的统计表，
+页面加载只读取最近一天的汇总行和固定窗口的时间序列，耗时与职位、用户、申请记录的历史长度无关
+
+- JobDailyStats：日期 × 来源网站 × 职位类型
+- ApplicationDailyStats：日期 × 申请状态
+- UserDailyStats：日期（新注册、累计用户数及当时的活跃用户等快照）
+- ActivityHourlyStats：小时 × 事件类型（来自职位事件日志 ApplicationEvent）
+- ActiveUserStats：申请记录最多的前 ACTIVE_USERS_LIMIT 个用户（每次整体重写）
+
+汇总表由 rollup_job_stats 命令增量维护：每次从最近一次汇总的日期（当天可能不完整）重新计算到今天，
+建议每小时运行一次
+"""
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+# 活跃用户排行保存的用户数
+ACTIVE_USERS_LIMIT = 50
+
+# 时间序列默认显示的天数、小时数
+SERIES_DAYS = 30
+SERIES_HOURS = 48
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _days(start_day, end_day):
+    day = start_day
+    while day <= end_day:
+        yield day
+        day += timedelta(days=1)
+
+
+def _cumulative_daily_counts(queryset, time_field, group_fields, start_day, end_day):
+    """
+    按天统计新增数和累计数
+
+    返回: [(日期, 分组值元组, 当天新增数, 截至当天结束的累计数)]，只包含累计数大于 0 的分组
+    """
+    start = _start_of_day(start_day)
+    end = _start_of_day(end_day + timedelta(days=1))
+
+    before = queryset.filter(**{f'{time_field}__lt': start})
+    if group_fields:
+        totals = Counter({
+            tuple(row[:-1]): row[-1]
+            for row in before.values(*group_fields).annotate(count=Count('pk')).values_list(*group_fields, 'count')
+        })
+    else:
+        totals = Counter({(): before.count()})
+
+    daily = defaultdict(dict)
+    rows = (
+        queryset.filter(**{f'{time_field}__gte': start, f'{time_field}__lt': end})
+        .annotate(day=TruncDate(time_field))
+        .values('day', *group_fields)
+        .annotate(count=Count('pk'))
+        .values_list('day', *group_fields, 'count')
+        .order_by()
+    )
+    for day, *groups, count in rows:
+        daily[day][tuple(groups)] = count
+
+    result = []
+    for day in _days(start_day, end_day):
+        totals.update(daily.get(day, {}))
+        for key in sorted(totals):
+            if totals[key]:
+                result.append((day, key, daily.get(day, {}).get(key, 0), totals[key]))
+    return result
+
+
+def rollup_jobs(start_day, end_day):
+    from .models import JobDailyStats, JobPage
+
+    rows = [
+        JobDailyStats(
+            date=day, source_website=source_website, job_type=job_type,
+            published_count=published_count, total_count=total_count,
+        )
+        for day, (source_website, job_type), published_count, total_count in _cumulative_daily_counts(
+            JobPage.objects.filter(first_published_at__isnull=False),
+            'first_published_at', ['source_website', 'job_type'], start_day, end_day,
+        )
+    ]
+    with transaction.atomic():
+        JobDailyStats.objects.filter(date__gte=start_day, date__lte=end_day).delete()
+        JobDailyStats.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rollup_applications(start_day, end_day):
+    from .models import ApplicationDailyStats, JobApplication
+
+    rows = [
+        ApplicationDailyStats(date=day, status=status, created_count=created_count, total_count=total_count)
+        for day, (status,), created_count, total_count in _cumulative_daily_counts(
+            JobApplication.objects.all(), 'created_at', ['status'], start_day, end_day,
+        )
+    ]
+    with transaction.atomic():
+        ApplicationDailyStats.objects.filter(date__gte=start_day, date__lte=end_day).delete()
+        ApplicationDailyStats.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rollup_users(start_day, end_day, today):
+    """用户每日汇总：今天和之前没有汇总行的日期使用当前快照，已有汇总行的日期保留原来的快照"""
+    from django.contrib.auth import get_user_model
+    from .models import JobApplication, StudentProfile, UserDailyStats
+
+    User = get_user_model()
+    snapshot = {
+        'active_users': User.objects.filter(is_active=True).count(),
+        'profile_users': StudentProfile.objects.count(),
+        'applicant_users': JobApplication.objects.values('user_id').distinct().count(),
+    }
+    existing = {
+        row['date']: row
+        for row in UserDailyStats.objects.filter(date__gte=start_day, date__lte=end_day).values(
+            'date', *snapshot,
+        )
+    }
+    rows = []
+    for day, _, new_users, total_users in _cumulative_daily_counts(
+        User.objects.all(), 'date_joined', [], start_day, end_day,
+    ):
+        values = snapshot if day >= today or day not in existing else existing[day]
+        rows.append(UserDailyStats(
+            date=day, new_users=new_users, total_users=total_users,
+            **{field: values[field] for field in snapshot},
+        ))
+    with transaction.atomic():
+        UserDailyStats.objects.filter(date__gte=start_day, date__lte=end_day).delete()
+        UserDailyStats.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rollup_activity(start):
+    """
+    从 start 所在的小时起重新汇总职位事件
+
+    已被 compact_application_events 删除原始事件的小时不会重新计算（保留已有的汇总行）
+    """
+    from .models import ActivityHourlyStats, ApplicationEvent
+
+    oldest = ApplicationEvent.objects.aggregate(oldest=Min('created_at'))['oldest']
+    if oldest is None:
+        return 0
+    start = max(start, oldest).replace(minute=0, second=0, microsecond=0)
+    rows = [
+        ActivityHourlyStats(hour=hour, event_type=event_type, count=count)
+        for hour, event_type, count in (
+            ApplicationEvent.objects.filter(created_at__gte=start)
+            .annotate(hour=TruncHour('created_at'))
+            .values('hour', 'event_type')
+            .annotate(count=Count('pk'))
+            .values_list('hour', 'event_type', 'count')
+            .order_by()
+        )
+    ]
+    with transaction.atomic():
+        ActivityHourlyStats.objects.filter(hour__gte=start).delete()
+        ActivityHourlyStats.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rollup_active_users():
+    """按当前的申请记录重新计算活跃用户排行（在命令中执行一次聚合，页面不再实时统计）"""
+    from django.contrib.auth import get_user_model
+    from .models import ActiveUserStats
+
+    computed_at = timezone.now()
+    rows = [
+        ActiveUserStats(rank=rank, user_id=user_id, application_count=application_count, computed_at=computed_at)
+        for rank, (user_id, application_count) in enumerate(
+            get_user_model().objects.annotate(application_count=Count('job_applications'))
+            .filter(application_count__gt=0)
+            .order_by('-application_count', 'pk')
+            .values_list('pk', 'application_count')[:ACTIVE_USERS_LIMIT],
+            start=1,
+        )
+    ]
+    with transaction.atomic():
+        ActiveUserStats.objects.all().delete()
+        ActiveUserStats.objects.bulk_create(rows)
+    return len(rows)
+
+
+def get_rollup_start():
+    """
+    增量汇总的起始日期：最近一次汇总的日期（当天可能不完整，需要重新计算）；
+    从未汇总过时从最早的数据开始；没有任何数据时返回 None
+    """
+    from django.contrib.auth import get_user_model
+    from .models import JobApplication, JobDailyStats, JobPage, UserDailyStats
+
+    last = [
+        value for value in (
+            JobDailyStats.objects.aggregate(last=Max('date'))['last'],
+            UserDailyStats.objects.aggregate(last=Max('date'))['last'],
+        ) if value is not None
+    ]
+    if last:
+        return min(last)
+
+    earliest = [
+        value for value in (
+            JobPage.objects.aggregate(earliest=Min('first_published_at'))['earliest'],
+            JobApplication.objects.aggregate(earliest=Min('created_at'))['earliest'],
+            get_user_model().objects.aggregate(earliest=Min('date_joined'))['earliest'],
+        ) if value is not None
+    ]
+    return timezone.localtime(min(earliest)).date() if earliest else None
+
+
+def rollup_stats(start_day=None):
+    """
+    从 start_day（默认为 get_rollup_start()）到今天重新计算各汇总表，并重写活跃用户排行
+
+    返回: {汇总表: 写入的行数}
+    """
+    today = timezone.localdate()
+    start_day = min(start_day or get_rollup_start() or today, today)
+    written = {
+        'jobs': rollup_jobs(start_day, today),
+        'applications': rollup_applications(start_day, today),
+        'users': rollup_users(start_day, today, today),
+        'activity': rollup_activity(_start_of_day(start_day)),
+        'active_users': rollup_active_users(),
+    }
+    return written
+
+
+def get_job_stats(days=SERIES_DAYS):
+    """
+    职位统计：最近一次汇总的总数、按来源和类型的分布，以及最近 days 天每天的新发布数
+
+    返回: {'date', 'total_jobs', 'by_source', 'by_type', 'series'}；从未汇总时 date 为 None
+    """
+    from .models import JobDailyStats
+
+    latest = JobDailyStats.objects.aggregate(latest=Max('date'))['latest']
+    stats = {'date': latest, 'total_jobs': 0, 'by_source': [], 'by_type': [], 'series': []}
+    if latest is None:
+        return stats
+
+    by_source = Counter()
+    by_type = Counter()
+    for source_website, job_type, total_count in JobDailyStats.objects.filter(date=latest).values_list(
+        'source_website', 'job_type', 'total_count',
+    ):
+        by_source[source_website] += total_count
+        by_type[job_type] += total_count
+    stats['total_jobs'] = sum(by_source.values())
+    stats['by_source'] = [{'source_website': key, 'count': count} for key, count in by_source.most_common()]
+    stats['by_type'] = [{'job_type': key, 'count': count} for key, count in by_type.most_common()]
+    stats['series'] = list(
+        JobDailyStats.objects.filter(date__gt=latest - timedelta(days=days))
+        .values('date')
+        .annotate(published=Sum('published_count'), total=Sum('total_count'))
+        .order_by('date')
+    )
+    return stats
+
+
+def get_application_stats(days=SERIES_DAYS):
+    """
+    申请记录统计：最近一次汇总的各状态记录数，以及最近 days 天每天各状态的新增数
+
+    返回: {'date', 'status_totals': [{'status', 'count'}], 'series': [{'date', 'counts': {状态: 新增数}}]}
+    """
+    from .models import ApplicationDailyStats
+
+    latest = ApplicationDailyStats.objects.aggregate(latest=Max('date'))['latest']
+    stats = {'date': latest, 'status_totals': [], 'series': []}
+    if latest is None:
+        return stats
+
+    stats['status_totals'] = [
+        {'status': status, 'count': count}
+        for status, count in ApplicationDailyStats.objects.filter(date=latest)
+        .order_by('-total_count', 'status')
+        .values_list('status', 'total_count')
+    ]
+    series = defaultdict(dict)
+    for day, status, created_count in ApplicationDailyStats.objects.filter(
+        date__gt=latest - timedelta(days=days),
+    ).values_list('date', 'status', 'created_count'):
+        series[day][status] = created_count
+    stats['series'] = [{'date': day, 'counts': series[day]} for day in sorted(series)]
+    return stats
+
+
+def get_user_stats():
+    """最近一次汇总的用户统计（UserDailyStats）；从未汇总时返回 None"""
+    from .models import UserDailyStats
+
+    return UserDailyStats.objects.order_by('-date').first()
+
+
+def get_activity_series(hours=SERIES_HOURS):
+    """最近 hours 小时每小时各类职位事件数：[{'hour', 'counts': {事件类型: 数量}}]"""
+    from .models import ActivityHourlyStats
+
+    since = timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+    series = defaultdict(dict)
+    for hour, event_type, count in ActivityHourlyStats.objects.filter(hour__gte=since).values_list(
+        'hour', 'event_type', 'count',
+    ):
+        series[hour][event_type] = count
+    return [{'hour': hour, 'counts': series[hour]} for hour in sorted(series)]
+
+
+def get_most_active_users(limit=10):
+    """
+    最近一次汇总的活跃用户排行（ActiveUserStats，最多 ACTIVE_USERS_LIMIT 个）
+
+    返回: [{'id', 'username', 'email', 'application_count'}]；从未汇总时为空列表
+    """
+    from .models import ActiveUserStats
+
+    return [
+        {'id': user_id, 'username': username, 'email': email, 'application_count': application_count}
+        for user_id, username, email, application_count in ActiveUserStats.objects.order_by('rank').values_list(
+            'user_id', 'user__username', 'user__email', 'application_count',
+        )[:limit]
+    ]
@@ -0,0 +1,147 @@
+"""
+薪资解析工具模块
+用于将salary字段中的薪资字符串统一转换为以"元"为单位的数值区间
+"""
+import math
+import re
+
+# 薪资单位对应的倍数（转换为元）
+UNIT_MULTIPLIERS = {
+    '': 1,
+    '元': 1,
+    'k': 1000,
+    '千': 1000,
+    'w': 10000,
+    '万': 10000,
+}
+
+# 薪资筛选值的上限（单位：K），超出的输入按上限处理
+MAX_SALARY_FILTER_K = 1000
+
+# 面议等无法量化的薪资标记
+NEGOTIABLE_MARKERS = ['面议', 'negotiable']
+
+_NUMBER = r'(\d+(?:\.\d+)?)'
+_UNIT = r'([Kk千Ww万元]?)'
+
+# 范围格式：8-12K、8K-12K、8000-12000、8千-1.2万、1.5-2万·13薪
+RANGE_PATTERN = re.compile(_NUMBER + r'\s*' + _UNIT + r'\s*[-~～至到]\s*' + _NUMBER + r'\s*' + _UNIT)
+# 以上格式：10K以上
+ABOVE_PATTERN = re.compile(_NUMBER + r'\s*' + _UNIT + r'\s*以上')
+# 以下格式：5K以下
+BELOW_PATTERN = re.compile(_NUMBER + r'\s*' + _UNIT + r'\s*以下')
+# 单值格式：10K（必须带单位，避免把"13薪"之类的数字误判为薪资）
+SINGLE_PATTERN = re.compile(_NUMBER + r'\s*([Kk千Ww万])')
+
+
+def _to_yuan(value, unit):
+    """按单位把数值换算为元"""
+    return int(round(float(value) * UNIT_MULTIPLIERS.get(unit.lower(), 1)))
+
+
+def is_negotiable(salary_str):
+    """判断薪资是否为面议"""
+    if not salary_str:
+        return False
+    lowered = salary_str.lower()
+    return any(marker in lowered for marker in NEGOTIABLE_MARKERS)
+
+
+def parse_salary(salary_str):
+    """
+    解析薪资字符串，返回最小值和最大值（单位：元）
+
+    支持格式：
+    - "8-12K" / "8K-12K" / "8000-12000"
+    - "8千-1.2万" / "1.5-2万·13薪"
+    - "10K以上" -> (10000, None)
+    - "5K以下" -> (None, 5000)
+    - "面议" -> (None, None)
+
+    返回: (min_yuan, max_yuan)
+    """
+    if not salary_str:
+        return None, None
+
+    salary_str = salary_str.replace(' ', '')
+
+    if is_negotiable(salary_str):
+        return None, None
+
+    match = RANGE_PATTERN.search(salary_str)
+    if match:
+        min_val, min_unit, max_val, max_unit = match.groups()
+        # "8-12K" 这种写法只在末尾带单位，左侧沿用右侧的单位
+        min_unit = min_unit or max_unit
+        low, high = _to_yuan(min_val, min_unit), _to_yuan(max_val, max_unit)
+        if low > high:
+            low, high = high, low
+        return low, high
+
+    match = ABOVE_PATTERN.search(salary_str)
+    if match:
+        return _to_yuan(*match.groups()), None
+
+    match = BELOW_PATTERN.search(salary_str)
+    if match:
+        return None, _to_yuan(*match.groups())
+
+    match = SINGLE_PATTERN.search(salary_str)
+    if match:
+        value = _to_yuan(*match.groups())
+        return value, value
+
+    return None, None
+
+
+def normalize_salary(salary_str):
+    """
+    将薪资字符串标准化为可入库的字段值
+
+    返回: (salary_min_yuan, salary_max_yuan, salary_negotiable)
+    """
+    salary_min, salary_max = parse_salary(salary_str)
+    return salary_min, salary_max, is_negotiable(salary_str)
+
+
+def parse_salary_filter(value):
+    """
+    解析用户输入的薪资筛选值（单位：K），返回元；无法解析时返回None
+
+    inf、nan 等非有限值视为无法解析，其余值限制在 0 ~ MAX_SALARY_FILTER_K 之间
+    """
+    if not value:
+        return None
+    try:
+        value = float(value)
+    except (ValueError, OverflowError):
+        return None
+    if not math.isfinite(value):
+        return None
+    return int(min(max(value, 0), MAX_SALARY_FILTER_K) * 1000)
+
+
+def build_salary_query(salary_min=None, salary_max=None):
+    """
+    根据用户的薪资筛选条件构建Q对象，直接在数据库中完成区间匹配
+
+    - 没有任何薪资信息的职位不参与匹配
+    - 指定最低薪资时，职位最高薪资需不低于该值（只有最低薪资的职位则比较最低薪资）
+    - 指定最高薪资时，职位最低薪资需不高于该值
+    """
+    from django.db.models import Q
+
+    query = Q(salary_min_yuan__isnull=False) | Q(salary_max_yuan__isnull=False)
+
+    user_min = parse_salary_filter(salary_min)
+    if user_min is not None:
+        query &= (
+            Q(salary_max_yuan__gte=user_min) |
+            Q(salary_max_yuan__isnull=True, salary_min_yuan__gte=user_min)
+        )
+
+    user_max = parse_salary_filter(salary_max)
+    if user_max is not None:
+        query &= Q(salary_min_yuan__lte=user_max) | Q(salary_min_yuan__isnull=True)
+
+    return query
@@ -0,0 +1,275 @@
+"""
+职位搜索索引模块
+对职位名称、公司名称、职位描述建立倒排索引，替代逐行 icontains 的全表扫描
+
+分词规则：
+- 连续的中文字符切分为相邻二元组（"前端开发" -> 前端、端开、开发），单个汉字保留为一元词
+- 英文和数字按单词切分并转为小写（"Python3" -> python3）
+- 职位名称、公司名称中的中文另外生成拼音检索词（"前端" -> qianduan、qd），
+  存放在单独的拼音字段中，查询拼音时与普通词项一样走索引查找
+
+查询时单个汉字匹配包含该字的二元组（"厂" 命中 "工厂"），英文数字单词按前缀匹配（"java" 命中 "javascript"）；
+词尾匹配使用倒序词项列上的前缀查找，两种扩展都只取文档频率最高的 MAX_EXPANDED_TERMS 个词项
+"""
+import re
+from collections import Counter
+
+from django.utils.html import strip_tags
+
+from .pinyin_utils import expand_romanized, pinyin_terms
+
+# 中文（CJK统一汉字）连续片段 与 英文数字单词
+TOKEN_PATTERN = re.compile(r'[\u4e00-\u9fff]+|[a-z0-9]+')
+CJK_PATTERN = re.compile(r'^[\u4e00-\u9fff]+$')
+
+# 词项最大长度（与 JobSearchTerm.term 一致）
+MAX_TERM_LENGTH = 64
+
+# 查询中最多使用的词项数量，避免超长查询拖慢检索
+MAX_QUERY_TERMS = 32
+
+# 单个查询词通过前缀/词尾扩展出的词项数量上限（按文档频率取最高的）
+MAX_EXPANDED_TERMS = 50
+
+
+def get_field_weights():
+    """各字段的权重：职位名称 > 公司名称 > 职位描述；拼音字段略低于对应的原字段"""
+    from .models import JobSearchPosting
+    return {
+        JobSearchPosting.FIELD_TITLE: 3.0,
+        JobSearchPosting.FIELD_COMPANY: 2.0,
+        JobSearchPosting.FIELD_DESCRIPTION: 1.0,
+        JobSearchPosting.FIELD_TITLE_PINYIN: 2.0,
+        JobSearchPosting.FIELD_COMPANY_PINYIN: 1.5,
+    }
+
+
+def get_length_field(field):
+    """计算长度归一化时使用的字段（拼音字段使用对应原字段的长度）"""
+    from .models import JobSearchPosting
+    return {
+        JobSearchPosting.FIELD_TITLE_PINYIN: JobSearchPosting.FIELD_TITLE,
+        JobSearchPosting.FIELD_COMPANY_PINYIN: JobSearchPosting.FIELD_COMPANY,
+    }.get(field, field)
+
+
+def tokenize(text):
+    """将文本切分为词项列表（保留重复，用于统计词频）"""
+    if not text:
+        return []
+
+    tokens = []
+    for chunk in TOKEN_PATTERN.findall(text.lower()):
+        if CJK_PATTERN.match(chunk):
+            if len(chunk) == 1:
+                tokens.append(chunk)
+            else:
+                tokens.extend(chunk[i:i + 2] for i in range(len(chunk) - 1))
+        else:
+            tokens.append(chunk[:MAX_TERM_LENGTH])
+    return tokens
+
+
+def tokenize_pinyin(text):
+    """为文本中的中文片段生成拼音检索词（保留重复，用于统计词频）"""
+    if not text:
+        return []
+
+    terms = []
+    for chunk in TOKEN_PATTERN.findall(text.lower()):
+        if CJK_PATTERN.match(chunk):
+            terms.extend(term[:MAX_TERM_LENGTH] for term in pinyin_terms(chunk))
+    return terms
+
+
+def tokenize_query(query):
+    """将查询切分为去重后的词项列表（保持出现顺序）"""
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+
+
+def get_job_fields(job):
+    """返回 {字段代码: 纯文本}"""
+    from .models import JobSearchPosting
+    return {
+        JobSearchPosting.FIELD_TITLE: job.job_title,
+        JobSearchPosting.FIELD_COMPANY: job.company_name,
+        JobSearchPosting.FIELD_DESCRIPTION: strip_tags(job.description or ''),
+    }
+
+
+def _get_term_ids(terms):
+    """获取词项ID，不存在的词项会被创建"""
+    from .models import JobSearchTerm
+
+    term_ids = dict(JobSearchTerm.objects.filter(term__in=terms).values_list('term', 'id'))
+    missing = [term for term in terms if term not in term_ids]
+    if missing:
+        JobSearchTerm.objects.bulk_create(
+            [JobSearchTerm(term=term, reversed_term=term[::-1]) for term in missing],
+            ignore_conflicts=True,
+        )
+        term_ids.update(JobSearchTerm.objects.filter(term__in=missing).values_list('term', 'id'))
+    return term_ids
+
+
+def index_job(job):
+    """
+    为单个职位重建倒排记录
+
+    只对已发布的职位建立索引；未发布的职位会被移出索引
+    """
+    from django.db import transaction
+    from .models import JobSearchDocument, JobSearchPosting
+
+    if not job.live:
+        remove_job(job)
+        return
+
+    field_counts = {field: Counter(tokenize(text)) for field, text in get_job_fields(job).items()}
+    field_counts[JobSearchPosting.FIELD_TITLE_PINYIN] = Counter(tokenize_pinyin(job.job_title))
+    field_counts[JobSearchPosting.FIELD_COMPANY_PINYIN] = Counter(tokenize_pinyin(job.company_name))
+    all_terms = set()
+    for counts in field_counts.values():
+        all_terms.update(counts)
+
+    with transaction.atomic():
+        term_ids = _get_term_ids(sorted(all_terms))
+        JobSearchPosting.objects.filter(job_page_id=job.pk).delete()
+        JobSearchPosting.objects.bulk_create([
+            JobSearchPosting(
+                term_id=term_ids[term],
+                job_page_id=job.pk,
+                field=field,
+                frequency=min(frequency, 32767),
+            )
+            for field, counts in field_counts.items()
+            for term, frequency in counts.items()
+        ], batch_size=1000)
+        JobSearchDocument.objects.update_or_create(
+            job_page_id=job.pk,
+            defaults={
+                'title_length': sum(field_counts[JobSearchPosting.FIELD_TITLE].values()),
+                'company_length': sum(field_counts[JobSearchPosting.FIELD_COMPANY].values()),
+                'description_length': sum(field_counts[JobSearchPosting.FIELD_DESCRIPTION].values()),
+            },
+        )
+
+
+def remove_job(job):
+    """将职位移出搜索索引"""
+    from .models import JobSearchDocument, JobSearchPosting
+
+    JobSearchPosting.objects.filter(job_page_id=job.pk).delete()
+    JobSearchDocument.objects.filter(job_page_id=job.pk).delete()
+
+
+def resolve_query_terms(query):
+    """
+    将查询解析为词项ID分组，每组内为"或"关系，组与组之间为"且"关系
+
+    单个汉字的查询词会扩展为该字本身及包含该字的二元组（以该字开头或结尾）；
+    英文数字单词会扩展为以该词开头的原文词项（"java" 也命中 "javascript"），拼音词项只做完全匹配；
+    开头和结尾匹配分别走 term 和 reversed_term 上的前缀索引，扩展结果按文档频率取前 MAX_EXPANDED_TERMS 个
+    （完全匹配的词项总是保留）；
+    在索引中找不到的字母串按拼音解释（"qianduankaifa"、"qdkf"），展开为多个需同时命中的检索词
+    返回: 分组列表；如果某个查询词在索引中不存在，返回None（表示无结果）
+    """
+    from django.db.models import Case, Count, IntegerField, Q, Value, When
+    from .models import JobSearchPosting, JobSearchTerm
+
+    text_fields = [JobSearchPosting.FIELD_TITLE, JobSearchPosting.FIELD_COMPANY, JobSearchPosting.FIELD_DESCRIPTION]
+    groups = []
+    for token in tokenize_query(query):
+        if not CJK_PATTERN.match(token):
+            # 前缀扩展只取出现在原文字段中的词项，避免 "go" 命中拼音 "gongcheng"
+            terms = (
+                JobSearchTerm.objects.filter(term__startswith=token)
+                .annotate(doc_freq=Count('postings', filter=Q(postings__field__in=text_fields)))
+                .filter(Q(term=token) | Q(doc_freq__gt=0))
+            )
+        elif len(token) == 1:
+            terms = (
+                JobSearchTerm.objects.filter(Q(term__startswith=token) | Q(reversed_term__startswith=token))
+                .annotate(doc_freq=Count('postings'))
+            )
+        else:
+            terms = JobSearchTerm.objects.filter(term=token).annotate(doc_freq=Value(0))
+        exact = Case(When(term=token, then=Value(1)), default=Value(0), output_field=IntegerField())
+        ids = list(
+            terms.annotate(exact=exact).order_by('-exact', '-doc_freq', 'term')
+            .values_list('id', flat=True)[:MAX_EXPANDED_TERMS]
+        )
+        if ids:
+            groups.append(ids)
+            continue
+
+        expanded = expand_romanized(token)
+        if not expanded:
+            return None
+        term_ids = dict(JobSearchTerm.objects.filter(term__in=expanded).values_list('term', 'id'))
+        if len(term_ids) < len(set(expanded)):
+            return None
+        groups.extend([term_ids[term]] for term in dict.fromkeys(expanded))
+    return groups
+
+
+def posting_impact_expression():
+    """单条倒排记录的影响：词频 × 字段权重"""
+    from django.db.models import Case, F, FloatField, Value, When
+
+    return Case(
+        *[
+            When(field=field, then=F('frequency') * Value(weight))
+            for field, weight in get_field_weights().items()
+        ],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def weighted_score_expression():
+    """按字段权重加权的词频表达式"""
+    from django.db.models import Sum
+
+    return Sum(posting_impact_expression())
+
+
+def match_postings(groups):
+    """
+    返回匹配所有查询词的职位倒排聚合查询（values: job_page_id, score）
+    """
+    from django.db.models import Count, Q
+    from .models import JobSearchPosting
+
+    postings = JobSearchPosting.objects.filter(term_id__in=[term_id for group in groups for term_id in group])
+    # 每个查询词命中一个分组即可，要求所有分组都命中
+    matched = postings.values('job_page_id').annotate(score=weighted_score_expression())
+    for index, group in enumerate(groups):
+        matched = matched.annotate(**{f'group_{index}': Count('id', filter=Q(term_id__in=group))})
+        matched = matched.filter(**{f'group_{index}__gt': 0})
+    return matched.values('job_page_id', 'score')
+
+
+def search_jobs(queryset, query):
+    """
+    在给定的职位 QuerySet 上执行关键词搜索
+
+    返回按加权得分降序排列的 QuerySet（带 search_score 注解）；查询无法切分出词项时原样返回
+    """
+    from django.db.models import FloatField, OuterRef, Subquery
+
+    if not tokenize_query(query):
+        return queryset
+
+    groups = resolve_query_terms(query)
+    if groups is None:
+        return queryset.none()
+
+    matched = match_postings(groups)
+    score = matched.filter(job_page_id=OuterRef('pk')).values('score')[:1]
+    return (
+        queryset
+        .filter(pk__in=matched.values('job_page_id'))
+        .annotate(search_score=Subquery(score, output_field=FloatField()))
+        .order_by('-search_score', '-first_published_at')
+    )
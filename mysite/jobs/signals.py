@@ -0,0 +1,84 @@
+"""
+职位相关的信号处理
+在职位发布、下线、删除时维护派生数据（地点统计、搜索索引、自动补全、向量索引、列表缓存代数等），
+在学生档案变化时刷新推荐列表，在收藏/申请记录变化时增减职位的互动计数并清除用户的职位状态和统计缓存
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from wagtail.signals import page_published, page_unpublished
+
+from . import autocomplete, vector_index
+from .counters import apply_status_change
+from .listing import bump_job_generation
+from .location_utils import refresh_location_facets
+from .recommend import PROFILE_FIELDS, materialize_recommendations
+from .search_index import index_job
+from .user_jobs import invalidate_user_job_cache
+from .models import JobApplication, JobPage, StudentProfile
+
+
+def _affected_location_keys(instance):
+    """当前及修改前的省市区键（地点变更时两者都需要刷新）"""
+    keys = {instance.location_key}
+    previous = getattr(instance, '_previous_location_key', None)
+    if previous is not None:
+        keys.add(previous)
+    return keys
+
+
+@receiver(page_published, sender=JobPage)
+def job_published(sender, instance, **kwargs):
+    refresh_location_facets(_affected_location_keys(instance))
+    index_job(instance)
+    vector_index.update_job(instance)
+    autocomplete.update_job(instance, bump_job_generation())
+
+
+@receiver(page_unpublished, sender=JobPage)
+def job_unpublished(sender, instance, **kwargs):
+    refresh_location_facets(_affected_location_keys(instance))
+    # 已下线的职位会被移出搜索索引
+    index_job(instance)
+    vector_index.update_job(instance)
+    autocomplete.update_job(instance, bump_job_generation())
+
+
+@receiver(post_delete, sender=JobPage)
+def job_deleted(sender, instance, **kwargs):
+    refresh_location_facets(_affected_location_keys(instance))
+    vector_index.remove_job(instance)
+    autocomplete.remove_job(instance, bump_job_generation())
+
+
+@receiver(post_save, sender=StudentProfile)
+def student_profile_saved(sender, instance, created, update_fields=None, **kwargs):
+    """求职偏好、专业变化时立即刷新该用户的推荐列表（只更新活跃时间等字段时跳过）"""
+    if update_fields is not None and not PROFILE_FIELDS.intersection(update_fields):
+        return
+    materialize_recommendations(instance)
+
+
+@receiver(pre_save, sender=JobApplication)
+def application_status_loaded(sender, instance, **kwargs):
+    """记录保存前的状态：从数据库读取的对象已在 from_db 中记录，其他情况（如由修订内容还原）查询一次"""
+    if instance.pk is None:
+        instance._loaded_status = None
+    elif not hasattr(instance, '_loaded_status'):
+        instance._loaded_status = (
+            JobApplication.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=JobApplication)
+def application_saved(sender, instance, created, **kwargs):
+    # JobApplication.save() 在事务中执行，计数与记录的修改一起提交
+    apply_status_change(instance.job_page_id, None if created else instance._loaded_status, instance.status)
+    instance._loaded_status = instance.status
+    invalidate_user_job_cache(instance.user_id)
+
+
+@receiver(post_delete, sender=JobApplication)
+def application_deleted(sender, instance, **kwargs):
+    # 删除（包括级联删除）在 Django 的删除事务中发送此信号
+    apply_status_change(instance.job_page_id, instance.__dict__.get('_loaded_status', instance.status), None)
+    invalidate_user_job_cache(instance.user_id)
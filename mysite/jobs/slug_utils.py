@@ -0,0 +1,49 @@
+"""
+职位 slug 工具模块
+为缺失或无效 slug 的职位生成 ASCII slug（供离线检查命令使用，页面请求中不再修复 slug）
+"""
+import re
+
+from django.utils.text import slugify
+
+# slug 最大长度（与 Page.slug 的字段长度保持一致）
+MAX_SLUG_LENGTH = 255
+
+NON_ASCII_PATTERN = re.compile(r'[^\x00-\x7F]')
+
+
+def is_valid_job_slug(slug):
+    """slug 非空且只包含 ASCII 字符"""
+    return bool(slug) and not NON_ASCII_PATTERN.search(slug)
+
+
+def build_job_slug(company_name, job_title, job_id):
+    """根据公司名称和职位名称生成 ASCII slug（中文使用 unidecode 转写）"""
+    company = company_name or "未知公司"
+    title = job_title or "未知职位"
+
+    try:
+        from unidecode import unidecode
+        company = unidecode(company)
+        title = unidecode(title)
+    except ImportError:
+        # 如果没有 unidecode，移除所有非ASCII字符
+        company = NON_ASCII_PATTERN.sub('', company)
+        title = NON_ASCII_PATTERN.sub('', title)
+
+    base_slug = slugify(f"{company}-{title}")
+    base_slug = re.sub(r'-+', '-', base_slug).strip('-')
+    if not base_slug:
+        base_slug = f"job-{job_id}"
+    return base_slug[:200]
+
+
+def find_unique_slug(base_slug, taken):
+    """在已占用的 slug 集合中找一个可用的 slug（依次追加 -1、-2 ...）"""
+    slug = base_slug
+    counter = 1
+    while slug in taken:
+        suffix = f"-{counter}"
+        slug = base_slug[:MAX_SLUG_LENGTH - len(suffix)] + suffix
+        counter += 1
+    return slug
@@ -0,0 +1,155 @@
+"""
+职位标签工具模块
+用一个 Aho-Corasick 自动机同时匹配所有标签词表（专业关键词、应届生标记、技能），
+职位保存时扫描一次职位名称和描述，结果保存为 JobPage.tag_bits 位掩码；
+推荐筛选改为整数位运算条件，不再对描述做多次 LIKE 查询或逐个职位扫描文本
+
+- 匹配不区分大小写
+- 英文数字关键词要求单词边界（避免 "UI" 匹配到 "build"、"Java" 匹配到 "JavaScript"），中文关键词按子串匹配
+- 每个标签的位固定，新增标签只能使用未占用的位（修改词表后运行 backfill_job_tags 重新打标签）
+"""
+from collections import deque
+from functools import lru_cache
+
+# 专业对应的关键词（匹配职位描述或职位名称）
+MAJOR_KEYWORDS = {
+    'cs': ['计算机', '软件', '编程', '算法', '后端', '前端', '开发'],
+    'se': ['软件工程', '测试', '运维', 'DevOps'],
+    'ee': ['电子', '硬件', '电路', '嵌入式'],
+    'business': ['商业', '市场', '营销', '管理'],
+    'finance': ['金融', '财务', '会计', '投资'],
+    'design': ['设计', 'UI', 'UX', '视觉', '平面']
+}
+
+# 应届生职位的关键词
+FRESH_GRADUATE_KEYWORDS = ['应届', '毕业生']
+
+# 技能标签：标签名 -> (显示名称, 关键词)
+SKILL_KEYWORDS = {
+    'python': ('Python', ['Python']),
+    'java': ('Java', ['Java']),
+    'cpp': ('C/C++', ['C++', 'C语言']),
+    'golang': ('Go', ['Golang', 'Go语言']),
+    'javascript': ('JavaScript', ['JavaScript', 'TypeScript', 'Node.js']),
+    'react': ('React', ['React']),
+    'vue': ('Vue', ['Vue']),
+    'sql': ('SQL', ['SQL', 'MySQL', 'PostgreSQL', '数据库']),
+    'linux': ('Linux', ['Linux', 'Shell']),
+    'machine_learning': ('机器学习', ['机器学习', '深度学习', '人工智能', 'PyTorch', 'TensorFlow']),
+    'data_analysis': ('数据分析', ['数据分析', '数据挖掘', 'Tableau']),
+    'excel': ('Excel', ['Excel']),
+    'photoshop': ('Photoshop', ['Photoshop', 'Figma', 'Sketch']),
+    'english': ('英语', ['英语', 'CET-6', 'CET-4']),
+}
+
+# 标签对应的位（保存在 64 位有符号整数中，可用 0~62）
+MAJOR_BITS = {'cs': 0, 'se': 1, 'ee': 2, 'business': 3, 'finance': 4, 'design': 5}
+FRESH_GRADUATE_BIT = 8
+SKILL_BITS = {name: 16 + position for position, name in enumerate(SKILL_KEYWORDS)}
+
+FRESH_GRADUATE_MASK = 1 << FRESH_GRADUATE_BIT
+
+
+def _is_word_char(char):
+    return char.isascii() and char.isalnum()
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 多模式匹配自动机
+
+    patterns: {关键词: 值}；match(text) 返回文本中出现的关键词对应的值的集合
+    """
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        # 每个状态结束的关键词：[(关键词长度, 值, 是否需要检查前后单词边界)]
+        self.output = [[]]
+
+        for keyword, value in patterns.items():
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            boundary = (_is_word_char(keyword[0]), _is_word_char(keyword[-1]))
+            self.output[state].append((len(keyword), value, boundary))
+
+        # 广度优先计算失败指针，并合并后缀状态的输出
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def match(self, text):
+        found = set()
+        if not text:
+            return found
+        text = text.lower()
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value, (check_start, check_end) in output[state]:
+                start = end - length + 1
+                if check_start and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if check_end and end + 1 < len(text) and _is_word_char(text[end + 1]):
+                    continue
+                found.add(value)
+        return found
+
+
+@lru_cache(maxsize=1)
+def get_tag_matcher():
+    """关键词 -> 位 的自动机（同一关键词属于多个标签时取并集）"""
+    patterns = {}
+    for major, keywords in MAJOR_KEYWORDS.items():
+        for keyword in keywords:
+            patterns[keyword.lower()] = patterns.get(keyword.lower(), 0) | (1 << MAJOR_BITS[major])
+    for keyword in FRESH_GRADUATE_KEYWORDS:
+        patterns[keyword.lower()] = patterns.get(keyword.lower(), 0) | FRESH_GRADUATE_MASK
+    for name, (_, keywords) in SKILL_KEYWORDS.items():
+        for keyword in keywords:
+            patterns[keyword.lower()] = patterns.get(keyword.lower(), 0) | (1 << SKILL_BITS[name])
+    return KeywordMatcher(patterns)
+
+
+def compute_tag_bits(title, description):
+    """扫描职位名称和描述，返回标签位掩码"""
+    from django.utils.html import strip_tags
+
+    matcher = get_tag_matcher()
+    bits = 0
+    for value in matcher.match(f'{title or ""}\n{strip_tags(description or "")}'):
+        bits |= value
+    return bits
+
+
+def get_major_mask(major):
+    """专业对应的位掩码；没有关键词的专业返回 0"""
+    bit = MAJOR_BITS.get(major)
+    return 0 if bit is None else 1 << bit
+
+
+def get_skill_labels(bits):
+    """位掩码中包含的技能显示名称"""
+    return [label for name, (label, _) in SKILL_KEYWORDS.items() if bits & (1 << SKILL_BITS[name])]
@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.core.cache import cache
+
+from wagtail.models import Page
+from wagtail.test.utils import WagtailPageTestCase
+
+from jobs import event_log
+from jobs.models import JobIndexPage, JobPage
+
+
+def create_job(parent, **kwargs):
+    """在指定的职位索引页下创建并发布一个职位"""
+    fields = {
+        'company_name': '测试公司',
+        'job_title': '测试职位',
+        'location': '北京-朝阳区',
+        'salary': '',
+        'description': '<p>职位描述</p>',
+    }
+    fields.update(kwargs)
+    job = JobPage(title=f"{fields['company_name']}-{fields['job_title']}", **fields)
+    parent.add_child(instance=job)
+    job.save_revision().publish()
+    return job
+
+
+def use_foreground_event_writer(testcase):
+    """测试中职位事件只写入不启动后台线程的缓冲区（由测试自行 flush）"""
+    writer = event_log.create_event_writer(background=False)
+    patcher = mock.patch.object(event_log, '_writer', writer)
+    patcher.start()
+    testcase.addCleanup(patcher.stop)
+    return writer
+
+
+class JobTestCase(WagtailPageTestCase):
+    """
+    职位相关测试的基类：每个测试类创建一次职位索引页 cls.index，
+    测试数据在子类的 setUpTestData 中创建；每个测试开始前清空缓存
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.index = JobIndexPage(title="Jobs")
+        Page.get_first_root_node().add_child(instance=cls.index)
+
+    def setUp(self):
+        cache.clear()
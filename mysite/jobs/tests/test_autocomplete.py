@@ -0,0 +1,109 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+
+from jobs import autocomplete
+from jobs.autocomplete import AutocompleteIndex
+from jobs.models import JobApplication
+
+from .base import JobTestCase, create_job
+
+
+class AutocompleteIndexTests(SimpleTestCase):
+    """
+    进程内的前缀索引
+    """
+
+    def setUp(self):
+        self.index = AutocompleteIndex()
+        self.index.build(
+            [
+                (1, 'Python开发', '字节跳动', '北京'),
+                (2, 'Python测试', '腾讯', '深圳'),
+                (3, 'Python开发', '腾讯', '北京'),
+            ],
+            {2: 10},
+        )
+
+    def test_prefix_ranked_by_weight(self):
+        suggestions = self.index.suggest('py')
+        self.assertEqual([text for text, _, _ in suggestions], ['Python测试', 'Python开发'])
+        self.assertEqual(self.index.suggest('北')[0][:2], ('北京', 'city'))
+        self.assertEqual(self.index.suggest('java'), [])
+
+    def test_incremental_update(self):
+        self.index.update_job(1, 'Java开发', '字节跳动', '上海')
+        self.assertEqual([text for text, _, _ in self.index.suggest('ja')], ['Java开发'])
+        self.assertEqual([text for text, _, _ in self.index.suggest('上')], ['上海'])
+        self.assertEqual(self.index.suggest('字节')[0][0], '字节跳动')
+
+        self.index.remove_job(1)
+        self.assertEqual(self.index.suggest('ja'), [])
+        self.assertEqual(self.index.suggest('字节'), [])
+        # 另一个职位仍然提供"Python开发"和"北京"
+        self.assertEqual(self.index.suggest('python开')[0][0], 'Python开发')
+        self.assertEqual(self.index.suggest('北')[0][0], '北京')
+
+    def test_long_prefix_scan_is_capped(self):
+        self.index.update_job(4, 'Python开发工程师', '腾讯', '北京')
+        with mock.patch.object(autocomplete, 'MAX_SCANNED_KEYS', 1):
+            self.assertEqual([text for text, _, _ in self.index.suggest('pytho')], ['Python开发'])
+        self.assertEqual(len(self.index.suggest('python')), 3)
+
+
+class AutocompleteApiTests(JobTestCase):
+    """
+    自动补全接口及信号驱动的增量更新
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.job = create_job(cls.index, job_title='前端开发', company_name='美团', location='上海-浦东新区')
+
+    def setUp(self):
+        super().setUp()
+        autocomplete.build_autocomplete_index()
+
+    def suggest(self, q):
+        response = self.client.get('/api/autocomplete/', {'q': q})
+        return [item['text'] for item in response.json()['suggestions']]
+
+    def test_suggestions_follow_publishing(self):
+        self.assertEqual(self.suggest('前'), ['前端开发'])
+        self.assertEqual(self.suggest('上'), ['上海'])
+
+        other = create_job(self.index, job_title='前端架构师', company_name='美团')
+        user = get_user_model().objects.create_user('applicant', password='x')
+        JobApplication.objects.create(user=user, job_page=other, status='applied')
+        autocomplete.build_autocomplete_index()
+        self.assertEqual(self.suggest('前端'), ['前端架构师', '前端开发'])
+
+        self.job.unpublish()
+        self.assertEqual(self.suggest('前端'), ['前端架构师'])
+
+    def test_stale_index_is_served_while_rebuilding(self):
+        stale = autocomplete.get_autocomplete_index()
+        create_job(self.index, job_title='前端架构师', company_name='美团')
+        # 模拟其他进程修改了数据：代数变化且超过重建间隔
+        stale.generation -= 1
+        with mock.patch.object(autocomplete, 'REBUILD_INTERVAL', 0), \
+                mock.patch.object(autocomplete, '_rebuild_in_background') as rebuild:
+            with self.assertNumQueries(0):
+                self.assertEqual(self.suggest('前端'), ['前端架构师', '前端开发'])
+        rebuild.assert_called_once_with()
+
+        # 重建期间下线的职位在替换索引前重放到新索引上
+        build = autocomplete.build_autocomplete_index
+
+        def build_then_unpublish(index):
+            build(index)
+            self.job.unpublish()
+            return index
+
+        with mock.patch.object(autocomplete, 'build_autocomplete_index', side_effect=build_then_unpublish):
+            fresh = autocomplete.rebuild_autocomplete_index()
+        self.assertIsNot(fresh, stale)
+        self.assertIs(autocomplete.get_autocomplete_index(), fresh)
+        self.assertEqual(self.suggest('前端'), ['前端架构师'])
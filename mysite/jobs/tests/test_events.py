@@ -0,0 +1,134 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.utils import timezone
+
+from jobs.api import apply_job
+from jobs.models import ApplicationEvent, ApplicationEventDaily, JobApplication, JobPage
+from jobs.rollups import get_activity_series, get_application_stats, get_job_stats, get_user_stats
+
+from .base import JobTestCase, create_job, use_foreground_event_writer
+
+
+class ApplicationEventLogTests(JobTestCase):
+    """
+    缓冲写入的职位事件日志及按天压缩
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.job = create_job(cls.index, job_title='数据分析')
+        cls.user = get_user_model().objects.create_user('student', password='x')
+
+    def setUp(self):
+        super().setUp()
+        self.writer = use_foreground_event_writer(self)
+
+    def test_save_apply_and_view_are_logged(self):
+        self.client.force_login(self.user)
+        for _ in range(2):
+            self.client.post('/api/toggle-save-job/', {'job_id': self.job.pk}, content_type='application/json')
+        # apply_job 没有配置路由，直接调用视图
+        request = RequestFactory().post('/', {'job_id': self.job.pk}, content_type='application/json')
+        request.user = self.user
+        self.assertEqual(apply_job(request).status_code, 200)
+        request = RequestFactory().get('/')
+        request.user = self.user
+        self.job.serve(request)
+        self.assertEqual(ApplicationEvent.objects.count(), 0)
+
+        self.assertEqual(self.writer.flush(), 4)
+        # 写入浏览事件时累加职位的查看数量
+        self.assertEqual(JobPage.objects.get(pk=self.job.pk).view_count, 1)
+        self.assertEqual(
+            list(ApplicationEvent.objects.order_by('pk').values_list('user_id', 'event_type')),
+            [
+                (self.user.pk, ApplicationEvent.EVENT_SAVE),
+                (self.user.pk, ApplicationEvent.EVENT_UNSAVE),
+                (self.user.pk, ApplicationEvent.EVENT_APPLY),
+                (self.user.pk, ApplicationEvent.EVENT_VIEW),
+            ],
+        )
+
+    def test_compaction_rolls_old_events_into_daily_counts(self):
+        now = timezone.now()
+        old = now - timedelta(days=120)
+        ApplicationEvent.objects.bulk_create(
+            [ApplicationEvent(job_page=self.job, event_type=ApplicationEvent.EVENT_VIEW, created_at=old)] * 3
+            + [ApplicationEvent(job_page=self.job, event_type=ApplicationEvent.EVENT_APPLY, created_at=old)]
+            + [ApplicationEvent(job_page=self.job, event_type=ApplicationEvent.EVENT_VIEW, created_at=now)]
+        )
+        call_command('compact_application_events', '--dry-run', stdout=StringIO())
+        self.assertEqual(ApplicationEvent.objects.count(), 5)
+
+        call_command('compact_application_events', stdout=StringIO())
+        self.assertEqual(ApplicationEvent.objects.count(), 1)
+        daily = dict(ApplicationEventDaily.objects.values_list('event_type', 'count'))
+        self.assertEqual(daily, {ApplicationEvent.EVENT_VIEW: 3, ApplicationEvent.EVENT_APPLY: 1})
+
+        # 同一天后来补写的事件再次压缩时累加到已有的汇总行
+        ApplicationEvent.objects.create(job_page=self.job, event_type=ApplicationEvent.EVENT_VIEW, created_at=old)
+        call_command('compact_application_events', stdout=StringIO())
+        self.assertEqual(
+            ApplicationEventDaily.objects.get(event_type=ApplicationEvent.EVENT_VIEW).count, 4,
+        )
+
+
+class StatsRollupTests(JobTestCase):
+    """
+    后台统计页面使用的按天/按小时汇总表
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.old_job = create_job(cls.index, job_title='后端开发', source_website='智联招聘')
+        cls.job = create_job(cls.index, job_title='实习生', job_type='intern', source_website='实习僧')
+        JobPage.objects.filter(pk=cls.old_job.pk).update(first_published_at=timezone.now() - timedelta(days=3))
+        cls.user = get_user_model().objects.create_user('student', password='x')
+        JobApplication.objects.create(user=cls.user, job_page=cls.job, status='applied')
+        JobApplication.objects.create(user=cls.user, job_page=cls.old_job, status='saved')
+        ApplicationEvent.objects.create(user=cls.user, job_page=cls.job, event_type=ApplicationEvent.EVENT_APPLY)
+
+    def test_rollup_and_incremental_refresh(self):
+        call_command('rollup_job_stats', stdout=StringIO())
+        # 读取统计只查询汇总表，与原始数据量无关
+        with self.assertNumQueries(3):
+            stats = get_job_stats()
+        self.assertEqual(stats['total_jobs'], 2)
+        self.assertEqual({row['job_type']: row['count'] for row in stats['by_type']}, {'fulltime': 1, 'intern': 1})
+        self.assertEqual([row['published'] for row in stats['series']], [1, 0, 0, 1])
+        self.assertEqual(
+            {row['status']: row['count'] for row in get_application_stats()['status_totals']},
+            {'applied': 1, 'saved': 1},
+        )
+        self.assertEqual((get_user_stats().total_users, get_user_stats().applicant_users), (1, 1))
+        self.assertEqual(sum(row['counts'][ApplicationEvent.EVENT_APPLY] for row in get_activity_series()), 1)
+
+        # 再次运行只重新计算最近一次汇总的日期
+        create_job(self.index, job_title='前端开发')
+        call_command('rollup_job_stats', stdout=StringIO())
+        stats = get_job_stats()
+        self.assertEqual(stats['total_jobs'], 3)
+        self.assertEqual([row['total'] for row in stats['series']], [1, 1, 1, 3])
+
+    def test_admin_statistics_pages_read_rollups(self):
+        admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'x')
+        self.client.force_login(admin)
+        self.assertContains(self.client.get('/admin/job-stats/'), 'rollup_job_stats')
+        call_command('rollup_job_stats', stdout=StringIO())
+        response = self.client.get('/admin/job-stats/')
+        self.assertEqual(response.context['stats']['total_jobs'], 2)
+        # 活跃用户也只读取排行表，不再对用户和申请记录做实时聚合
+        with self.assertNumQueries(8):
+            response = self.client.get('/django-admin/auth/user/statistics/')
+        self.assertEqual(response.context['total_users'], 2)
+        self.assertEqual(
+            response.context['most_active_users'],
+            [{'id': self.user.pk, 'username': 'student', 'email': '', 'application_count': 2}],
+        )
+        self.assertEqual([stat['label'] for stat in response.context['status_stats']], ['已申请', '已收藏'])
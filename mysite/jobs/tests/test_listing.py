@@ -0,0 +1,159 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from jobs.listing import get_job_generation, get_job_listing, parse_job_filters
+from jobs.models import JobApplication, JobPage
+from jobs.pagination import CursorPaginator, decode_cursor, encode_cursor
+
+from .base import JobTestCase, create_job
+
+
+class CursorPaginationTests(JobTestCase):
+    """
+    按 (first_published_at, id) 的游标分页
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        published_at = timezone.now()
+        for number in range(7):
+            job = create_job(cls.index, job_title=f'职位{number}')
+            # 两个职位共用同一发布时间，验证以 id 作为第二排序键
+            JobPage.objects.filter(pk=job.pk).update(first_published_at=published_at - timedelta(hours=number // 2))
+        cls.expected = list(
+            JobPage.objects.live().order_by('-first_published_at', '-id').values_list('pk', flat=True)
+        )
+
+    def paginator(self):
+        return CursorPaginator(JobPage.objects.live(), 3, ordering=('-first_published_at', '-id'))
+
+    def test_forward_and_backward(self):
+        first = self.paginator().page()
+        second = self.paginator().page(first.next_cursor)
+        third = self.paginator().page(second.next_cursor)
+        self.assertEqual(
+            [job.pk for page in (first, second, third) for job in page],
+            self.expected,
+        )
+        self.assertFalse(first.has_previous())
+        self.assertFalse(third.has_next())
+
+        back = self.paginator().page(third.previous_cursor)
+        self.assertEqual([job.pk for job in back], [job.pk for job in second])
+        self.assertEqual(self.paginator().count, 7)
+
+    def test_invalid_cursor_returns_first_page(self):
+        self.assertEqual(decode_cursor('not-a-cursor'), (None, None))
+        page = self.paginator().page('not-a-cursor')
+        self.assertEqual([job.pk for job in page], self.expected[:3])
+
+        # 被篡改的游标：空值、对象、超出整数范围的 id 都回到第一页
+        published_at = timezone.now().isoformat()
+        for values in ([None, 1], [published_at, {'a': 1}], [published_at, [1]], [published_at, 10 ** 30]):
+            page = self.paginator().page(encode_cursor(values, 'next'))
+            self.assertEqual([job.pk for job in page], self.expected[:3])
+        response = self.client.get('/api/jobs/', {'cursor': encode_cursor([published_at, {'a': 1}], 'next')})
+        self.assertEqual(response.status_code, 200)
+
+
+class ListingCacheTests(JobTestCase):
+    """
+    职位列表缓存及按代数失效
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.job = create_job(cls.index, job_title='Java开发', salary='8-12K')
+
+    def listing_ids(self, **params):
+        page, _ = get_job_listing(self.index, parse_job_filters(params))
+        return [job.pk for job in page]
+
+    def test_equivalent_filters_share_cache_entry(self):
+        self.assertEqual(self.listing_ids(q='Java', salary_min='8'), [self.job.pk])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.listing_ids(q='  java ', salary_min='8.0'), [self.job.pk])
+
+    def test_publish_invalidates_listing(self):
+        self.assertEqual(self.listing_ids(), [self.job.pk])
+        generation = get_job_generation()
+        new_job = create_job(self.index, job_title='Go开发')
+        self.assertGreater(get_job_generation(), generation)
+        self.assertEqual(self.listing_ids(), [new_job.pk, self.job.pk])
+
+
+class JobListApiTests(JobTestCase):
+    """
+    /api/jobs/ JSON 列表接口
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.jobs = [
+            create_job(cls.index, job_title=f'Python开发{i}', description='<p>负责后端服务开发</p>')
+            for i in range(3)
+        ]
+
+    def test_returns_projected_page_with_cursor(self):
+        response = self.client.get('/api/jobs/', {'limit': 2})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([job['id'] for job in data['results']], [self.jobs[2].pk, self.jobs[1].pk])
+        self.assertEqual(data['results'][0]['description'], '负责后端服务开发')
+        self.assertTrue(data['has_next'])
+
+        data = self.client.get('/api/jobs/', {'limit': 2, 'cursor': data['next_cursor']}).json()
+        self.assertEqual([job['id'] for job in data['results']], [self.jobs[0].pk])
+        self.assertFalse(data['has_next'])
+
+    def test_keyword_search_uses_page_numbers(self):
+        data = self.client.get('/api/jobs/', {'q': 'python', 'limit': 2}).json()
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(data['num_pages'], 2)
+
+    def test_conditional_get(self):
+        response = self.client.get('/api/jobs/')
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(self.client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        create_job(self.index, job_title='Go开发')
+        response = self.client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # 收藏数变化不改变职位数据代数，但响应中的计数变了，ETag 也要变
+        etag = response['ETag']
+        user = get_user_model().objects.create_user('student', password='x')
+        JobApplication.objects.create(user=user, job_page=self.jobs[0], status='saved')
+        response = self.client.get('/api/jobs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(1, [job['save_count'] for job in response.json()['results']])
+
+
+class SavedJobsPageTests(JobTestCase):
+    """
+    收藏职位列表的游标分页
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = get_user_model().objects.create_user('student', password='x')
+        for i in range(16):
+            job = create_job(cls.index, job_title=f'职位{i}')
+            JobApplication.objects.create(user=cls.user, job_page=job, status='saved')
+
+    def test_pages_show_approximate_count(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/accounts/saved-jobs/')
+        self.assertEqual(len(response.context['saved_applications']), 15)
+        self.assertContains(response, '共约 16 个收藏')
+
+        response = self.client.get('/accounts/saved-jobs/', {'cursor': response.context['saved_applications'].next_cursor})
+        self.assertEqual(len(response.context['saved_applications']), 1)
+        self.assertContains(response, '共约 16 个收藏')
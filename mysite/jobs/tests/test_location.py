@@ -0,0 +1,86 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from jobs.location_utils import get_location_tree
+from jobs.models import JobPage, LocationFacet
+
+from .base import JobTestCase, create_job
+
+
+class LocationFieldTests(JobTestCase):
+    """
+    结构化的省/市/区字段
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.beijing = create_job(cls.index, location='北京-朝阳区')
+        cls.shenzhen = create_job(cls.index, location='广东省深圳市-南山区')
+
+    def test_location_columns_filled_on_save(self):
+        self.shenzhen.refresh_from_db()
+        self.assertEqual(
+            (self.shenzhen.province, self.shenzhen.city, self.shenzhen.district),
+            ('广东', '深圳', '南山'),
+        )
+
+    def test_location_columns_follow_location_update(self):
+        self.beijing.location = '上海-浦东新区'
+        self.beijing.save(update_fields=['location'])
+        self.beijing.refresh_from_db()
+        self.assertEqual((self.beijing.province, self.beijing.city), ('上海', '上海'))
+
+    def test_backfill_command(self):
+        JobPage.objects.filter(pk=self.shenzhen.pk).update(province='', city='', district='')
+        out = StringIO()
+        call_command('backfill_job_locations', '--dry-run', stdout=out)
+        self.assertIn('将更新 1 个', out.getvalue())
+        self.assertEqual(JobPage.objects.get(pk=self.shenzhen.pk).city, '')
+
+        out = StringIO()
+        call_command('backfill_job_locations', '--chunk-size', '1', stdout=out)
+        self.assertIn('更新 1 个，重建地点统计', out.getvalue())
+        self.assertEqual(
+            JobPage.objects.values_list('province', 'city', 'district').get(pk=self.shenzhen.pk),
+            ('广东', '深圳', '南山'),
+        )
+
+
+class LocationFacetTests(JobTestCase):
+    """
+    物化的地点统计树与地点数据接口
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.first = create_job(cls.index, location='北京-朝阳区')
+        cls.second = create_job(cls.index, location='北京-海淀区')
+
+    def test_facets_follow_publish_and_unpublish(self):
+        tree = get_location_tree()['tree']
+        self.assertEqual(tree['北京']['count'], 2)
+        self.assertEqual(tree['北京']['cities']['北京']['districts'], {'朝阳': 1, '海淀': 1})
+
+        self.second.unpublish()
+        tree = get_location_tree()['tree']
+        self.assertEqual(tree['北京']['count'], 1)
+        self.assertFalse(LocationFacet.objects.filter(district='海淀').exists())
+
+    def test_location_change_moves_count(self):
+        self.first.location = '上海-浦东新区'
+        self.first.save_revision().publish()
+        tree = get_location_tree()['tree']
+        self.assertEqual(tree['北京']['count'], 1)
+        self.assertEqual(tree['上海']['count'], 1)
+
+    def test_location_data_etag(self):
+        response = self.client.get('/api/location-data/', {'level': 'district', 'province': '北京', 'city': '北京'})
+        self.assertEqual(response.json()['data'], ['朝阳', '海淀'])
+        response = self.client.get(
+            '/api/location-data/', {'level': 'province'},
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(response.status_code, 304)
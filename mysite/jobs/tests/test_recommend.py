@@ -0,0 +1,313 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from wagtail.models import Page
+
+from jobs import tracking
+from jobs.evaluation import evaluate_recommendations
+from jobs.models import (
+    JobApplication, JobNeighbor, JobPage, RecommendationEvent, RecommendationsPage, StudentProfile,
+    UserRecommendation,
+)
+from jobs.recommend import RecommendationEngine, Scorer, get_materialized_recommendations, recommend_jobs
+from jobs.tag_utils import get_major_mask
+from jobs.tfidf import get_tfidf_index
+
+from .base import JobTestCase, create_job
+
+
+class RecommendationsPageTests(JobTestCase):
+    """
+    推荐页面的上下文与物化的推荐列表
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.page = RecommendationsPage(title="推荐")
+        Page.get_first_root_node().add_child(instance=cls.page)
+
+        cls.user = get_user_model().objects.create_user('student', password='x')
+        StudentProfile.objects.create(
+            user=cls.user, major='cs', preferred_job_types='intern', preferred_locations='北京',
+        )
+        cls.regular = create_job(cls.index, job_title='后端开发', job_type='intern')
+        cls.graduate = create_job(
+            cls.index, job_title='前端开发', job_type='intern', description='<p>欢迎应届生</p>',
+        )
+        create_job(cls.index, job_title='后端开发', job_type='fulltime')
+        create_job(cls.index, job_title='后端开发', job_type='intern', location='上海-浦东新区')
+        # 创建档案时（还没有职位）物化的空结果作废，从未物化的状态开始
+        StudentProfile.objects.filter(user=cls.user).update(recommendations_computed_at=None)
+
+    def get_context(self, request=None):
+        if request is None:
+            request = self.make_request()
+        return self.page.get_context(request)
+
+    def make_request(self):
+        request = RequestFactory().get('/recommendations/')
+        request.user = get_user_model().objects.get(pk=self.user.pk)
+        return request
+
+    def test_recommendations_use_fixed_query_budget(self):
+        for i in range(5):
+            create_job(self.index, job_title=f'软件开发{i}', job_type='intern')
+        request = self.make_request()
+        # 没有物化结果时实时计算：档案、协同过滤、候选、推荐职位、用户职位状态各一次查询，且不写入任何数据
+        with self.assertNumQueries(5):
+            recommendations = self.get_context(request)['recommendations']
+        self.assertEqual(recommendations[0].pk, self.graduate.pk)
+        self.assertIn(self.regular.pk, [job.pk for job in recommendations])
+        self.assertEqual(len(recommendations), 7)
+
+        # 物化之后只需读取档案和物化结果（用户职位状态已缓存）
+        call_command('refresh_user_recommendations', stdout=StringIO())
+        request = self.make_request()
+        with self.assertNumQueries(2):
+            materialized = self.get_context(request)['recommendations']
+        self.assertEqual([job.pk for job in materialized], [job.pk for job in recommendations])
+
+    def test_profile_change_refreshes_materialized_list(self):
+        call_command('refresh_user_recommendations', stdout=StringIO())
+        self.assertEqual(UserRecommendation.objects.filter(user=self.user).count(), 2)
+
+        profile = StudentProfile.objects.get(user=self.user)
+        profile.preferred_locations = '上海'
+        profile.save()
+        self.assertEqual(
+            list(UserRecommendation.objects.filter(user=self.user).values_list('rank', flat=True)), [1]
+        )
+        # 只更新活跃时间不会重新计算
+        computed_at = UserRecommendation.objects.get(user=self.user).computed_at
+        profile.update_last_active()
+        self.assertEqual(UserRecommendation.objects.get(user=self.user).computed_at, computed_at)
+
+    def test_empty_materialized_list_is_not_recomputed(self):
+        profile = StudentProfile.objects.get(user=self.user)
+        profile.preferred_locations = '拉萨'
+        profile.save()
+        self.assertFalse(UserRecommendation.objects.filter(user=self.user).exists())
+        # 刚物化的空结果直接返回空列表，不再实时计算
+        profile = StudentProfile.objects.get(user=self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_materialized_recommendations(profile), [])
+
+    def test_resume_change_refreshes_materialized_list(self):
+        # 简历文本参与 TF-IDF 专业匹配，只保存简历时也要重新计算
+        profile = StudentProfile.objects.get(user=self.user)
+        profile.resume_text = '熟悉 React 前端开发'
+        profile.save(update_fields=['resume_text'])
+        self.assertEqual(UserRecommendation.objects.filter(user=self.user).count(), 2)
+
+    def test_recommendations_are_capped(self):
+        for i in range(RecommendationsPage.RECOMMENDATION_LIMIT):
+            create_job(self.index, job_title=f'软件开发{i}', job_type='intern')
+        self.assertEqual(len(self.get_context()['recommendations']), RecommendationsPage.RECOMMENDATION_LIMIT)
+
+
+class RecommendationEngineTests(JobTestCase):
+    """
+    推荐引擎的打分器链、专业与应届生标签
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        user = get_user_model().objects.create_user('student', password='x')
+        cls.profile = StudentProfile.objects.create(
+            user=user, major='cs', preferred_job_types='intern', preferred_locations='北京',
+        )
+        cls.older = create_job(cls.index, job_title='后端开发', job_type='intern')
+        cls.newer = create_job(cls.index, job_title='前端开发', job_type='intern')
+
+    def test_custom_scorer_chain(self):
+        class PreferOlder(Scorer):
+            name = 'prefer_older'
+            weight = 10.0
+
+            def scores(inner_self, candidates, profile):
+                return [1.0 if c.job_id == self.older.pk else 0.0 for c in candidates]
+
+        self.assertEqual([job.pk for job in recommend_jobs(self.profile)], [self.newer.pk, self.older.pk])
+
+        result = recommend_jobs(self.profile, engine=RecommendationEngine(scorers=[PreferOlder()]))
+        self.assertEqual([job.pk for job in result], [self.older.pk, self.newer.pk])
+        self.assertEqual(result.candidate_count, 2)
+        self.assertIn('score.prefer_older', result.timings)
+
+    def test_major_and_fresh_graduate_tags(self):
+        fresh = create_job(self.index, job_title='软件测试', job_type='intern', description='<p>接受应届毕业生</p>')
+        create_job(self.index, job_title='财务助理', job_type='intern')
+        self.assertTrue(fresh.is_fresh_graduate)
+        self.assertEqual(JobPage.objects.get(pk=self.older.pk).tag_bits, get_major_mask('cs'))
+
+        # 不匹配专业的职位被筛掉，应届生职位排在最前
+        ids = [job.pk for job in recommend_jobs(self.profile)]
+        self.assertEqual(ids, [fresh.pk, self.newer.pk, self.older.pk])
+
+    def test_backfill_tags_command(self):
+        JobPage.objects.filter(pk=self.older.pk).update(tag_bits=0)
+        call_command('backfill_job_tags', '--dry-run', stdout=StringIO())
+        self.assertEqual(JobPage.objects.get(pk=self.older.pk).tag_bits, 0)
+        call_command('backfill_job_tags', stdout=StringIO())
+        self.assertEqual(JobPage.objects.get(pk=self.older.pk).tag_bits, get_major_mask('cs'))
+
+
+class TfidfIndexTests(JobTestCase):
+    """
+    磁盘上的 TF-IDF 索引及其在推荐中的使用
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.frontend = create_job(cls.index, job_title='前端开发', description='<p>React Vue 前端框架</p>')
+        cls.finance = create_job(cls.index, job_title='财务助理', description='<p>会计 报表 财务分析</p>')
+        cls.data = create_job(cls.index, job_title='数据分析', description='<p>财务数据报表 Python</p>')
+
+    def setUp(self):
+        super().setUp()
+        self.index_dir = tempfile.mkdtemp()
+        # 清理时重新检查索引目录，避免进程内缓存的索引影响其他测试
+        self.addCleanup(get_tfidf_index, force_check=True)
+        self.addCleanup(shutil.rmtree, self.index_dir, ignore_errors=True)
+        override = override_settings(JOB_INDEX_DIR=self.index_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        call_command('build_tfidf_index', stdout=StringIO())
+
+    def test_top_k(self):
+        index = get_tfidf_index(force_check=True)
+        self.assertEqual(len(index), 3)
+        ranked = index.top_k('财务 报表', 5)
+        self.assertEqual([job_id for job_id, _ in ranked], [self.finance.pk, self.data.pk])
+        self.assertEqual(index.top_k('财务', 1)[0][0], self.finance.pk)
+        self.assertEqual(index.top_k('量子物理', 5), [])
+
+    def test_recommendations_rank_by_profile_text(self):
+        get_tfidf_index(force_check=True)
+        user = get_user_model().objects.create_user('student', password='x')
+        profile = StudentProfile.objects.create(
+            user=user, major='other', preferred_job_types='fulltime', preferred_locations='北京',
+            resume_text='熟悉 React 和 Vue，做过前端项目',
+        )
+        newer = create_job(self.index, job_title='前端实习', description='<p>前端</p>')
+        ids = [job.pk for job in recommend_jobs(profile)]
+        # 文本最相似的职位排在最前；索引构建后发布的职位仍可作为候选
+        self.assertEqual(ids[0], self.frontend.pk)
+        self.assertIn(newer.pk, ids)
+        self.assertNotIn(self.finance.pk, ids)
+
+
+class RecommendationTrackingTests(JobTestCase):
+    """
+    缓冲写入的推荐曝光、点击记录
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.jobs = [create_job(cls.index, job_title=f'职位{i}') for i in range(3)]
+        cls.user = get_user_model().objects.create_user('student', password='x')
+
+    def setUp(self):
+        super().setUp()
+        self.writer = tracking.create_event_writer(background=False)
+        patcher = mock.patch.object(tracking, '_writer', self.writer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, payload):
+        return self.client.post('/api/track-recommendation-click/', payload, content_type='application/json')
+
+    def test_requires_login(self):
+        self.assertEqual(self.post({'job_id': self.jobs[0].pk}).status_code, 401)
+
+    def test_events_are_buffered_then_bulk_written(self):
+        self.client.force_login(self.user)
+        impressions = [
+            {'job_id': job.pk, 'rank': rank, 'event': 'impression', 'algorithm': 'engine-test'}
+            for rank, job in enumerate(self.jobs, 1)
+        ]
+        # 请求中只读取会话和用户，不写数据库
+        with self.assertNumQueries(2):
+            response = self.post({'events': impressions + [{'job_id': 'x'}, {'job_id': 1, 'event': 'hover'}]})
+        self.assertEqual(response.json(), {'accepted': 3})
+        self.post({'job_id': self.jobs[1].pk, 'rank': 2, 'algorithm': 'engine-test'})
+        self.assertEqual(RecommendationEvent.objects.count(), 0)
+        self.assertEqual(len(self.writer), 4)
+
+        # 写入前去掉已删除职位的事件
+        self.post({'job_id': 999999, 'rank': 1})
+        self.assertEqual(self.writer.flush(), 4)
+        self.assertEqual(len(self.writer), 0)
+
+        stats = tracking.get_ctr_stats()
+        self.assertEqual(stats, [{'algorithm': 'engine-test', 'impressions': 3, 'clicks': 1, 'ctr': 1 / 3}])
+        by_rank = {row['rank']: row['clicks'] for row in tracking.get_ctr_stats(by_rank=True)}
+        self.assertEqual(by_rank, {1: 0, 2: 1, 3: 0})
+
+
+class CollaborativeFilteringTests(JobTestCase):
+    """
+    由收藏、申请记录计算的相似职位（协同过滤）与离线评估
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.a, cls.b, cls.c, cls.d = [
+            create_job(cls.index, job_title=f'职位{i}', location='上海-浦东新区') for i in range(4)
+        ]
+        User = get_user_model()
+        cls.users = [User.objects.create_user(f'user{i}', password='x') for i in range(4)]
+        # 三个用户同时收藏了 a 和 b，两个用户同时收藏了 a 和 c，d 只有一个用户
+        for user, jobs in zip(cls.users, [(cls.a, cls.b, cls.c), (cls.a, cls.b, cls.c), (cls.a, cls.b), (cls.d,)]):
+            for job in jobs:
+                JobApplication.objects.create(user=user, job_page=job, status='saved')
+
+    def test_neighbors_are_ranked_and_blended(self):
+        call_command('build_job_neighbors', '--block-size', '2', stdout=StringIO())
+        neighbors = list(
+            JobNeighbor.objects.filter(job_page=self.a).order_by('-score').values_list('neighbor_id', flat=True)
+        )
+        self.assertEqual(neighbors, [self.b.pk, self.c.pk])
+        self.assertFalse(JobNeighbor.objects.filter(job_page=self.d).exists())
+
+        # 只收藏过 a 的新用户：相似职位 b、c 作为候选混入（不受专业匹配规则限制）
+        student = get_user_model().objects.create_user('student', password='x')
+        profile = StudentProfile.objects.create(
+            user=student, major='cs', preferred_job_types='fulltime', preferred_locations='上海',
+        )
+        JobApplication.objects.create(user=student, job_page=self.a, status='saved')
+        self.assertEqual([job.pk for job in recommend_jobs(profile)], [self.b.pk, self.c.pk])
+
+    def test_offline_evaluation_uses_only_history_before_cutoff(self):
+        JobApplication.objects.update(created_at=timezone.now() - timedelta(days=10))
+        student = get_user_model().objects.create_user('student', password='x')
+        StudentProfile.objects.create(user=student, major='other', preferred_job_types='fulltime')
+        saved = JobApplication.objects.create(user=student, job_page=self.a, status='saved')
+        JobApplication.objects.filter(pk=saved.pk).update(created_at=timezone.now() - timedelta(days=5))
+        JobApplication.objects.create(user=student, job_page=self.b, status='saved')
+
+        cutoff, results = evaluate_recommendations(k=1, cutoff=timezone.now() - timedelta(days=1))
+        results = {result.name: result for result in results}
+        # 相似度由训练期数据在内存中计算（JobNeighbor 表为空），测试期收藏的 b 被命中
+        self.assertFalse(JobNeighbor.objects.exists())
+        self.assertEqual(results['default'].user_count, 1)
+        self.assertEqual((results['default'].precision, results['default'].recall), (1.0, 1.0))
+        self.assertEqual(results['recency'].precision, 0.0)
+        self.assertEqual(results['default'].coverage, 0.25)
+
+        out = StringIO()
+        call_command('evaluate_recommendations', '--k', '1', '--variants', 'default', stdout=out)
+        self.assertIn('default: precision@1', out.getvalue())
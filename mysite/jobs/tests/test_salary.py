@@ -0,0 +1,80 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from jobs.models import JobPage
+from jobs.salary_utils import build_salary_query, normalize_salary, parse_salary, parse_salary_filter
+
+from .base import JobTestCase, create_job
+
+
+class SalaryParsingTests(SimpleTestCase):
+    """
+    薪资字符串解析
+    """
+
+    def test_range_formats(self):
+        self.assertEqual(parse_salary('8-12K'), (8000, 12000))
+        self.assertEqual(parse_salary('8K-12K'), (8000, 12000))
+        self.assertEqual(parse_salary('8000-12000'), (8000, 12000))
+        self.assertEqual(parse_salary('8千-1.2万'), (8000, 12000))
+        self.assertEqual(parse_salary('1.5-2万·13薪'), (15000, 20000))
+
+    def test_open_ended_formats(self):
+        self.assertEqual(parse_salary('10K以上'), (10000, None))
+        self.assertEqual(parse_salary('5K以下'), (None, 5000))
+
+    def test_negotiable_and_empty(self):
+        self.assertEqual(normalize_salary('面议'), (None, None, True))
+        self.assertEqual(normalize_salary(''), (None, None, False))
+
+
+class SalaryFilterTests(JobTestCase):
+    """
+    数据库端的薪资范围筛选
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.low = create_job(cls.index, job_title='低薪', salary='3-5K')
+        cls.mid = create_job(cls.index, job_title='中薪', salary='8-12K')
+        cls.high = create_job(cls.index, job_title='高薪', salary='20K以上')
+        cls.negotiable = create_job(cls.index, job_title='面议', salary='面议')
+
+    def filter_ids(self, salary_min='', salary_max=''):
+        return set(
+            JobPage.objects.live()
+            .filter(build_salary_query(salary_min, salary_max))
+            .values_list('pk', flat=True)
+        )
+
+    def test_salary_columns_filled_on_save(self):
+        self.mid.refresh_from_db()
+        self.assertEqual((self.mid.salary_min_yuan, self.mid.salary_max_yuan), (8000, 12000))
+        self.negotiable.refresh_from_db()
+        self.assertTrue(self.negotiable.salary_negotiable)
+
+    def test_min_and_max_filters(self):
+        self.assertEqual(self.filter_ids(salary_min='10'), {self.mid.pk, self.high.pk})
+        self.assertEqual(self.filter_ids(salary_max='6'), {self.low.pk})
+        self.assertEqual(self.filter_ids(salary_min='6', salary_max='15'), {self.mid.pk})
+
+    def test_non_finite_and_huge_filters(self):
+        self.assertIsNone(parse_salary_filter('inf'))
+        self.assertIsNone(parse_salary_filter('nan'))
+        self.assertEqual(parse_salary_filter('1e300'), 1000 * 1000)
+        self.assertEqual(parse_salary_filter('-5'), 0)
+        self.assertEqual(self.filter_ids(salary_min='inf'), {self.low.pk, self.mid.pk, self.high.pk})
+        self.assertEqual(self.filter_ids(salary_min='1e300'), set())
+        self.assertEqual(self.client.get('/api/jobs/', {'salary_min': 'inf'}).status_code, 200)
+
+    def test_backfill_command(self):
+        JobPage.objects.filter(pk=self.mid.pk).update(salary_min_yuan=None, salary_max_yuan=None)
+        call_command('backfill_salary_ranges', '--dry-run', stdout=StringIO())
+        self.assertEqual(self.filter_ids(salary_min='10'), {self.high.pk})
+        out = StringIO()
+        call_command('backfill_salary_ranges', stdout=out)
+        self.assertIn('更新 1 个', out.getvalue())
+        self.assertEqual(self.filter_ids(salary_min='10'), {self.mid.pk, self.high.pk})
@@ -0,0 +1,138 @@
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from jobs.models import JobPage, JobSearchTerm
+from jobs.pinyin_utils import expand_romanized, is_pinyin_available, split_syllables
+from jobs.ranking import RankedJobResults
+from jobs.search_index import search_jobs, tokenize
+
+from .base import JobTestCase, create_job
+
+
+class JobSearchIndexTests(JobTestCase):
+    """
+    职位搜索倒排索引
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.frontend = create_job(cls.index, job_title='前端开发工程师', company_name='字节跳动')
+        cls.backend = create_job(
+            cls.index, job_title='Python后端开发', company_name='腾讯',
+            description='<p>负责前端接口联调</p>',
+        )
+
+    def search_ids(self, query):
+        return list(search_jobs(JobPage.objects.live(), query).values_list('pk', flat=True))
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize('Python前端开发'), ['python', '前端', '端开', '开发'])
+
+    def test_title_match_ranks_above_description_match(self):
+        self.assertEqual(self.search_ids('前端'), [self.frontend.pk, self.backend.pk])
+        self.assertEqual(self.search_ids('python'), [self.backend.pk])
+        self.assertEqual(self.search_ids('腾'), [self.backend.pk])
+        self.assertEqual(self.search_ids('字节python'), [])
+
+    def test_single_character_and_prefix_queries(self):
+        factory = create_job(self.index, job_title='工厂技术员', description='<p>熟悉JavaScript</p>')
+        # 单个汉字既匹配以该字开头的二元组，也匹配以该字结尾的二元组
+        self.assertEqual(self.search_ids('厂'), [factory.pk])
+        self.assertCountEqual(self.search_ids('端'), [self.frontend.pk, self.backend.pk])
+        # 英文单词按前缀匹配
+        self.assertEqual(self.search_ids('java'), [factory.pk])
+        self.assertEqual(self.search_ids('pyth'), [self.backend.pk])
+        # 词尾匹配走倒序词项的前缀索引
+        self.assertEqual(JobSearchTerm.objects.get(term='工厂').reversed_term, '厂工')
+
+    def test_expansion_keeps_most_frequent_terms(self):
+        factory = create_job(self.index, job_title='工厂技术员', description='<p>熟悉JavaScript</p>')
+        java = [create_job(self.index, job_title=f'Java开发{i}') for i in range(2)]
+        self.assertCountEqual(self.search_ids('jav'), [factory.pk] + [job.pk for job in java])
+        with mock.patch('jobs.search_index.MAX_EXPANDED_TERMS', 1):
+            # 只保留文档频率最高的 "java"；完全匹配的词项总是保留
+            self.assertCountEqual(self.search_ids('jav'), [job.pk for job in java])
+            self.assertEqual(self.search_ids('javascript'), [factory.pk])
+
+    def test_unpublished_job_leaves_index(self):
+        self.frontend.unpublish()
+        self.assertEqual(self.search_ids('字节'), [])
+
+    @skipUnless(is_pinyin_available(), 'no pinyin library installed')
+    def test_pinyin_and_initials(self):
+        self.assertEqual(self.search_ids('qianduan'), [self.frontend.pk])
+        self.assertEqual(self.search_ids('qianduankaifa'), [self.frontend.pk])
+        self.assertEqual(self.search_ids('qd'), [self.frontend.pk])
+        self.assertEqual(self.search_ids('zjtd'), [self.frontend.pk])
+        self.assertEqual(self.search_ids('tengxun python'), [self.backend.pk])
+        self.assertEqual(self.search_ids('houduankaifa'), [self.backend.pk])
+        self.assertEqual(self.search_ids('qianduan tengxun'), [])
+
+
+class PinyinUtilsTests(SimpleTestCase):
+    """
+    拼音查询的切分与展开
+    """
+
+    def test_expand_romanized(self):
+        self.assertEqual(split_syllables('qianduankaifa'), ['qian', 'duan', 'kai', 'fa'])
+        self.assertEqual(expand_romanized('qianduankaifa'), ['qianduan', 'duankai', 'kaifa'])
+        self.assertEqual(expand_romanized('qdkf'), ['qd', 'dk', 'kf'])
+        self.assertIsNone(expand_romanized('qian'))
+        self.assertIsNone(expand_romanized('python3'))
+
+
+class RankingTests(JobTestCase):
+    """
+    基于搜索索引的 BM25 排序
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.title_match = create_job(cls.index, job_title='Java开发', description='<p>后端服务</p>')
+        cls.description_match = create_job(cls.index, job_title='测试工程师', description='<p>熟悉Java</p>')
+        cls.other = create_job(cls.index, job_title='产品经理')
+
+    def test_title_match_ranks_first(self):
+        results = RankedJobResults('java', candidates=JobPage.objects.live())
+        self.assertEqual(results.count(), 2)
+        self.assertEqual([job.pk for job in results[0:2]], [self.title_match.pk, self.description_match.pk])
+        self.assertGreater(results[0].search_score, results[1].search_score)
+
+    def test_fresher_job_wins_tie(self):
+        stale = create_job(self.index, job_title='Go开发')
+        JobPage.objects.filter(pk=stale.pk).update(first_published_at=timezone.now() - timedelta(days=365))
+        fresh = create_job(self.index, job_title='Go开发')
+        results = RankedJobResults('go', candidates=JobPage.objects.live())
+        self.assertEqual([job.pk for job in results[0:2]], [fresh.pk, stale.pk])
+
+    def test_candidates_restrict_results(self):
+        candidates = JobPage.objects.live().exclude(pk=self.title_match.pk)
+        results = RankedJobResults('java', candidates=candidates)
+        self.assertEqual([job.pk for job in results[0:10]], [self.description_match.pk])
+
+    def test_overlapping_query_groups(self):
+        # "前"扩展出的二元组包含"前端"，两个查询词都由同一个词项命中
+        frontend = create_job(self.index, job_title='前端开发')
+        results = RankedJobResults('前 前端', candidates=JobPage.objects.live())
+        self.assertEqual([job.pk for job in results[0:10]], [frontend.pk])
+        self.assertEqual(list(search_jobs(JobPage.objects.live(), '前 前端').values_list('pk', flat=True)), [frontend.pk])
+
+    def test_scored_postings_capped_by_impact(self):
+        # 超过上限时只对影响最大的倒排记录打分：标题命中（权重最高）保留，描述命中被截掉
+        with mock.patch('jobs.ranking.MAX_SCORED_POSTINGS', 1):
+            results = RankedJobResults('java', candidates=JobPage.objects.live())
+            self.assertEqual(results.count(), 1)
+            self.assertEqual([job.pk for job in results[0:10]], [self.title_match.pk])
+
+    def test_site_search_lists_ranked_jobs(self):
+        response = self.client.get('/search/', {'query': 'java'})
+        self.assertEqual(
+            [result.pk for result in response.context['search_results']],
+            [self.title_match.pk, self.description_match.pk],
+        )
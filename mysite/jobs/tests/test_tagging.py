@@ -0,0 +1,27 @@
+from django.test import SimpleTestCase
+
+from jobs.tag_utils import FRESH_GRADUATE_MASK, KeywordMatcher, compute_tag_bits, get_major_mask, get_skill_labels
+
+
+class JobTaggingTests(SimpleTestCase):
+    """
+    Aho-Corasick 关键词匹配与职位标签位掩码
+    """
+
+    def test_matcher_finds_overlapping_keywords(self):
+        matcher = KeywordMatcher({'软件': 1, '软件工程': 2, '工程师': 3, '件工': 4, '工程经理': 5})
+        self.assertEqual(matcher.match('高级软件工程师'), {1, 2, 3, 4})
+        self.assertEqual(matcher.match(''), set())
+
+    def test_ascii_keywords_need_word_boundaries(self):
+        matcher = KeywordMatcher({'Java': 'java', 'UI': 'ui', 'C++': 'cpp'})
+        self.assertEqual(matcher.match('熟悉java开发，了解 C++'), {'java', 'cpp'})
+        self.assertEqual(matcher.match('JavaScript build'), set())
+
+    def test_compute_tag_bits(self):
+        bits = compute_tag_bits('Python后端开发', '<p>欢迎2025届应届生，熟悉 MySQL</p>')
+        self.assertTrue(bits & get_major_mask('cs'))
+        self.assertFalse(bits & get_major_mask('finance'))
+        self.assertTrue(bits & FRESH_GRADUATE_MASK)
+        self.assertEqual(get_skill_labels(bits), ['Python', 'SQL'])
+        self.assertEqual(get_major_mask('other'), 0)
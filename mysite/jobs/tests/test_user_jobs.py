@@ -0,0 +1,147 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.utils import timezone
+
+from jobs.listing import get_job_listing, parse_job_filters
+from jobs.models import ApplicationEvent, ApplicationEventDaily, JobApplication, JobPage
+from jobs.user_jobs import get_user_job_ids, get_user_job_stats
+
+from .base import JobTestCase, create_job, use_foreground_event_writer
+
+
+class JobCounterTests(JobTestCase):
+    """
+    JobPage 上冗余保存的收藏数、申请数、查看数
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.job = create_job(cls.index, job_title='前端开发')
+        cls.other = create_job(cls.index, job_title='后端开发')
+        cls.user = get_user_model().objects.create_user('student', password='x')
+
+    def setUp(self):
+        super().setUp()
+        use_foreground_event_writer(self)
+
+    def counts(self, job):
+        return JobPage.objects.values_list('save_count', 'apply_count').get(pk=job.pk)
+
+    def test_counters_follow_application_changes(self):
+        self.client.force_login(self.user)
+        response = self.client.post('/api/toggle-save-job/', {'job_id': self.job.pk}, content_type='application/json')
+        self.assertEqual(response.json()['save_count'], 1)
+        self.assertEqual(self.counts(self.job), (1, 0))
+
+        # 收藏改为申请：收藏数减一、申请数加一
+        application = JobApplication.objects.get(user=self.user, job_page=self.job)
+        application.status = 'applied'
+        application.save()
+        self.assertEqual(self.counts(self.job), (0, 1))
+
+        # 计数因批量操作偏小为 0 时，减一后仍为 0
+        JobPage.objects.filter(pk=self.job.pk).update(apply_count=0)
+        application.status = 'saved'
+        application.save()
+        self.assertEqual(self.counts(self.job), (1, 0))
+
+        # 重新发布职位（修订内容中的计数已过期）不会覆盖计数
+        self.job.save_revision().publish()
+        self.assertEqual(self.counts(self.job), (1, 0))
+
+        JobApplication.objects.create(user=self.user, job_page=self.other, status='viewed')
+        self.user.delete()
+        self.assertEqual(self.counts(self.job), (0, 0))
+        self.assertEqual(self.counts(self.other), (0, 0))
+
+    def test_reconcile_and_popular_sort(self):
+        users = [get_user_model().objects.create_user(f'user{i}', password='x') for i in range(3)]
+        # 批量写入不触发信号，由对账命令修正
+        JobApplication.objects.bulk_create(
+            [JobApplication(user=user, job_page=self.job, status='saved') for user in users]
+            + [JobApplication(user=users[0], job_page=self.other, status='viewed')]
+        )
+        self.assertEqual(self.counts(self.job), (0, 0))
+        call_command('reconcile_job_counters', stdout=StringIO())
+        self.assertEqual(self.counts(self.job), (3, 0))
+        self.assertEqual(self.counts(self.other), (0, 0))
+
+        # 查看数量按原始浏览事件和按天汇总的浏览数重新统计
+        ApplicationEvent.objects.bulk_create(
+            [ApplicationEvent(job_page=self.other, event_type=ApplicationEvent.EVENT_VIEW)] * 2
+            + [ApplicationEvent(job_page=self.other, event_type=ApplicationEvent.EVENT_SAVE)]
+        )
+        ApplicationEventDaily.objects.create(
+            date=timezone.localdate(), job_page=self.other, event_type=ApplicationEvent.EVENT_VIEW, count=5,
+        )
+        call_command('reconcile_job_counters', stdout=StringIO())
+        self.assertEqual(JobPage.objects.get(pk=self.other.pk).view_count, 7)
+        self.assertEqual(JobPage.objects.get(pk=self.job.pk).view_count, 0)
+
+        cache.clear()
+        page, _ = get_job_listing(self.index, parse_job_filters({'sort': 'popular'}))
+        self.assertEqual([job.pk for job in page], [self.job.pk, self.other.pk])
+        page, _ = get_job_listing(self.index, parse_job_filters({}))
+        self.assertEqual([job.pk for job in page], [self.other.pk, self.job.pk])
+
+
+class UserJobStateTests(JobTestCase):
+    """
+    按用户缓存的已收藏、已申请职位集合与申请记录统计
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.jobs = [create_job(cls.index, job_title=f'职位{i}') for i in range(3)]
+        cls.user = get_user_model().objects.create_user('student', password='x')
+
+    def setUp(self):
+        super().setUp()
+        use_foreground_event_writer(self)
+
+    def test_job_ids_cached_and_invalidated_on_toggle(self):
+        JobApplication.objects.create(user=self.user, job_page=self.jobs[0], status='applied')
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user_job_ids(self.user)['applied'], {self.jobs[0].pk})
+        # 缓存命中后逐个职位判断状态不再查询
+        with self.assertNumQueries(0):
+            self.assertEqual([job.is_applied_by_user(self.user) for job in self.jobs], [True, False, False])
+            self.assertFalse(self.jobs[1].is_saved_by_user(self.user))
+
+        self.client.force_login(self.user)
+        self.client.post('/api/toggle-save-job/', {'job_id': self.jobs[1].pk}, content_type='application/json')
+        self.assertEqual(get_user_job_ids(self.user)['saved'], {self.jobs[1].pk})
+        self.client.post('/api/toggle-save-job/', {'job_id': self.jobs[1].pk}, content_type='application/json')
+        self.assertEqual(get_user_job_ids(self.user)['saved'], set())
+
+    def test_listing_context_marks_saved_jobs(self):
+        JobApplication.objects.create(user=self.user, job_page=self.jobs[2], status='saved')
+        request = RequestFactory().get('/')
+        request.user = self.user
+        context = self.index.get_context(request)
+        self.assertEqual(context['saved_job_ids'], {self.jobs[2].pk})
+        self.assertEqual(context['applied_job_ids'], set())
+
+    def test_stats_single_query_and_invalidation(self):
+        JobApplication.objects.create(user=self.user, job_page=self.jobs[0], status='saved')
+        application = JobApplication.objects.create(user=self.user, job_page=self.jobs[1], status='applied')
+        JobApplication.objects.create(user=self.user, job_page=self.jobs[2], status='contacted')
+        with self.assertNumQueries(1):
+            stats = get_user_job_stats(self.user)
+        self.assertEqual((stats.saved_count, stats.applied_count, stats.pending_interview_count), (1, 1, 2))
+        self.assertEqual(stats.competitiveness, 0)
+        # 已发布职位数来自地点统计：3 个职位中收藏和申请了 2 个
+        self.assertEqual(stats.match_rate, 66)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_job_stats(self.user).match_rate, 66)
+
+        application.status = 'accepted'
+        application.save()
+        stats = get_user_job_stats(self.user)
+        self.assertEqual((stats.applied_count, stats.accepted_count, stats.competitiveness), (0, 1, 33))
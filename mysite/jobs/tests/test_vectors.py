@@ -0,0 +1,148 @@
+import shutil
+import tempfile
+from io import StringIO
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+
+from jobs.embeddings import HashingEmbedder
+from jobs.models import StudentProfile
+from jobs.vector_index import build_index, get_vector_index
+
+from .base import JobTestCase, create_job
+
+
+class VectorIndexTests(JobTestCase):
+    """
+    哈希嵌入器与内存映射的 IVF 向量索引
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.index_dir = tempfile.mkdtemp()
+        self.addCleanup(get_vector_index, force_check=True)
+        self.addCleanup(shutil.rmtree, self.index_dir, ignore_errors=True)
+        override = override_settings(JOB_INDEX_DIR=self.index_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_hashing_embedder_is_deterministic(self):
+        vectors = HashingEmbedder(dim=64).embed(['前端开发 React', '前端开发 React', ''])
+        self.assertEqual(vectors.shape, (3, 64))
+        self.assertTrue((vectors[0] == HashingEmbedder(dim=64).embed_one('前端开发 React')).all())
+        self.assertAlmostEqual(float(vectors[0] @ vectors[1]), 1.0, places=5)
+        self.assertFalse(vectors[2].any())
+
+    def test_search_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(500, 32)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        index = build_index(np.arange(1, 501), vectors, nlist=10)
+        for query in vectors[:20]:
+            exact = index.brute_force(query, 5)
+            # 探测全部聚类时结果与暴力扫描一致
+            self.assertEqual(index.search(query, 5, nprobe=10), exact)
+            self.assertEqual(index.search(query, 1, nprobe=2)[0][0], exact[0][0])
+
+    def test_add_and_delete(self):
+        rng = np.random.default_rng(2)
+        vectors = rng.normal(size=(50, 16)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        index = build_index(np.arange(50), vectors, nlist=4)
+        capacity = index.meta['capacity']
+
+        # 新增超过容量时自动扩容；已存在的职位被替换而不是重复
+        extra = rng.normal(size=(capacity, 16)).astype(np.float32)
+        extra /= np.linalg.norm(extra, axis=1, keepdims=True)
+        index.add(np.arange(1000, 1000 + capacity), extra)
+        index.add([3], extra[:1])
+        self.assertGreater(index.meta['capacity'], capacity)
+        self.assertEqual(len(index), 50 + capacity)
+        self.assertCountEqual([job_id for job_id, _ in index.search(extra[0], 2, nprobe=4)], [1000, 3])
+
+        self.assertEqual(index.delete([3, 1000]), 2)
+        self.assertEqual(len(index), 48 + capacity)
+        self.assertNotIn(3, [job_id for job_id, _ in index.brute_force(extra[0], 10)])
+
+    def test_publish_and_unpublish_update_index(self):
+        create_job(self.index, job_title='财务助理', description='<p>会计 报表</p>')
+        call_command('build_job_vectors', stdout=StringIO())
+        index = get_vector_index(force_check=True)
+        query = HashingEmbedder().embed_one('前端开发 React')
+
+        job = create_job(self.index, job_title='前端开发', description='<p>React</p>')
+        self.assertEqual(index.search(query, 1)[0][0], job.pk)
+
+        job.unpublish()
+        self.assertNotIn(job.pk, [job_id for job_id, _ in index.brute_force(query, 5)])
+
+        out = StringIO()
+        call_command('benchmark_job_vectors', '--queries', '5', '--nprobe', '1', '2', stdout=out)
+        self.assertIn('nprobe=2: recall@10 1.000', out.getvalue())
+
+    def test_update_after_rebuild_writes_current_version(self):
+        create_job(self.index, job_title='财务助理', description='<p>会计 报表</p>')
+        call_command('build_job_vectors', stdout=StringIO())
+        stale = get_vector_index(force_check=True)
+        # 其他进程重建索引，本进程的缓存在 RELOAD_INTERVAL 内仍指向旧版本
+        call_command('build_job_vectors', stdout=StringIO())
+        self.assertIs(get_vector_index(), stale)
+
+        job = create_job(self.index, job_title='前端开发', description='<p>React</p>')
+        current = get_vector_index()
+        self.assertIsNot(current, stale)
+        self.assertIn(job.pk, current.iter_vectors()[0].tolist())
+
+
+class ResumeMatchApiTests(JobTestCase):
+    """
+    按简历文本匹配职位的接口
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.frontend = create_job(cls.index, job_title='前端开发', description='<p>React 组件开发，熟悉 TypeScript</p>')
+        cls.backend = create_job(cls.index, job_title='后端开发', description='<p>Python Django 接口开发</p>')
+        cls.finance = create_job(cls.index, job_title='财务助理', description='<p>会计报表</p>')
+        cls.user = get_user_model().objects.create_user('student', password='x')
+        cls.profile = StudentProfile.objects.create(
+            user=cls.user, resume_text='熟悉 React 和 TypeScript，做过前端组件库',
+        )
+
+    def get_matches(self):
+        return self.client.get('/api/resume-matches/').json()
+
+    def test_requires_login(self):
+        self.assertEqual(self.client.get('/api/resume-matches/').status_code, 401)
+
+    def test_matches_are_cached_until_resume_or_jobs_change(self):
+        self.client.force_login(self.user)
+        data = self.get_matches()
+        self.assertEqual(data['source'], 'search')
+        self.assertEqual(data['results'][0]['id'], self.frontend.pk)
+        self.assertNotIn(self.finance.pk, [item['id'] for item in data['results']])
+        self.assertIn('react', data['results'][0]['matched_terms'])
+        self.assertEqual(data['results'][0]['matched_skills'], ['JavaScript', 'React'])
+
+        # 重复访问命中缓存，不重新打分（会话、用户、档案、加载职位、站点）
+        with self.assertNumQueries(5):
+            self.assertEqual(self.get_matches(), data)
+
+        self.profile.resume_text = '熟悉 Python 和 Django'
+        self.profile.save()
+        self.assertEqual(self.get_matches()['results'][0]['id'], self.backend.pk)
+
+    def test_uses_vector_index_when_built(self):
+        index_dir = tempfile.mkdtemp()
+        self.addCleanup(get_vector_index, force_check=True)
+        self.addCleanup(shutil.rmtree, index_dir, ignore_errors=True)
+        with override_settings(JOB_INDEX_DIR=index_dir):
+            call_command('build_job_vectors', stdout=StringIO())
+            get_vector_index(force_check=True)
+            self.client.force_login(self.user)
+            data = self.get_matches()
+        self.assertEqual(data['source'], 'vector')
+        self.assertEqual(data['results'][0]['id'], self.frontend.pk)
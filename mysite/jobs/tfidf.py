@@ -0,0 +1,238 @@
+"""
+职位文本 TF-IDF 索引模块
+对职位名称 + 职位描述构建 TF-IDF 稀疏矩阵（职位 × 词项），离线构建后保存到磁盘；
+查询时把文本转换为稀疏向量，用一次稀疏矩阵-向量乘法得到所有职位的余弦相似度，再取前 k 个
+
+- 词项与搜索索引一致：中文相邻二元组（字符 n-gram）、英文数字单词；职位名称的词频按 TITLE_WEIGHT 加权
+- 词频使用 1 + log(tf)，idf 使用平滑形式 log((1 + N) / (1 + df)) + 1，每行做 L2 归一化
+- 矩阵按列压缩（CSC）保存，查询时只取查询词对应的列，代价与查询词数和这些词的文档数成正比
+
+文件布局（JOB_INDEX_DIR/tfidf/）：
+    CURRENT            当前版本目录名（原子替换，构建过程中读取方不受影响）
+    <版本>/matrix.npz   TF-IDF 矩阵（CSC）
+    <版本>/job_ids.npy  每行对应的职位ID（升序）
+    <版本>/idf.npy      每列的 idf
+    <版本>/vocabulary.json  词项列表（按列顺序）
+    <版本>/meta.json    构建时间、文档数、词项数
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from django.utils.html import strip_tags
+from scipy import sparse
+
+from .search_index import tokenize
+
+# 职位名称词频的权重（名称比描述更能代表职位）
+TITLE_WEIGHT = 2
+
+# 词项至少出现在多少个职位中才保留
+MIN_DF = 1
+
+# 保留的历史版本数量（包括当前版本）
+KEEP_VERSIONS = 2
+
+# 进程内检查索引文件是否更新的间隔（秒）
+RELOAD_INTERVAL = 30
+
+
+def get_index_dir():
+    return Path(getattr(settings, 'JOB_INDEX_DIR', Path(settings.BASE_DIR) / 'data' / 'job_index')) / 'tfidf'
+
+
+def get_job_terms(title, description):
+    """职位的词频：职位名称加权 + 描述"""
+    counts = Counter(tokenize(strip_tags(description or '')))
+    for term, frequency in Counter(tokenize(title or '')).items():
+        counts[term] += frequency * TITLE_WEIGHT
+    return counts
+
+
+def iter_job_documents(chunk_size=2000):
+    """按主键分批读取已发布职位的 (职位ID, 职位名称, 描述)"""
+    from .models import JobPage
+
+    last_pk = 0
+    while True:
+        rows = list(
+            JobPage.objects.live()
+            .filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', 'job_title', 'description')[:chunk_size]
+        )
+        if not rows:
+            break
+        yield from rows
+        last_pk = rows[-1][0]
+
+
+def build_matrix(documents, min_df=MIN_DF):
+    """
+    由 (职位ID, 职位名称, 描述) 序列构建 TF-IDF 矩阵
+
+    返回: (CSC 矩阵, 职位ID数组, idf 数组, 词项列表)
+    """
+    vocabulary = {}
+    job_ids = []
+    indptr = [0]
+    indices = []
+    counts = []
+    doc_freq = []
+
+    for job_id, title, description in documents:
+        terms = get_job_terms(title, description)
+        for term, frequency in terms.items():
+            column = vocabulary.get(term)
+            if column is None:
+                column = vocabulary[term] = len(vocabulary)
+                doc_freq.append(0)
+            doc_freq[column] += 1
+            indices.append(column)
+            counts.append(frequency)
+        indptr.append(len(indices))
+        job_ids.append(job_id)
+
+    doc_count = len(job_ids)
+    matrix = sparse.csr_matrix(
+        (np.asarray(counts, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(doc_count, len(vocabulary)),
+    )
+    doc_freq = np.asarray(doc_freq, dtype=np.float32)
+
+    # 去掉出现次数过少的词项
+    keep = np.flatnonzero(doc_freq >= min_df)
+    terms = [None] * len(vocabulary)
+    for term, column in vocabulary.items():
+        terms[column] = term
+    terms = [terms[column] for column in keep]
+    matrix = matrix[:, keep]
+    doc_freq = doc_freq[keep]
+
+    idf = (np.log((1 + doc_count) / (1 + doc_freq)) + 1).astype(np.float32)
+
+    # 次线性词频 * idf，再按行 L2 归一化
+    matrix.data = 1 + np.log(matrix.data)
+    matrix = matrix.multiply(idf).tocsr()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    matrix = sparse.diags(1 / norms).dot(matrix)
+
+    return matrix.tocsc().astype(np.float32), np.asarray(job_ids, dtype=np.int64), idf, terms
+
+
+def save_index(matrix, job_ids, idf, terms, index_dir=None):
+    """写入新版本目录，再原子替换 CURRENT 指针，并清理旧版本"""
+    index_dir = Path(index_dir or get_index_dir())
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    version = f'{time.strftime("%Y%m%d%H%M%S")}-{os.getpid()}'
+    version_dir = index_dir / version
+    version_dir.mkdir()
+    sparse.save_npz(version_dir / 'matrix.npz', matrix)
+    np.save(version_dir / 'job_ids.npy', job_ids)
+    np.save(version_dir / 'idf.npy', idf)
+    (version_dir / 'vocabulary.json').write_text(json.dumps(terms, ensure_ascii=False), encoding='utf-8')
+    (version_dir / 'meta.json').write_text(json.dumps({
+        'built_at': timezone.now().isoformat(),
+        'doc_count': int(matrix.shape[0]),
+        'term_count': int(matrix.shape[1]),
+    }), encoding='utf-8')
+
+    pointer = index_dir / f'CURRENT.{os.getpid()}'
+    pointer.write_text(version, encoding='utf-8')
+    os.replace(pointer, index_dir / 'CURRENT')
+
+    versions = sorted(path for path in index_dir.iterdir() if path.is_dir())
+    for old in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(old, ignore_errors=True)
+    return version_dir
+
+
+def build_tfidf_index(chunk_size=2000, min_df=MIN_DF, index_dir=None):
+    """从数据库构建并保存 TF-IDF 索引，返回 (文档数, 词项数)"""
+    matrix, job_ids, idf, terms = build_matrix(iter_job_documents(chunk_size), min_df=min_df)
+    save_index(matrix, job_ids, idf, terms, index_dir=index_dir)
+    return matrix.shape
+
+
+class TfidfIndex:
+    """已加载的 TF-IDF 索引"""
+
+    def __init__(self, matrix, job_ids, idf, terms, built_at=None):
+        self.matrix = matrix
+        self.job_ids = job_ids
+        self.idf = idf
+        self.vocabulary = {term: column for column, term in enumerate(terms)}
+        self.built_at = built_at
+
+    @classmethod
+    def load(cls, version_dir):
+        version_dir = Path(version_dir)
+        meta = json.loads((version_dir / 'meta.json').read_text(encoding='utf-8'))
+        return cls(
+            sparse.load_npz(version_dir / 'matrix.npz').tocsc(),
+            np.load(version_dir / 'job_ids.npy'),
+            np.load(version_dir / 'idf.npy'),
+            json.loads((version_dir / 'vocabulary.json').read_text(encoding='utf-8')),
+            built_at=datetime.fromisoformat(meta['built_at']),
+        )
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def vectorize(self, text):
+        """将查询文本转换为 (列号数组, 归一化权重数组)；没有已知词项时返回空数组"""
+        counts = Counter(term for term in tokenize(text or '') if term in self.vocabulary)
+        if not counts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        columns = np.fromiter((self.vocabulary[term] for term in counts), dtype=np.int64, count=len(counts))
+        weights = (1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))) * self.idf[columns]
+        return columns, weights / np.linalg.norm(weights)
+
+    def similarities(self, text):
+        """查询文本与所有职位的余弦相似度（与 job_ids 对齐的稠密数组）"""
+        columns, weights = self.vectorize(text)
+        if not len(columns):
+            return np.zeros(len(self), dtype=np.float32)
+        return self.matrix[:, columns].dot(weights)
+
+    def top_k(self, text, k):
+        """返回相似度最高的前 k 个 [(职位ID, 相似度)]，只包含相似度大于 0 的职位"""
+        scores = self.similarities(text)
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        matched = matched[np.lexsort((-self.job_ids[matched], -scores[matched]))]
+        return [(int(self.job_ids[row]), float(scores[row])) for row in matched]
+
+
+_cache = {'version': None, 'index': None, 'checked_at': 0.0}
+_cache_lock = threading.Lock()
+
+
+def get_tfidf_index(force_check=False):
+    """获取当前进程加载的索引；索引文件更新后自动重新加载，没有索引时返回 None"""
+    now = time.monotonic()
+    if not force_check and _cache['checked_at'] and now - _cache['checked_at'] < RELOAD_INTERVAL:
+        return _cache['index']
+
+    with _cache_lock:
+        _cache['checked_at'] = now
+        index_dir = get_index_dir()
+        try:
+            version = (index_dir / 'CURRENT').read_text(encoding='utf-8').strip()
+        except FileNotFoundError:
+            _cache.update(version=None, index=None)
+            return None
+        if version != _cache['version']:
+            _cache.update(version=version, index=TfidfIndex.load(index_dir / version))
+        return _cache['index']
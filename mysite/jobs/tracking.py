@@ -0,0 +1,89 @@
+"""
+推荐曝光/点击追踪
+推荐页面展示推荐列表时上报曝光、用户点击推荐职位时上报点击，记录 (用户, 职位, 排名, 算法版本)；
+数据先放入进程内缓冲区，由后台线程批量写入 RecommendationEvent（见 buffered_writes），
+请求中不写数据库。按算法版本、排名统计点击率（CTR），用于评估推荐效果
+"""
+from django.conf import settings
+from django.db.models import Count, Q
+
+from .buffered_writes import BufferedWriter
+
+# 每次请求最多接受的事件数量
+MAX_EVENTS_PER_REQUEST = 100
+
+
+def _drop_missing_jobs(events):
+    """写入前去掉职位已被删除的事件（外键约束）"""
+    from .models import JobPage
+
+    existing = set(JobPage.objects.filter(pk__in={event.job_page_id for event in events}).values_list('pk', flat=True))
+    return [event for event in events if event.job_page_id in existing]
+
+
+def create_event_writer(background=True):
+    from .models import RecommendationEvent
+
+    return BufferedWriter(
+        RecommendationEvent,
+        flush_size=getattr(settings, 'RECOMMENDATION_EVENT_FLUSH_SIZE', 200),
+        flush_interval=getattr(settings, 'RECOMMENDATION_EVENT_FLUSH_INTERVAL', 5.0),
+        prepare=_drop_missing_jobs,
+        background=background,
+    )
+
+
+_writer = None
+
+
+def get_event_writer():
+    global _writer
+    if _writer is None:
+        _writer = create_event_writer()
+    return _writer
+
+
+def track_events(user, events):
+    """
+    记录曝光/点击事件（只放入缓冲区）
+
+    events: [{'job_id', 'event_type', 'rank', 'algorithm'}]（已校验）
+    """
+    from .models import RecommendationEvent
+
+    get_event_writer().add([
+        RecommendationEvent(
+            user_id=user.pk,
+            job_page_id=event['job_id'],
+            event_type=event['event_type'],
+            rank=event['rank'],
+            algorithm=event['algorithm'],
+        )
+        for event in events
+    ])
+
+
+def get_ctr_stats(since=None, by_rank=False):
+    """
+    按算法版本（可选再按排名）统计曝光数、点击数和点击率
+
+    返回: [{'algorithm', ('rank',) 'impressions', 'clicks', 'ctr'}]
+    """
+    from .models import RecommendationEvent
+
+    events = RecommendationEvent.objects.all()
+    if since is not None:
+        events = events.filter(created_at__gte=since)
+    group_by = ['algorithm', 'rank'] if by_rank else ['algorithm']
+    rows = (
+        events.values(*group_by)
+        .annotate(
+            impressions=Count('pk', filter=Q(event_type=RecommendationEvent.EVENT_IMPRESSION)),
+            clicks=Count('pk', filter=Q(event_type=RecommendationEvent.EVENT_CLICK)),
+        )
+        .order_by(*group_by)
+    )
+    return [
+        {**row, 'ctr': row['clicks'] / row['impressions'] if row['impressions'] else None}
+        for row in rows
+    ]
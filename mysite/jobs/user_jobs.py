@@ -0,0 +1,131 @@
+"""
+用户职位状态模块
+- 一次查询读取用户收藏、申请过的全部职位ID，职位列表、首页、详情页通过 saved_job_ids / applied_job_ids
+  集合判断每个职位的状态，不再逐个职位查询 JobApplication
+- 一次条件聚合查询统计用户各状态的记录数（UserJobStats），供工作台和个人中心使用
+
+两者都按用户缓存，收藏、申请记录保存或删除时（见 signals.py）删除该用户的缓存
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+USER_JOB_CACHE_TIMEOUT = 60 * 30
+
+EMPTY_JOB_IDS = {'saved': frozenset(), 'applied': frozenset()}
+
+# 没有任何申请记录时个人中心显示的竞争力
+DEFAULT_COMPETITIVENESS = 92
+
+
+def _job_ids_cache_key(user_id):
+    return f'jobs:user_job_ids:{user_id}'
+
+
+def _stats_cache_key(user_id):
+    return f'jobs:user_job_stats:{user_id}'
+
+
+def get_user_job_ids(user):
+    """
+    用户收藏、申请过的职位ID（带缓存）
+
+    返回: {'saved': frozenset, 'applied': frozenset}；未登录用户返回空集合
+    """
+    from .models import JobApplication
+
+    if not user.is_authenticated:
+        return EMPTY_JOB_IDS
+    key = _job_ids_cache_key(user.pk)
+    job_ids = cache.get(key)
+    if job_ids is not None:
+        return job_ids
+
+    saved = set()
+    applied = set()
+    rows = JobApplication.objects.filter(user=user, status__in=['saved', 'applied']).values_list(
+        'job_page_id', 'status',
+    )
+    for job_id, status in rows:
+        (saved if status == 'saved' else applied).add(job_id)
+    job_ids = {'saved': frozenset(saved), 'applied': frozenset(applied)}
+    cache.set(key, job_ids, USER_JOB_CACHE_TIMEOUT)
+    return job_ids
+
+
+class UserJobStats:
+    """
+    用户的申请记录统计
+
+    counts: {状态: 记录数}，total 为全部记录数；匹配度依赖的已发布职位总数在读取时获取（不随用户缓存）
+    """
+
+    def __init__(self, counts, total):
+        self.counts = counts
+        self.total = total
+
+    @property
+    def saved_count(self):
+        return self.counts.get('saved', 0)
+
+    @property
+    def applied_count(self):
+        return self.counts.get('applied', 0)
+
+    @property
+    def accepted_count(self):
+        return self.counts.get('accepted', 0)
+
+    @property
+    def pending_interview_count(self):
+        """待面试：已申请或已联系"""
+        return self.applied_count + self.counts.get('contacted', 0)
+
+    @property
+    def competitiveness(self):
+        """平均竞争力（简单算法：基于申请成功率）"""
+        if not self.total:
+            return DEFAULT_COMPETITIVENESS
+        return int(self.accepted_count / self.total * 100)
+
+    @property
+    def match_rate(self):
+        """匹配度（简单算法：收藏和申请数占已发布职位数的比例）"""
+        from .location_utils import get_live_job_count
+
+        total_jobs = get_live_job_count()
+        if not total_jobs:
+            return 0
+        return min(100, int((self.saved_count + self.applied_count) / total_jobs * 100))
+
+
+def get_user_job_stats(user):
+    """用户的申请记录统计（一次条件聚合查询，带缓存）"""
+    from django.db.models import Count, Q
+    from .models import JobApplication
+
+    key = _stats_cache_key(user.pk)
+    stats = cache.get(key)
+    if stats is not None:
+        return stats
+
+    aggregates = {
+        status: Count('id', filter=Q(status=status)) for status, _ in JobApplication.STATUS_CHOICES
+    }
+    counts = JobApplication.objects.filter(user=user).aggregate(total=Count('id'), **aggregates)
+    total = counts.pop('total')
+    stats = UserJobStats({status: count for status, count in counts.items() if count}, total)
+    cache.set(key, stats, USER_JOB_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_user_job_cache(user_id):
+    """删除用户的缓存；事务提交后再删除一次，避免提交前有请求读到旧数据并重新写入缓存"""
+    keys = [_job_ids_cache_key(user_id), _stats_cache_key(user_id)]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def get_user_job_context(user):
+    """模板上下文：saved_job_ids、applied_job_ids"""
+    job_ids = get_user_job_ids(user)
+    return {'saved_job_ids': job_ids['saved'], 'applied_job_ids': job_ids['applied']}
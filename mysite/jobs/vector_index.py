@@ -0,0 +1,425 @@
+"""
+本地向量索引（IVF 倒排文件近似最近邻）
+只用 CPU 和 NumPy，不依赖外部服务；数据保存为内存映射（memmap）的 NumPy 文件，多个进程共享同一份数据
+
+结构：
+- 用球面 k-means 把向量聚成 nlist 个簇（centroids），构建时按簇排序，同簇向量在文件中连续（offsets 记录各簇区间）
+- 查询时先找与查询向量最接近的 nprobe 个簇，只在这些簇内计算内积
+- 构建之后新增的向量追加在文件末尾（"尾部区"，记录所属簇），查询时一并扫描；重新构建时合并
+- 删除只做标记（职位ID置为 -1），重新构建时清理
+
+文件布局（JOB_INDEX_DIR/ann/）：
+    CURRENT               当前版本目录名
+    <版本>/meta.json       维度、簇数、容量、基础区数量、总数量、嵌入器
+    <版本>/centroids.npy   簇中心 (nlist, dim)
+    <版本>/offsets.npy     基础区各簇的起止位置 (nlist + 1,)
+    <版本>/vectors.f32     向量 (capacity, dim)
+    <版本>/ids.i64         职位ID (capacity,)，已删除为 -1
+    <版本>/lists.i32       所属簇 (capacity,)
+"""
+import contextlib
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows 下没有 fcntl，写入时不加文件锁
+    fcntl = None
+
+# 默认每次查询探测的簇数量
+DEFAULT_NPROBE = 8
+
+# k-means 训练参数
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_SIZE = 20000
+
+# 容量不足时的扩容倍数
+GROWTH_FACTOR = 2
+
+# 保留的历史版本数量（包括当前版本）
+KEEP_VERSIONS = 2
+
+
+def get_index_dir():
+    return Path(getattr(settings, 'JOB_INDEX_DIR', Path(settings.BASE_DIR) / 'data' / 'job_index')) / 'ann'
+
+
+def default_nlist(count):
+    """簇数量取 sqrt(N)，限制在 1~1024 之间"""
+    return int(min(1024, max(1, round(np.sqrt(count)))))
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def train_centroids(vectors, nlist, iterations=KMEANS_ITERATIONS, seed=0):
+    """球面 k-means：返回 (nlist, dim) 的归一化簇中心"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > KMEANS_SAMPLE_SIZE:
+        vectors = vectors[rng.choice(len(vectors), KMEANS_SAMPLE_SIZE, replace=False)]
+    nlist = min(nlist, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        empty = np.flatnonzero(~sums.any(axis=1))
+        if len(empty):
+            # 空簇重新随机选一个点作为中心
+            sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        centroids = _normalize(sums)
+    return centroids.astype(np.float32)
+
+
+def _write_json(path, data):
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(data), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def _create_memmaps(version_dir, capacity, dim):
+    vectors = np.memmap(version_dir / 'vectors.f32', dtype=np.float32, mode='w+', shape=(capacity, dim))
+    ids = np.memmap(version_dir / 'ids.i64', dtype=np.int64, mode='w+', shape=(capacity,))
+    lists = np.memmap(version_dir / 'lists.i32', dtype=np.int32, mode='w+', shape=(capacity,))
+    ids[:] = -1
+    return vectors, ids, lists
+
+
+@contextlib.contextmanager
+def _index_lock(index_dir=None):
+    """索引目录的跨进程锁：切换 CURRENT 与增量写入互斥，保证写入总是落在当前版本"""
+    with open(Path(index_dir or get_index_dir()) / '.lock', 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def build_index(job_ids, vectors, nlist=None, embedder_name='', index_dir=None):
+    """
+    构建新版本的索引并切换为当前版本
+
+    job_ids: (N,) 职位ID；vectors: (N, dim) 已归一化的向量
+    """
+    index_dir = Path(index_dir or get_index_dir())
+    index_dir.mkdir(parents=True, exist_ok=True)
+    job_ids = np.asarray(job_ids, dtype=np.int64)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    count, dim = vectors.shape
+
+    nlist = nlist or default_nlist(count)
+    if count:
+        centroids = train_centroids(vectors, nlist)
+        assignments = np.argmax(vectors @ centroids.T, axis=1).astype(np.int32)
+    else:
+        centroids = np.zeros((1, dim), dtype=np.float32)
+        assignments = np.zeros(0, dtype=np.int32)
+    nlist = len(centroids)
+
+    # 按簇排序，使同簇向量连续存放
+    order = np.argsort(assignments, kind='stable')
+    offsets = np.searchsorted(assignments[order], np.arange(nlist + 1)).astype(np.int64)
+
+    # 精确到微秒，同一秒内连续重建不会重名
+    version = f'{datetime.now():%Y%m%d%H%M%S%f}-{os.getpid()}'
+    version_dir = index_dir / version
+    version_dir.mkdir()
+    capacity = max(1024, int(count * 1.25))
+    stored_vectors, stored_ids, stored_lists = _create_memmaps(version_dir, capacity, dim)
+    stored_vectors[:count] = vectors[order]
+    stored_ids[:count] = job_ids[order]
+    stored_lists[:count] = assignments[order]
+    for array in (stored_vectors, stored_ids, stored_lists):
+        array.flush()
+    np.save(version_dir / 'centroids.npy', centroids)
+    np.save(version_dir / 'offsets.npy', offsets)
+    _write_json(version_dir / 'meta.json', {
+        'dim': int(dim),
+        'nlist': int(nlist),
+        'capacity': int(capacity),
+        'base_count': int(count),
+        'count': int(count),
+        'embedder': embedder_name,
+    })
+
+    pointer = index_dir / f'CURRENT.{os.getpid()}'
+    pointer.write_text(version, encoding='utf-8')
+    with _index_lock(index_dir):
+        os.replace(pointer, index_dir / 'CURRENT')
+    versions = sorted(path for path in index_dir.iterdir() if path.is_dir())
+    for old in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(old, ignore_errors=True)
+    return VectorIndex(version_dir)
+
+
+class VectorIndex:
+    """一个版本的向量索引；读取时按 meta.json 的变化自动重新映射文件"""
+
+    def __init__(self, version_dir):
+        self.version_dir = Path(version_dir)
+        self.centroids = np.load(self.version_dir / 'centroids.npy')
+        self.offsets = np.load(self.version_dir / 'offsets.npy')
+        self._meta_mtime = None
+        self._lock = threading.Lock()
+        self._refresh()
+
+    # 文件映射
+
+    def _refresh(self):
+        """meta.json 变化时（其他进程新增或扩容）重新读取元数据并映射文件"""
+        meta_path = self.version_dir / 'meta.json'
+        mtime = meta_path.stat().st_mtime_ns
+        if mtime == self._meta_mtime:
+            return
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        if self._meta_mtime is None or meta['capacity'] != self.meta['capacity']:
+            shape = (meta['capacity'], meta['dim'])
+            self.vectors = np.memmap(self.version_dir / 'vectors.f32', dtype=np.float32, mode='r+', shape=shape)
+            self.ids = np.memmap(self.version_dir / 'ids.i64', dtype=np.int64, mode='r+', shape=shape[:1])
+            self.lists = np.memmap(self.version_dir / 'lists.i32', dtype=np.int32, mode='r+', shape=shape[:1])
+        self.meta = meta
+        self._meta_mtime = mtime
+
+    @contextlib.contextmanager
+    def _write_lock(self):
+        """跨进程写锁（同一时间只允许一个进程写入）"""
+        with self._lock, open(self.version_dir / '.lock', 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @property
+    def dim(self):
+        return self.meta['dim']
+
+    @property
+    def embedder_name(self):
+        return self.meta.get('embedder', '')
+
+    def __len__(self):
+        self._refresh()
+        return int(np.count_nonzero(self.ids[:self.meta['count']] >= 0))
+
+    # 写入
+
+    def _grow(self, required):
+        """扩容：复制到更大的新文件后原子替换"""
+        capacity = self.meta['capacity']
+        while capacity < required:
+            capacity *= GROWTH_FACTOR
+        count, dim = self.meta['count'], self.meta['dim']
+        for name, dtype, shape, fill in (
+            ('vectors.f32', np.float32, (capacity, dim), 0),
+            ('ids.i64', np.int64, (capacity,), -1),
+            ('lists.i32', np.int32, (capacity,), 0),
+        ):
+            tmp = self.version_dir / f'{name}.{os.getpid()}.tmp'
+            grown = np.memmap(tmp, dtype=dtype, mode='w+', shape=shape)
+            grown[:] = fill
+            grown[:count] = getattr(self, name.split('.')[0])[:count]
+            grown.flush()
+            del grown
+            os.replace(tmp, self.version_dir / name)
+        self.meta['capacity'] = capacity
+        _write_json(self.version_dir / 'meta.json', self.meta)
+        self._meta_mtime = None
+        self._refresh()
+
+    def _tombstone(self, job_ids):
+        count = self.meta['count']
+        slots = np.flatnonzero(np.isin(self.ids[:count], job_ids))
+        if len(slots):
+            self.ids[slots] = -1
+            self.ids.flush()
+        return len(slots)
+
+    def add(self, job_ids, vectors):
+        """新增或更新向量（已存在的职位先删除再追加到尾部区）"""
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(job_ids), -1)
+        if not len(job_ids):
+            return
+        with self._write_lock():
+            self._tombstone(job_ids)
+            count = self.meta['count']
+            if count + len(job_ids) > self.meta['capacity']:
+                self._grow(count + len(job_ids))
+            end = count + len(job_ids)
+            self.vectors[count:end] = vectors
+            self.lists[count:end] = np.argmax(vectors @ self.centroids.T, axis=1)
+            self.ids[count:end] = job_ids
+            for array in (self.vectors, self.lists, self.ids):
+                array.flush()
+            self.meta['count'] = end
+            _write_json(self.version_dir / 'meta.json', self.meta)
+
+    def delete(self, job_ids):
+        """删除向量（标记删除），返回删除的数量"""
+        with self._write_lock():
+            return self._tombstone(np.asarray(job_ids, dtype=np.int64))
+
+    # 查询
+
+    def _top_k(self, slots, vector, k):
+        slots = slots[self.ids[slots] >= 0]
+        if not len(slots):
+            return []
+        scores = self.vectors[slots] @ vector
+        if len(slots) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+            slots, scores = slots[best], scores[best]
+        order = np.argsort(-scores, kind='stable')
+        return [(int(self.ids[slots[i]]), float(scores[i])) for i in order]
+
+    def search(self, vector, k=10, nprobe=DEFAULT_NPROBE):
+        """近似最近邻：返回内积（余弦相似度）最高的前 k 个 [(职位ID, 相似度)]"""
+        self._refresh()
+        vector = np.asarray(vector, dtype=np.float32)
+        nprobe = min(nprobe, len(self.centroids))
+        centroid_scores = self.centroids @ vector
+        probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+        base_count, count = self.meta['base_count'], self.meta['count']
+        ranges = [np.arange(self.offsets[probe], self.offsets[probe + 1]) for probe in probes]
+        tail = np.arange(base_count, count)
+        ranges.append(tail[np.isin(self.lists[base_count:count], probes)])
+        return self._top_k(np.concatenate(ranges), vector, k)
+
+    def brute_force(self, vector, k=10):
+        """精确检索（扫描全部向量），用于评估召回率"""
+        self._refresh()
+        return self._top_k(np.arange(self.meta['count']), np.asarray(vector, dtype=np.float32), k)
+
+    def iter_vectors(self):
+        """已存储的 (职位ID, 向量)（不含已删除）"""
+        self._refresh()
+        count = self.meta['count']
+        live = np.flatnonzero(self.ids[:count] >= 0)
+        return self.ids[live], self.vectors[live]
+
+
+def build_job_vectors(chunk_size=2000, nlist=None, embedder=None, index_dir=None):
+    """
+    从数据库读取已发布职位，向量化后构建索引，返回索引
+
+    构建期间发布、下线的职位在切换版本后补写到新版本（切换之后的变化由 update_job 直接写入新版本）
+    """
+    from django.utils import timezone
+    from .embeddings import get_embedder, get_job_text
+    from .models import JobPage
+    from .tfidf import iter_job_documents
+
+    embedder = embedder or get_embedder()
+    started_at = timezone.now()
+    job_ids = []
+    chunks = []
+    batch = []
+    for job_id, title, description in iter_job_documents(chunk_size):
+        job_ids.append(job_id)
+        batch.append(get_job_text(title, description))
+        if len(batch) >= chunk_size:
+            chunks.append(embedder.embed(batch))
+            batch = []
+    if batch:
+        chunks.append(embedder.embed(batch))
+    vectors = np.vstack(chunks) if chunks else np.zeros((0, embedder.dim), dtype=np.float32)
+    index = build_index(
+        job_ids, vectors, nlist=nlist,
+        embedder_name=get_embedder_name(embedder), index_dir=index_dir,
+    )
+
+    stored_ids, _ = index.iter_vectors()
+    live_ids = set(JobPage.objects.live().values_list('pk', flat=True))
+    index.delete([job_id for job_id in stored_ids.tolist() if job_id not in live_ids])
+    published = list(
+        JobPage.objects.live().filter(last_published_at__gte=started_at).values_list('pk', 'job_title', 'description')
+    )
+    if published:
+        index.add(
+            [job_id for job_id, _, _ in published],
+            embedder.embed([get_job_text(title, description) for _, title, description in published]),
+        )
+    return index
+
+
+def get_embedder_name(embedder):
+    """嵌入器标识（类路径 + 维度），索引与嵌入器不一致时不接受增量写入"""
+    return f'{type(embedder).__module__}.{type(embedder).__qualname__}:{embedder.dim}'
+
+
+def update_job(job):
+    """
+    职位发布或修改后更新向量（已下线则删除）；没有构建索引或嵌入器与索引不一致时跳过
+
+    持有目录锁时重新读取 CURRENT，刚完成的重建即使还没被进程内缓存发现，也写入新版本
+    """
+    from .embeddings import get_embedder, get_job_text
+
+    if not get_index_dir().exists():
+        return
+    with _index_lock():
+        index = get_vector_index(force_check=True)
+        if index is None:
+            return
+        if not job.live:
+            index.delete([job.pk])
+            return
+        embedder = get_embedder()
+        if get_embedder_name(embedder) != index.embedder_name:
+            return
+        index.add([job.pk], embedder.embed([get_job_text(job.job_title, job.description)]))
+
+
+def remove_job(job):
+    """职位删除后移除向量"""
+    if not get_index_dir().exists():
+        return
+    with _index_lock():
+        index = get_vector_index(force_check=True)
+        if index is not None:
+            index.delete([job.pk])
+
+
+_cache = {'version': None, 'index': None, 'checked_at': 0.0}
+_cache_lock = threading.Lock()
+
+# 进程内检查是否有新版本的间隔（秒）
+RELOAD_INTERVAL = 30
+
+
+def get_vector_index(force_check=False):
+    """获取当前版本的索引（进程内缓存）；没有构建过索引时返回 None"""
+    now = time.monotonic()
+    if not force_check and _cache['checked_at'] and now - _cache['checked_at'] < RELOAD_INTERVAL:
+        return _cache['index']
+
+    with _cache_lock:
+        _cache['checked_at'] = now
+        index_dir = get_index_dir()
+        try:
+            version = (index_dir / 'CURRENT').read_text(encoding='utf-8').strip()
+        except FileNotFoundError:
+            _cache.update(version=None, index=None)
+            return None
+        if version != _cache['version']:
+            _cache.update(version=version, index=VectorIndex(index_dir / version))
+        return _cache['index']
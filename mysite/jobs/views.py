@@ -7,7 +7,10 @@ from django.utils import timezone
 from wagtail.models import Page
 from .models import JobPage, StudentProfile, JobApplication
 from .forms import CustomSignupForm
-from .location_utils import extract_provinces_from_jobs, extract_cities_from_jobs, extract_districts_from_jobs
+from django.views.decorators.http import etag
+from .location_utils import get_location_tree, get_province_counts, get_city_counts, get_district_counts
+from .recommend import RECOMMENDATION_ALGORITHM, get_user_recommendations
+from .user_jobs import get_user_job_context, get_user_job_stats
 
 @login_required
 def personalized_recommendations(request):
@@ -22,64 +25,14 @@ def personalized_recommendations(request):
         from django.shortcuts import redirect
         return redirect('complete_profile')
     
-    # 基础查询：所有已发布的职位 - 直接使用 JobPage.objects 确保可以过滤 JobPage 字段
-    all_jobs = JobPage.objects.live()
-    
-    # 规则1：按偏好职位类型筛选
-    preferred_types = profile.get_preferred_job_types_list()
-    if preferred_types:
-        type_filter = Q(job_type__in=preferred_types)
-        type_jobs = all_jobs.filter(type_filter)
-    else:
-        type_jobs = all_jobs
-    
-    # 规则2：按偏好地点筛选（简单文本匹配）
-    preferred_locations = [loc.strip() for loc in profile.preferred_locations.split(',') if loc.strip()]
-    location_jobs = type_jobs
-    if preferred_locations:
-        # 构建地点查询：多个地点OR条件
-        location_query = Q()
-        for location in preferred_locations:
-            location_query |= Q(location__icontains=location)
-        location_jobs = type_jobs.filter(location_query)
-    
-    # 规则3：按专业匹配（从职位描述中匹配专业关键词）
-    major_keywords = {
-        'cs': ['计算机', '软件', '编程', '算法', '后端', '前端', '开发'],
-        'se': ['软件工程', '测试', '运维', 'DevOps'],
-        'ee': ['电子', '硬件', '电路', '嵌入式'],
-        'business': ['商业', '市场', '营销', '管理'],
-        'finance': ['金融', '财务', '会计', '投资'],
-        'design': ['设计', 'UI', 'UX', '视觉', '平面']
-    }
-    
-    major_jobs = location_jobs
-    keywords = major_keywords.get(profile.major, [])
-    if keywords:
-        major_query = Q()
-        for keyword in keywords:
-            major_query |= Q(description__icontains=keyword) | Q(job_title__icontains=keyword)
-        major_jobs = location_jobs.filter(major_query)
-    
-    # 规则4：应届生优先（标记为接受应届生的职位）
-    fresh_graduate_jobs = major_jobs.filter(description__icontains='应届') | major_jobs.filter(description__icontains='毕业生')
-    
-    # 组合结果：应届生职位在前，其他在后
-    final_jobs = list(fresh_graduate_jobs) + [job for job in major_jobs if job not in fresh_graduate_jobs]
-    
-    # 去重并限制数量
-    seen_ids = set()
-    unique_jobs = []
-    for job in final_jobs:
-        if job.id not in seen_ids:
-            seen_ids.add(job.id)
-            unique_jobs.append(job)
-    
-    recommendations = unique_jobs[:20]  # 最多推荐20个
+    # 优先读取物化的推荐列表，缺失或过期时由推荐引擎实时计算（与 RecommendationsPage 共用）
+    recommendations = get_user_recommendations(profile)
     
     return render(request, 'jobs/recommendations.html', {
         'recommendations': recommendations,
+        'recommendation_algorithm': RECOMMENDATION_ALGORITHM,
         'profile': profile,
+        **get_user_job_context(user),
     })
 
 
@@ -94,13 +47,8 @@ def dashboard(request):
     # 获取用户的职位申请记录
     user_applications = JobApplication.objects.filter(user=user)
     
-    # 统计信息
-    saved_count = user_applications.filter(status='saved').count()
-    applied_count = user_applications.filter(status='applied').count()
-    
-    # 计算匹配度（简单算法：基于收藏和申请的比例）
-    total_jobs = JobPage.objects.live().count()
-    match_rate = min(100, int((saved_count + applied_count) / max(1, total_jobs) * 100)) if total_jobs > 0 else 0
+    # 统计信息：一次条件聚合查询，按用户缓存
+    stats = get_user_job_stats(user)
     
     # 获取收藏和申请的记录
     saved_applications = user_applications.filter(status='saved').select_related('job_page')[:10]
@@ -108,9 +56,9 @@ def dashboard(request):
     
     return render(request, 'account/dashboard.html', {
         'profile': profile,
-        'saved_count': saved_count,
-        'applied_count': applied_count,
-        'match_rate': match_rate,
+        'saved_count': stats.saved_count,
+        'applied_count': stats.applied_count,
+        'match_rate': stats.match_rate,
         'saved_applications': saved_applications,
         'applied_applications': applied_applications,
     })
@@ -124,20 +72,8 @@ def profile_page(request):
     # 获取或创建学生档案
     profile, created = StudentProfile.objects.get_or_create(user=user)
     
-    # 获取用户的职位申请记录
-    user_applications = JobApplication.objects.filter(user=user)
-    
-    # 统计信息
-    applied_count = user_applications.filter(status='applied').count()  # 已投递
-    pending_interview_count = user_applications.filter(status__in=['contacted', 'applied']).count()  # 待面试（已申请或已联系状态）
-    
-    # 计算平均竞争力（简单算法：基于申请成功率）
-    total_applications = user_applications.count()
-    accepted_count = user_applications.filter(status='accepted').count()
-    if total_applications > 0:
-        competitiveness = int((accepted_count / total_applications) * 100)
-    else:
-        competitiveness = 92  # 默认值
+    # 统计信息：与工作台共用按用户缓存的统计
+    stats = get_user_job_stats(user)
     
     # 计算毕业年份标签
     graduation_label = f"{profile.graduation_year}届准毕业生"
@@ -145,9 +81,9 @@ def profile_page(request):
     return render(request, 'jobs/account/profile.html', {
         'profile': profile,
         'user': user,
-        'applied_count': applied_count,
-        'pending_interview_count': pending_interview_count,
-        'competitiveness': competitiveness,
+        'applied_count': stats.applied_count,
+        'pending_interview_count': stats.pending_interview_count,
+        'competitiveness': stats.competitiveness,
         'graduation_label': graduation_label,
     })
 
@@ -161,18 +97,12 @@ def saved_jobs_list(request):
     saved_applications = JobApplication.objects.filter(
         user=user,
         status='saved'
-    ).select_related('job_page').order_by('-created_at')
+    ).select_related('job_page')
     
-    # 分页
-    from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-    paginator = Paginator(saved_applications, 15)
-    page = request.GET.get('page')
-    try:
-        saved_applications = paginator.page(page)
-    except PageNotAnInteger:
-        saved_applications = paginator.page(1)
-    except EmptyPage:
-        saved_applications = paginator.page(paginator.num_pages)
+    # 游标分页（按收藏时间倒序），深翻页不需要 OFFSET
+    from .pagination import CursorPaginator
+    paginator = CursorPaginator(saved_applications, 15, ordering=('-created_at', '-id'))
+    saved_applications = paginator.page(request.GET.get('cursor'))
     
     return render(request, 'jobs/account/saved_jobs_list.html', {
         'saved_applications': saved_applications,
@@ -204,28 +134,31 @@ def edit_profile(request):
     })
 
 
+def _location_tree_etag(request):
+    """地点数据的ETag：统计树内容不变时版本号不变"""
+    return get_location_tree()['version']
+
+
+@etag(_location_tree_etag)
 def get_location_data(request):
-    """API视图：获取省市区级联数据"""
+    """API视图：获取省市区级联数据（读取缓存的地点统计树，支持ETag/304）"""
     level = request.GET.get('level', 'province')  # province, city, district
     province = request.GET.get('province', '')
     city = request.GET.get('city', '')
     
     if level == 'province':
-        provinces = extract_provinces_from_jobs()
-        return JsonResponse({'data': provinces})
-    
+        counts = get_province_counts()
     elif level == 'city':
-        cities = extract_cities_from_jobs(province=province if province else None)
-        return JsonResponse({'data': cities})
-    
+        counts = get_city_counts(province=province if province else None)
     elif level == 'district':
-        districts = extract_districts_from_jobs(
+        counts = get_district_counts(
             province=province if province else None,
             city=city if city else None
         )
-        return JsonResponse({'data': districts})
+    else:
+        return JsonResponse({'data': []})
     
-    return JsonResponse({'data': []})
+    return JsonResponse({'data': sorted(counts), 'counts': counts})
 
 def ai_career_navigation(request):
     """AI职场导航页面"""
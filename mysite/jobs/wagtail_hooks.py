@@ -3,11 +3,11 @@ from wagtail.snippets.views.snippets import SnippetViewSet
 from wagtail.admin.panels import FieldPanel, MultiFieldPanel, TabbedInterface, ObjectList
 from .models import StudentProfile, JobPage, JobApplication
 from wagtail.admin.ui.tables import DateColumn
-from wagtail.admin.views.generic.models import IndexView
+from wagtail.admin.views.generic.base import WagtailAdminTemplateMixin
 from wagtail import hooks
 from wagtail.admin.menu import MenuItem
 from django.urls import reverse, path
-from django.db.models import Count
+from django.views.generic import TemplateView
 from django.utils.html import format_html
 from django.http import FileResponse, Http404
 from django.conf import settings
@@ -22,23 +22,42 @@ def register_job_stats_menu_item():
         order=1000
     )
 
-class JobStatsView(IndexView):
-    model = JobPage
+class JobStatsView(WagtailAdminTemplateMixin, TemplateView):
+    """职位数据统计：读取 rollup_job_stats 维护的汇总表，加载耗时与数据量无关"""
     template_name = 'jobs/admin/job_stats.html'
     page_title = '职位数据统计'
-    
-    def get_queryset(self):
-        # 按来源网站分组统计
-        return super().get_queryset()
+    header_icon = 'chart-bar'
     
     def get_context_data(self, **kwargs):
+        from .models import ApplicationEvent
+        from .rollups import get_activity_series, get_application_stats, get_job_stats
+        
         context = super().get_context_data(**kwargs)
-        # 添加统计数据
-        context['stats'] = {
-            'total_jobs': JobPage.objects.count(),
-            'by_source': JobPage.objects.values('source_website').annotate(count=Count('id')),
-            'by_type': JobPage.objects.values('job_type').annotate(count=Count('id')),
-        }
+        stats = get_job_stats()
+        job_type_labels = dict(JobPage.JOB_TYPES)
+        for row in stats['by_type']:
+            row['label'] = job_type_labels.get(row['job_type'], row['job_type'])
+        # 时间序列按最大值换算柱状图高度（百分比）
+        peak = max([row['published'] for row in stats['series']] + [1])
+        for row in stats['series']:
+            row['percent'] = round(row['published'] * 100 / peak)
+        
+        # 表格按固定的状态/事件类型顺序展开为单元格
+        status_labels = dict(JobApplication.STATUS_CHOICES)
+        application_stats = get_application_stats()
+        for row in application_stats['status_totals']:
+            row['label'] = status_labels.get(row['status'], row['status'])
+        for row in application_stats['series']:
+            row['cells'] = [row['counts'].get(status, 0) for status in status_labels]
+        activity_series = get_activity_series()
+        for row in activity_series:
+            row['cells'] = [row['counts'].get(event_type, 0) for event_type, _ in ApplicationEvent.EVENT_TYPES]
+        
+        context['stats'] = stats
+        context['application_stats'] = application_stats
+        context['status_labels'] = status_labels.values()
+        context['activity_series'] = activity_series
+        context['event_labels'] = [label for _, label in ApplicationEvent.EVENT_TYPES]
         return context
 
 @hooks.register('register_admin_urls')
@@ -216,3 +216,6 @@ WAGTAILADMIN_BASE_URL = "http://example.com"
 # if untrusted users are allowed to upload files -
 # see https://docs.wagtail.org/en/stable/advanced_topics/deploying.html#user-uploaded-files
 WAGTAILDOCS_EXTENSIONS = ['csv', 'docx', 'key', 'odt', 'pdf', 'pptx', 'rtf', 'txt', 'xlsx', 'zip']
+
+# 职位匹配索引（TF-IDF 矩阵等离线构建的文件）的存放目录
+JOB_INDEX_DIR = BASE_DIR / "data" / "job_index"
@@ -32,6 +32,14 @@ urlpatterns = [
     path("api/analyze-resume/", jobs_views.analyze_resume_api, name="analyze_resume_api"),
     # 收藏职位API
     path("api/toggle-save-job/", jobs_api.toggle_save_job, name="toggle_save_job"),
+    # 职位列表API
+    path("api/jobs/", jobs_api.job_list_api, name="job_list_api"),
+    # 搜索自动补全API
+    path("api/autocomplete/", jobs_api.autocomplete_api, name="job_autocomplete"),
+    # 简历匹配职位API
+    path("api/resume-matches/", jobs_api.resume_matches_api, name="resume_matches_api"),
+    # 推荐曝光/点击统计API
+    path("api/track-recommendation-click/", jobs_api.track_recommendation_event, name="track_recommendation_event"),
 ]
 
 # 在 DEBUG 模式下添加静态文件服务
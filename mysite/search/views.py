@@ -3,6 +3,9 @@ from django.template.response import TemplateResponse
 
 from wagtail.models import Page
 
+from jobs.models import JobPage
+from jobs.ranking import RankedJobResults
+
 # To enable logging of search queries for use with the "Promoted search results" module
 # <https://docs.wagtail.org/en/stable/reference/contrib/searchpromotions.html>
 # uncomment the following line and the lines indicated in the search function
@@ -11,13 +14,59 @@ from wagtail.models import Page
 # from wagtail.contrib.search_promotions.models import Query
 
 
+class ChainedResults:
+    """
+    Concatenate several result sequences so they can be paginated as one.
+
+    Each part only needs ``count()`` (or ``len()``) and slicing, so lazily
+    evaluated querysets and ranked results are only sliced for the page shown.
+    """
+
+    def __init__(self, *parts):
+        self.parts = parts
+        self._counts = None
+
+    def _part_counts(self):
+        if self._counts is None:
+            self._counts = [
+                part.count() if hasattr(part, "count") else len(part) for part in self.parts
+            ]
+        return self._counts
+
+    def count(self):
+        return sum(self._part_counts())
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return list(self[item:item + 1])[0]
+        start, stop = item.start or 0, item.stop if item.stop is not None else self.count()
+        results = []
+        offset = 0
+        for part, part_count in zip(self.parts, self._part_counts()):
+            part_start, part_stop = max(start - offset, 0), min(stop - offset, part_count)
+            if part_start < part_stop:
+                results.extend(part[part_start:part_stop])
+            offset += part_count
+            if offset >= stop:
+                break
+        return results
+
+
 def search(request):
     search_query = request.GET.get("query", None)
     page = request.GET.get("page", 1)
 
     # Search
     if search_query:
-        search_results = Page.objects.live().search(search_query)
+        # Job pages are ranked with BM25 over the job search index; other
+        # pages still go through the Wagtail search backend and follow them.
+        search_results = ChainedResults(
+            RankedJobResults(search_query, candidates=JobPage.objects.live()),
+            Page.objects.live().not_type(JobPage).search(search_query),
+        )
 
         # To log this query for use with the "Promoted search results" module:
 